@@ -7,6 +7,78 @@ class Settings:
     GROQ_API_KEY: str = os.getenv("GROQ_API_KEY")
     APP_NAME: str = os.getenv("APP_NAME", "FastAPI")
     DEBUG: bool = os.getenv("DEBUG", "False").lower() == "true"
+    # Attach the per-stage timing breakdown to every "assistant" WebSocket frame
+    INCLUDE_TIMINGS: bool = os.getenv("INCLUDE_TIMINGS", "False").lower() == "true"
+    # Shared secret for /admin endpoints (sent as the X-Admin-Token header); unset disables them
+    ADMIN_TOKEN: str = os.getenv("ADMIN_TOKEN", "")
+    # Where the persistent ChromaDB lives
+    CHROMA_PATH: str = os.getenv("CHROMA_PATH", "./chroma_db")
+    # HNSW index of new collections: distance ("l2", "cosine" or "ip"), graph degree M and build-time
+    # candidate list. Fixed once a collection exists, so changes apply via a compaction (see vectorIndex.py)
+    HNSW_SPACE: str = os.getenv("HNSW_SPACE", "l2")
+    HNSW_M: int = int(os.getenv("HNSW_M", "16"))
+    HNSW_CONSTRUCTION_EF: int = int(os.getenv("HNSW_CONSTRUCTION_EF", "100"))
+    # Query-time candidate list (higher = better recall, slower queries); applied to existing collections too
+    HNSW_SEARCH_EF: int = int(os.getenv("HNSW_SEARCH_EF", "100"))
+    # Per-collection overrides as JSON, e.g. {"manuals": {"space": "cosine", "M": 32, "search_ef": 200}}
+    HNSW_COLLECTION_SETTINGS: str = os.getenv("HNSW_COLLECTION_SETTINGS", "")
+    # Snapshot directory (see snapshot.py) imported at warm-up when the collection is empty, e.g. on a new replica
+    SNAPSHOT_BOOTSTRAP: str = os.getenv("SNAPSHOT_BOOTSTRAP", "")
+    # Open collection handles kept in the LRU cache (one per tenant knowledge base, see tenants.py)
+    COLLECTION_CACHE_SIZE: int = int(os.getenv("COLLECTION_CACHE_SIZE", "32"))
+    # Per-tenant quotas (0 = unlimited): stored chunks and ingestions running at once; the shared
+    # collection has none. TENANT_QUOTAS overrides them per tenant as JSON, e.g. {"acme": {"max_chunks": 200000}}
+    TENANT_MAX_CHUNKS: int = int(os.getenv("TENANT_MAX_CHUNKS", "0"))
+    TENANT_MAX_CONCURRENT_INGESTIONS: int = int(os.getenv("TENANT_MAX_CONCURRENT_INGESTIONS", "2"))
+    TENANT_QUOTAS: str = os.getenv("TENANT_QUOTAS", "")
+    # Content-addressed upload store (objects/ plus its catalog)
+    UPLOAD_DIR: str = os.getenv("UPLOAD_DIR", "uploads")
+    # Sentence-transformers model new collections are embedded with; existing collections keep the model
+    # recorded in their metadata, so change models with a migration (see reembed.py)
+    EMBEDDING_MODEL: str = os.getenv("EMBEDDING_MODEL", "sentence-transformers/all-MiniLM-L6-v2")
+    # "huggingface" (EMBEDDING_MODEL), "hash" (tiny deterministic stand-in for benchmarks),
+    # "quantized" (int8 MiniLM on CPU, see quantizedEmbeddings.py)
+    # or "remote" (the shared embedding server at EMBEDDING_SOCKET, see embeddingServer.py)
+    EMBEDDING_BACKEND: str = os.getenv("EMBEDDING_BACKEND", "huggingface")
+    # Quantized backend: "onnx" (int8 ONNX export via onnxruntime) or "torch" (dynamic int8 quantization)
+    EMBEDDING_QUANTIZED_RUNTIME: str = os.getenv("EMBEDDING_QUANTIZED_RUNTIME", "onnx")
+    EMBEDDING_ONNX_FILE: str = os.getenv("EMBEDDING_ONNX_FILE", "onnx/model_quint8_avx2.onnx")
+    # Intra-op CPU threads for the quantized backend (0 = runtime default)
+    EMBEDDING_THREADS: int = int(os.getenv("EMBEDDING_THREADS", "0"))
+    # Bulk embedding: most texts per forward pass; batches of long texts shrink to fit the memory target
+    EMBEDDING_BATCH_SIZE: int = int(os.getenv("EMBEDDING_BATCH_SIZE", "128"))
+    EMBEDDING_MEMORY_TARGET_MB: float = float(os.getenv("EMBEDDING_MEMORY_TARGET_MB", "256"))
+    # Shared embedding server: socket path, the backend it runs, and its cross-worker batching
+    EMBEDDING_SOCKET: str = os.getenv("EMBEDDING_SOCKET", "/tmp/wisebot-embeddings.sock")
+    EMBEDDING_SERVER_BACKEND: str = os.getenv("EMBEDDING_SERVER_BACKEND", "huggingface")
+    EMBEDDING_MAX_BATCH: int = int(os.getenv("EMBEDDING_MAX_BATCH", "256"))
+    EMBEDDING_BATCH_WAIT_MS: float = float(os.getenv("EMBEDDING_BATCH_WAIT_MS", "5"))
+    # Re-embedding migrations (reembed.py): chunks per batch and the most chunks per second (0 = unthrottled)
+    REEMBED_BATCH_SIZE: int = int(os.getenv("REEMBED_BATCH_SIZE", "256"))
+    REEMBED_MAX_RATE: float = float(os.getenv("REEMBED_MAX_RATE", "200"))
+    # Local model cache; with HF_OFFLINE=true models and tokenizers load only from it (no Hub calls)
+    EMBEDDING_CACHE_DIR: str = os.getenv("EMBEDDING_CACHE_DIR", "")
+    HF_OFFLINE: bool = os.getenv("HF_OFFLINE", "False").lower() == "true"
+    # Load the chatbot in the background at startup instead of on the first connection
+    WARM_UP: bool = os.getenv("WARM_UP", "True").lower() == "true"
+    # POST /chat/batch: most questions per request, and LLM calls in flight per batch
+    BATCH_MAX_QUESTIONS: int = int(os.getenv("BATCH_MAX_QUESTIONS", "5000"))
+    BATCH_LLM_CONCURRENCY: int = int(os.getenv("BATCH_LLM_CONCURRENCY", "8"))
+    # WebSocket "draft" messages: seconds a prefetched retrieval is kept, and how close (0-1, as typed)
+    # the final question must be to the draft to reuse it
+    DRAFT_PREFETCH_TTL: float = float(os.getenv("DRAFT_PREFETCH_TTL", "30"))
+    DRAFT_MIN_SIMILARITY: float = float(os.getenv("DRAFT_MIN_SIMILARITY", "0.85"))
+    # Processes cleaning the pages of large documents (cleanText.clean_pages); 0 cleans in-process
+    CLEAN_WORKERS: int = int(os.getenv("CLEAN_WORKERS", "0"))
+    # Precomputed FAQ (faqIndex.py): questions generated per ingested document (0 = off), and how
+    # close (cosine) a first question must be to one of them to get its stored answer without the LLM
+    FAQ_QUESTIONS_PER_DOCUMENT: int = int(os.getenv("FAQ_QUESTIONS_PER_DOCUMENT", "0"))
+    FAQ_MIN_SIMILARITY: float = float(os.getenv("FAQ_MIN_SIMILARITY", "0.92"))
+    # "groq" or "stub" (local fake LLM with configurable latency, for load tests)
+    LLM_BACKEND: str = os.getenv("LLM_BACKEND", "groq")
+    STUB_LLM_LATENCY_MS: float = float(os.getenv("STUB_LLM_LATENCY_MS", "300"))
+    STUB_LLM_TOKENS_PER_SEC: float = float(os.getenv("STUB_LLM_TOKENS_PER_SEC", "80"))
+    STUB_LLM_ANSWER_TOKENS: int = int(os.getenv("STUB_LLM_ANSWER_TOKENS", "60"))
     # DATABASE_URL: str = os.getenv("DATABASE_URL")
 
 settings = Settings()
@@ -1,9 +1,32 @@
+from time import perf_counter
+_import_started = perf_counter()
+
+import os
+import sys
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fastapi.responses import JSONResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
 from .config import settings
-from .routes import fileUpload, chat
+from .routes import fileUpload, chat, admin
+
+# Add the services directory to Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), 'services'))
+
+from metrics import REGISTRY, CONTENT_TYPE
+import startup
 
-app = FastAPI(title=settings.APP_NAME, debug=settings.DEBUG)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Serve /health immediately; heavy initialization happens in the background
+    startup.record_app_import(_import_started)
+    if settings.WARM_UP:
+        startup.start_warm_up(chat.get_chatbot)
+    else:
+        startup.report.status = "lazy"
+    yield
+
+app = FastAPI(title=settings.APP_NAME, debug=settings.DEBUG, lifespan=lifespan)
 
 # CORS middleware for frontend
 app.add_middleware(
@@ -15,6 +38,7 @@ app.add_middleware(
 )
 app.include_router(fileUpload.router, prefix="/upload", tags=["uploads"])
 app.include_router(chat.router, prefix="", tags=["chat"])
+app.include_router(admin.router, prefix="/admin", tags=["admin"])
 
 @app.get("/")
 def root():
@@ -27,3 +51,18 @@ def root():
 @app.get("/health")
 def health_check():
     return {"status": "healthy", "app": settings.APP_NAME}
+
+@app.get("/ready")
+def readiness_check():
+    """
+    Readiness probe: 200 once the chatbot can answer, 503 while warming up or after a failed warm-up.
+    Without warm-up (WARM_UP=false) the first chat request creates the chatbot, so the app is ready at once.
+    """
+    ready = startup.report.status in ("ready", "lazy")
+    body = {"status": startup.report.status, "startup": startup.report.as_dict()}
+    return JSONResponse(content=body, status_code=200 if ready else 503)
+
+@app.get("/metrics")
+def metrics():
+    """Prometheus scrape endpoint"""
+    return Response(content=REGISTRY.render(), media_type=CONTENT_TYPE)
@@ -0,0 +1,189 @@
+import asyncio
+import os
+import secrets
+import sys
+import uuid
+from typing import Optional
+from fastapi import APIRouter, BackgroundTasks, Depends, Header, HTTPException
+from fastapi.responses import Response
+
+# Add the services directory to Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'services'))
+
+import collectionAlias
+import profiler
+import reembed
+import vectorIndex
+from progress import JobProgress, broker as progress_broker
+from ..config import settings
+
+def require_admin(x_admin_token: Optional[str] = Header(None)):
+    """Allow the request only when it carries the configured ADMIN_TOKEN"""
+    if not settings.ADMIN_TOKEN:
+        raise HTTPException(status_code=503, detail="Admin endpoints are disabled (ADMIN_TOKEN not set)")
+    if not x_admin_token or not secrets.compare_digest(x_admin_token, settings.ADMIN_TOKEN):
+        raise HTTPException(status_code=401, detail="Invalid admin token")
+
+router = APIRouter(dependencies=[Depends(require_admin)])
+
+@router.post("/profile")
+async def capture_profile(
+    target: str = "process",
+    seconds: float = 10.0,
+    calls: int = 0,
+    format: str = "collapsed",
+    interval_ms: float = 5.0
+):
+    """
+    Capture a CPU profile of the running app.
+
+    target=process samples all threads for `seconds` (collapsed stacks for flame graphs);
+    target=ask_question|ingestion profiles the next `calls` calls as pstats, text or collapsed.
+    """
+    try:
+        body, media_type, summary = await asyncio.to_thread(
+            profiler.capture, target, seconds, calls, format, interval_ms / 1000
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except RuntimeError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+    extension = {"pstats": "pstats", "collapsed": "folded", "text": "txt"}[format]
+    headers = {
+        "Content-Disposition": f'attachment; filename="profile-{target}.{extension}"',
+        "X-Profile-Calls": str(summary["calls_profiled"]),
+        "X-Profile-Samples": str(summary["samples"]),
+    }
+    return Response(content=body, media_type=media_type, headers=headers)
+
+@router.post("/profile/memory")
+async def capture_allocations(seconds: float = 10.0, top: int = 25, group_by: str = "lineno"):
+    """Report the allocation sites that grew the most over a tracemalloc window"""
+    try:
+        return await asyncio.to_thread(profiler.snapshot_allocations, seconds, top, group_by)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except RuntimeError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+# Aliases with a rebuild, re-embed or compaction in progress (one at a time per alias)
+_rebuilding = set()
+
+def run_rebuild(alias: str, job_id: str, swap: bool, min_count_ratio: float):
+    """Background rebuild of an alias, reported through the progress broker"""
+    progress = JobProgress(progress_broker, job_id, alias=alias)
+    try:
+        report = collectionAlias.rebuild(alias, swap=swap, min_count_ratio=min_count_ratio, progress=progress)
+        message = f"{report['shadow']} {'is now serving' if report['swapped'] else 'was built but not swapped in'}"
+        progress.finish("completed" if report["ok"] else "error", message=message, report=report)
+    except Exception as e:
+        progress.finish("error", message=str(e))
+    finally:
+        _rebuilding.discard(alias)
+
+def run_reembed(alias: str, job_id: str, model: str, max_rate: Optional[float], swap: bool):
+    """Background re-embedding migration of an alias, reported through the progress broker"""
+    progress = JobProgress(progress_broker, job_id, alias=alias, model=model)
+    try:
+        report = reembed.migrate(alias, model, max_rate=max_rate, swap=swap, progress=progress)
+        message = f"{report['shadow']} {'is now serving' if report['swapped'] else 'was built but not swapped in'}"
+        progress.finish("completed" if report["ok"] else "error", message=message, report=report)
+    except Exception as e:
+        progress.finish("error", message=str(e))
+    finally:
+        _rebuilding.discard(alias)
+
+def run_compact(alias: str, job_id: str, swap: bool):
+    """Background index compaction of an alias, reported through the progress broker"""
+    progress = JobProgress(progress_broker, job_id, alias=alias)
+    try:
+        report = vectorIndex.compact(alias, swap=swap, progress=progress)
+        message = f"{report['shadow']} {'is now serving' if report['swapped'] else 'was built but not swapped in'}"
+        progress.finish("completed" if report["ok"] else "error", message=message, report=report)
+    except Exception as e:
+        progress.finish("error", message=str(e))
+    finally:
+        _rebuilding.discard(alias)
+
+@router.get("/collections/{alias}")
+async def collection_versions(alias: str):
+    """Which version serves the alias, the rollback version, and every version with its size"""
+    versions = await asyncio.to_thread(collectionAlias.versions, alias)
+    return {"alias": alias, **collectionAlias.registry.describe(alias), "versions": versions}
+
+@router.post("/collections/{alias}/rebuild")
+async def rebuild_collection(alias: str, background_tasks: BackgroundTasks, swap: bool = True,
+                             min_count_ratio: float = 0.9):
+    """
+    Re-chunk every uploaded document into a new version of the alias, validate it and (with swap)
+    serve it. Follow progress at /upload/events/{processing_id}.
+    """
+    if alias in _rebuilding:
+        raise HTTPException(status_code=409, detail=f"A rebuild of '{alias}' is already running")
+    _rebuilding.add(alias)
+    job_id = str(uuid.uuid4())
+    progress_broker.publish(job_id, "uploaded", alias=alias, message="Rebuild queued")
+    background_tasks.add_task(asyncio.to_thread, run_rebuild, alias, job_id, swap, min_count_ratio)
+    return {"processing_id": job_id, "events": f"/upload/events/{job_id}", "status": "rebuild_started"}
+
+@router.post("/collections/{alias}/reembed")
+async def reembed_collection(alias: str, model: str, background_tasks: BackgroundTasks,
+                             max_rate: Optional[float] = None, swap: bool = True):
+    """
+    Re-embed the alias's chunks with another model into a new version, throttled to max_rate
+    chunks per second (default REEMBED_MAX_RATE), then validate and (with swap) serve it.
+    An interrupted migration resumes from its checkpoint. Follow progress at /upload/events/{processing_id}.
+    """
+    if alias in _rebuilding:
+        raise HTTPException(status_code=409, detail=f"A rebuild of '{alias}' is already running")
+    _rebuilding.add(alias)
+    job_id = str(uuid.uuid4())
+    progress_broker.publish(job_id, "uploaded", alias=alias, model=model, message="Re-embedding queued")
+    background_tasks.add_task(asyncio.to_thread, run_reembed, alias, job_id, model, max_rate, swap)
+    return {"processing_id": job_id, "events": f"/upload/events/{job_id}", "status": "reembed_started"}
+
+@router.get("/collections/{alias}/index")
+async def collection_index(alias: str):
+    """HNSW parameters (actual vs configured), index size and fragmentation of the serving version"""
+    try:
+        return await asyncio.to_thread(vectorIndex.alias_stats, alias)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=404, detail=f"Cannot read the index of '{alias}': {str(e)}")
+
+@router.post("/collections/{alias}/compact")
+async def compact_collection(alias: str, background_tasks: BackgroundTasks, swap: bool = True):
+    """
+    Rebuild the serving version's index from its stored vectors with the configured HNSW settings,
+    dropping deleted chunks' slots, then validate and (with swap) serve it.
+    Follow progress at /upload/events/{processing_id}.
+    """
+    if alias in _rebuilding:
+        raise HTTPException(status_code=409, detail=f"A rebuild of '{alias}' is already running")
+    _rebuilding.add(alias)
+    job_id = str(uuid.uuid4())
+    progress_broker.publish(job_id, "uploaded", alias=alias, message="Compaction queued")
+    background_tasks.add_task(asyncio.to_thread, run_compact, alias, job_id, swap)
+    return {"processing_id": job_id, "events": f"/upload/events/{job_id}", "status": "compaction_started"}
+
+@router.post("/collections/{alias}/swap")
+async def swap_collection(alias: str, target: str, force: bool = False):
+    """Serve another version of the alias, after validating it against the serving one"""
+    try:
+        report = await asyncio.to_thread(collectionAlias.validate, alias, target)
+    except Exception as e:
+        raise HTTPException(status_code=404, detail=f"Cannot validate {target}: {str(e)}")
+    if not report["ok"] and not force:
+        raise HTTPException(status_code=409, detail={"message": "Validation failed", "report": report})
+    entry = await asyncio.to_thread(collectionAlias.promote, alias, target)
+    return {"alias": alias, **entry, "validation": report}
+
+@router.post("/collections/{alias}/rollback")
+async def rollback_collection(alias: str):
+    """Serve the previous version of the alias again"""
+    try:
+        return {"alias": alias, **collectionAlias.rollback(alias)}
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
@@ -1,9 +1,10 @@
-from fastapi import APIRouter, WebSocket, WebSocketDisconnect, HTTPException
-from fastapi.responses import HTMLResponse
-from typing import Dict, List
+from fastapi import APIRouter, Body, Request, WebSocket, WebSocketDisconnect, HTTPException
+from fastapi.responses import HTMLResponse, StreamingResponse
+from typing import Any, Dict, List, Optional
 import json
 import uuid
 import asyncio
+import threading
 from datetime import datetime
 import sys
 import os
@@ -11,7 +12,11 @@ import os
 # Add the services directory to Python path
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'services'))
 
-from chatbot import AdaptiveKnowledgeChatbot
+from chatbot import AdaptiveKnowledgeChatbot, normalize_batch, scope_filter
+from metrics import ASK_STAGE_SECONDS, ACTIVE_CONNECTIONS, ACTIVE_SESSIONS
+from progress import broker as progress_broker
+from tenants import tenant_collection
+from ..config import settings
 
 router = APIRouter()
 
@@ -53,37 +58,80 @@ class ConnectionManager:
 # Global instances
 manager = ConnectionManager()
 chatbot = None
+_chatbot_lock = threading.Lock()
 
 def get_chatbot():
-    """Get or create chatbot instance"""
+    """Get or create chatbot instance (blocks while another thread, e.g. warm-up, is creating it)"""
     global chatbot
     if chatbot is None:
-        try:
-            print("🔄 Initializing chatbot...")
-            chatbot = AdaptiveKnowledgeChatbot(collection_name="manuals")
-            print("✅ Chatbot initialized successfully")
-        except Exception as e:
-            print(f"❌ Failed to initialize chatbot: {e}")
-            # Don't raise HTTPException here, let it be handled in the WebSocket endpoint
-            return None
+        with _chatbot_lock:
+            if chatbot is not None:
+                return chatbot
+            try:
+                print("🔄 Initializing chatbot...")
+                chatbot = AdaptiveKnowledgeChatbot(collection_name="manuals")
+                print("✅ Chatbot initialized successfully")
+            except Exception as e:
+                print(f"❌ Failed to initialize chatbot: {e}")
+                # Don't raise HTTPException here, let it be handled in the WebSocket endpoint
+                return None
     return chatbot
 
-# Initialize chatbot at startup
-try:
-    chatbot = get_chatbot()
-except:
-    print("⚠️ Chatbot initialization deferred to first connection")
+ACTIVE_CONNECTIONS.set_function(lambda: len(manager.active_connections))
+ACTIVE_SESSIONS.set_function(lambda: len(chatbot.memory_manager.user_sessions) if chatbot else 0)
+
+# The chatbot is created by the background warm-up started in the app lifespan (see main.py)
+
+def assistant_frame(response: Dict, user_id: str, include_timings: bool) -> Dict:
+    """The "assistant" message for an answer, shared by the WebSocket and SSE endpoints"""
+    frame = {
+        "type": "assistant",
+        "message": response["answer"],
+        "confidence": response["confidence"],
+        "context_count": len(response["context"]),
+        "timestamp": datetime.now().isoformat(),
+        "user_id": user_id
+    }
+    if response.get("faq"):
+        frame["faq"] = response["faq"]
+    if include_timings:
+        frame["timings"] = response.get("timings", {})
+    return frame
+
+async def forward_progress(user_id: str, processing_id: str, after: int = 0):
+    """Relay an ingestion job's progress events to a chat connection as "progress" frames"""
+    if not progress_broker.exists(processing_id):
+        await manager.send_personal_message({
+            "type": "error",
+            "message": f"Unknown processing ID: {processing_id}",
+            "timestamp": datetime.now().isoformat(),
+            "user_id": user_id
+        }, user_id)
+        return
+    async for event in progress_broker.subscribe(processing_id, after):
+        await manager.send_personal_message({"type": "progress", **event, "user_id": user_id}, user_id)
 
 @router.websocket("/ws/{user_id}")
-async def websocket_endpoint(websocket: WebSocket, user_id: str):
-    """WebSocket endpoint for real-time chat"""
+async def websocket_endpoint(websocket: WebSocket, user_id: str, tenant: Optional[str] = None):
+    """WebSocket endpoint for real-time chat (?tenant=... searches that tenant's knowledge base only)"""
     
     # Accept connection first
     await websocket.accept()
     
     try:
-        # Then try to get chatbot
-        bot = get_chatbot()
+        tenant_collection(tenant)
+    except ValueError as e:
+        await websocket.send_text(json.dumps({
+            "type": "error",
+            "message": f"Invalid tenant: {e}",
+            "timestamp": datetime.now().isoformat()
+        }))
+        await websocket.close(code=1008, reason="Invalid tenant")
+        return
+    
+    try:
+        # Then try to get chatbot (waits for warm-up if it is still running)
+        bot = await asyncio.to_thread(get_chatbot)
         if bot is None:
             await websocket.send_text(json.dumps({
                 "type": "error",
@@ -97,7 +145,8 @@ async def websocket_endpoint(websocket: WebSocket, user_id: str):
         manager.active_connections[user_id] = websocket
         manager.user_info[user_id] = {
             "connected_at": datetime.now().isoformat(),
-            "message_count": 0
+            "message_count": 0,
+            "tenant": tenant
         }
         
         # Send welcome message
@@ -111,7 +160,7 @@ async def websocket_endpoint(websocket: WebSocket, user_id: str):
         
         # Send knowledge base info
         try:
-            kb_info = bot.get_vectorstore_info()
+            kb_info = bot.get_vectorstore_info(tenant)
             info_message = {
                 "type": "system", 
                 "message": f"Knowledge base loaded with {kb_info['document_count']} documents",
@@ -138,6 +187,21 @@ async def websocket_endpoint(websocket: WebSocket, user_id: str):
         await websocket.close(code=1011, reason="Setup failed")
         return
     
+    # Background tasks of this connection (progress subscriptions, draft prefetches), cancelled when it closes
+    connection_tasks = set()
+    # Retrieval scope of this conversation (see chatbot.scope_filter); None searches everything
+    scope = None
+    # Latest draft not yet prefetched; one prefetch runs at a time and skips to the newest draft
+    pending_draft = None
+    draft_task = None
+    
+    async def prefetch_drafts():
+        nonlocal pending_draft
+        while pending_draft:
+            draft, draft_scope = pending_draft
+            pending_draft = None
+            await asyncio.to_thread(bot.prefetch_draft, draft, user_id, draft_scope, tenant)
+    
     try:
         while True:
             # Receive message from client
@@ -147,8 +211,71 @@ async def websocket_endpoint(websocket: WebSocket, user_id: str):
             user_message = message_data.get("message", "").strip()
             message_type = message_data.get("type", "user")
             
+            # Follow an upload's ingestion progress: {"type": "subscribe_progress", "processing_id": ...}
+            if message_type == "subscribe_progress":
+                after = message_data.get("after", 0)
+                if isinstance(after, str) and after.isdigit():
+                    after = int(after)
+                if not isinstance(after, int) or isinstance(after, bool) or after < 0:
+                    await manager.send_personal_message({
+                        "type": "error",
+                        "message": "Invalid after: must be a non-negative integer (the last seq received)",
+                        "timestamp": datetime.now().isoformat(),
+                        "user_id": user_id
+                    }, user_id)
+                    continue
+                task = asyncio.create_task(forward_progress(user_id, message_data.get("processing_id", ""), after))
+                connection_tasks.add(task)
+                task.add_done_callback(connection_tasks.discard)
+                continue
+            
+            # Narrow retrieval for the rest of the conversation: {"type": "scope", "scope": {...}}
+            # (an empty or missing scope searches the whole knowledge base again)
+            if message_type == "scope":
+                try:
+                    scope_filter(message_data.get("scope"))
+                except ValueError as e:
+                    await manager.send_personal_message({
+                        "type": "error",
+                        "message": f"Invalid scope: {e}",
+                        "timestamp": datetime.now().isoformat(),
+                        "user_id": user_id
+                    }, user_id)
+                    continue
+                scope = message_data.get("scope") or None
+                await manager.send_personal_message({
+                    "type": "system",
+                    "message": "Search scope set" if scope else "Search scope cleared",
+                    "data": scope,
+                    "timestamp": datetime.now().isoformat(),
+                    "user_id": user_id
+                }, user_id)
+                continue
+            
+            # The question being typed, sent (debounced) by the client: {"type": "draft", "message": ...}.
+            # Its context is prefetched silently for the final message to reuse
+            if message_type == "draft":
+                draft_scope = message_data.get("scope", scope)
+                try:
+                    scope_filter(draft_scope)
+                except ValueError:
+                    continue
+                if user_message and not user_message.startswith("/"):
+                    pending_draft = (user_message, draft_scope)
+                    if draft_task is None or draft_task.done():
+                        draft_task = asyncio.create_task(prefetch_drafts())
+                        connection_tasks.add(draft_task)
+                        draft_task.add_done_callback(connection_tasks.discard)
+                continue
+            
             if not user_message:
                 continue
+            
+            # The final message: drop drafts not yet prefetched and let a running prefetch finish,
+            # so its context is there to reuse rather than left over for the next question
+            pending_draft = None
+            if draft_task is not None and not draft_task.done():
+                await asyncio.wait([draft_task])
                 
             # Handle special commands
             if user_message.lower() == "/clear":
@@ -186,6 +313,19 @@ async def websocket_endpoint(websocket: WebSocket, user_id: str):
                 await manager.send_personal_message(users_message, user_id)
                 continue
             
+            # A message may carry its own scope, overriding the conversation's
+            message_scope = message_data.get("scope", scope)
+            try:
+                scope_filter(message_scope)
+            except ValueError as e:
+                await manager.send_personal_message({
+                    "type": "error",
+                    "message": f"Invalid scope: {e}",
+                    "timestamp": datetime.now().isoformat(),
+                    "user_id": user_id
+                }, user_id)
+                continue
+            
             # Echo user message
             user_echo = {
                 "type": "user",
@@ -207,19 +347,26 @@ async def websocket_endpoint(websocket: WebSocket, user_id: str):
             # Simulate thinking time
             await asyncio.sleep(0.5)
             
-            # Get response from chatbot
-            response = bot.ask_question(user_message, user_id)
+            # Get response from chatbot, off the event loop so other connections keep being served
+            if message_data.get("stream"):
+                response = None
+                async for item in bot.astream_question(user_message, user_id, message_scope, tenant):
+                    if isinstance(item, dict):
+                        response = item
+                        continue
+                    await manager.send_personal_message({
+                        "type": "assistant_delta",
+                        "message": item,
+                        "timestamp": datetime.now().isoformat(),
+                        "user_id": user_id
+                    }, user_id)
+            else:
+                response = await asyncio.to_thread(bot.ask_question, user_message, user_id, message_scope, tenant)
             
             # Send bot response
-            bot_response = {
-                "type": "assistant",
-                "message": response["answer"],
-                "confidence": response["confidence"],
-                "context_count": len(response["context"]),
-                "timestamp": datetime.now().isoformat(),
-                "user_id": user_id
-            }
-            await manager.send_personal_message(bot_response, user_id)
+            bot_response = assistant_frame(response, user_id, message_data.get("timings", settings.INCLUDE_TIMINGS))
+            with ASK_STAGE_SECONDS.time(stage="ws_send"):
+                await manager.send_personal_message(bot_response, user_id)
             
             # Update user message count
             if user_id in manager.user_info:
@@ -231,6 +378,9 @@ async def websocket_endpoint(websocket: WebSocket, user_id: str):
     except Exception as e:
         print(f"❌ WebSocket error for user {user_id}: {e}")
         manager.disconnect(user_id)
+    finally:
+        for task in list(connection_tasks):
+            task.cancel()
 
 @router.get("/chat/users")
 async def get_active_users():
@@ -238,11 +388,17 @@ async def get_active_users():
     return {"active_users": manager.get_active_users()}
 
 @router.get("/chat/status")
-async def get_chat_status():
-    """Get chatbot and system status"""
+async def get_chat_status(tenant: Optional[str] = None):
+    """Get chatbot and system status (with the tenant's knowledge base, if given)"""
+    if chatbot is None:
+        return {
+            "status": "starting",
+            "active_users": len(manager.active_connections),
+            "chatbot_users": 0
+        }
     try:
-        bot = get_chatbot()
-        kb_info = bot.get_vectorstore_info()
+        bot = chatbot
+        kb_info = bot.get_vectorstore_info(tenant)
         return {
             "status": "online",
             "knowledge_base": kb_info,
@@ -257,11 +413,78 @@ async def get_chat_status():
             "chatbot_users": 0
         }
 
+@router.post("/chat/stream")
+async def stream_answer(payload: Dict[str, Any] = Body(...)):
+    """
+    Answer one message as Server-Sent Events, for clients that can't hold a WebSocket open:
+    "delta" events carry answer text as it is generated, then a "done" event carries the same
+    "assistant" frame /ws/{user_id} sends. Body: {"user_id", "message", "scope", "tenant",
+    "timings"}. Retrieval and conversation memory are the WebSocket's (memory is per user_id,
+    within one worker process).
+    """
+    user_id = payload.get("user_id")
+    message = payload.get("message")
+    try:
+        if not isinstance(user_id, str) or not user_id.strip():
+            raise ValueError("user_id must be a non-empty string")
+        if not isinstance(message, str) or not message.strip():
+            raise ValueError("message must be a non-empty string")
+        scope_filter(payload.get("scope"))
+        tenant_collection(payload.get("tenant"))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    bot = await asyncio.to_thread(get_chatbot)
+    if bot is None:
+        raise HTTPException(status_code=503, detail="Chatbot service is currently unavailable")
+    
+    async def events():
+        response = None
+        async for item in bot.astream_question(message.strip(), user_id, payload.get("scope"), payload.get("tenant")):
+            if isinstance(item, dict):
+                response = item
+                continue
+            yield f"event: delta\ndata: {json.dumps({'message': item})}\n\n"
+        frame = assistant_frame(response, user_id, payload.get("timings", settings.INCLUDE_TIMINGS))
+        yield f"event: done\ndata: {json.dumps(frame)}\n\n"
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+@router.post("/chat/batch")
+async def answer_batch(payload: Dict[str, Any] = Body(...)):
+    """
+    Answer many questions in one request, streamed back as NDJSON: a {"type": "result"} line per
+    question as soon as it is answered (in completion order; match them by index or id), then a
+    {"type": "summary"} line. Body: {"questions": [str | {"question", "id", "scope"}], "tenant",
+    "k", "concurrency", "include_context"}. Questions share no conversation memory.
+    """
+    try:
+        questions = normalize_batch(payload.get("questions"))
+        tenant = payload.get("tenant")
+        tenant_collection(tenant)
+        k = int(payload.get("k", 5))
+        if not 1 <= k <= 50:
+            raise ValueError("k must be between 1 and 50")
+        concurrency = int(payload["concurrency"]) if payload.get("concurrency") else None
+    except (TypeError, ValueError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    bot = await asyncio.to_thread(get_chatbot)
+    if bot is None:
+        raise HTTPException(status_code=503, detail="Chatbot service is currently unavailable")
+    results = bot.answer_batch(questions, tenant, k, concurrency, bool(payload.get("include_context")))
+    # A sync iterator: Starlette pulls each line on a worker thread
+    return StreamingResponse((json.dumps(result) + "\n" for result in results), media_type="application/x-ndjson")
+
 @router.post("/chat/clear/{user_id}")
 async def clear_user_memory(user_id: str):
     """Clear memory for a specific user"""
     try:
-        bot = get_chatbot()
+        bot = await asyncio.to_thread(get_chatbot)
         bot.clear_user_memory(user_id)
         return {"message": f"Memory cleared for user {user_id}"}
     except Exception as e:
@@ -271,7 +494,7 @@ async def clear_user_memory(user_id: str):
 async def get_user_history(user_id: str):
     """Get conversation history for a user"""
     try:
-        bot = get_chatbot()
+        bot = await asyncio.to_thread(get_chatbot)
         history = bot.get_user_conversation_history(user_id)
         return {"user_id": user_id, "history": history}
     except Exception as e:
@@ -1,106 +1,203 @@
-import shutil
 import os
 import sys
 import asyncio
 import uuid
 from datetime import datetime
 from typing import Dict, Optional
-from fastapi import APIRouter, UploadFile, File, HTTPException, BackgroundTasks
-from fastapi.responses import JSONResponse
+import json
+from fastapi import APIRouter, UploadFile, File, Form, HTTPException, BackgroundTasks, Query, Request
+from fastapi.responses import JSONResponse, StreamingResponse
 
 # Add the services directory to Python path
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'services'))
 
-from extractText import extract_text
-from feedDoc import setup_knowledge_base
+from extractText import count_pages, extract_pages
+from feedDoc import delete_document, setup_knowledge_base
+from metrics import INGEST_STAGE_SECONDS, INGEST_DOCUMENTS, StageTimer
+from profiler import profiled
+from progress import JobProgress, broker as progress_broker
+from tenants import QuotaExceeded, ingestion_slots, quotas, tenant_collection
+from uploadStore import upload_store
 
 router = APIRouter()
 
 # In-memory storage for processing status (in production, use Redis or database)
 processing_status: Dict[str, Dict] = {}
+# Seconds between SSE keep-alive comments while a job is quiet
+SSE_HEARTBEAT = 15.0
 
-async def process_document_async(file_path: str, filename: str, processing_id: str):
-    """Async function to process document in background"""
+def document_metadata(stored: Dict, doc_id: str, product_line: Optional[str] = None) -> Dict:
+    """Chunk metadata of an uploaded document (see feedDoc.store_chunks)"""
+    return {
+        "doc_id": doc_id,
+        "file_hash": stored["hash"],
+        "source": stored["filename"],
+        "product_line": product_line.strip() if product_line and product_line.strip() else None,
+        "uploaded_at": int(datetime.fromisoformat(stored["uploaded_at"]).timestamp()),
+    }
+
+def resolve_tenant(tenant: Optional[str], collection: str = "manuals") -> str:
+    """The collection a request targets (the tenant's own, if any); HTTP 400 for a malformed tenant"""
+    try:
+        return tenant_collection(tenant, collection)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+async def process_document_async(file_path: str, filename: str, processing_id: str, document: Dict,
+                                 collection_name: str = "manuals", tenant: Optional[str] = None):
+    """Async function to process document in background (the work runs on a worker thread)"""
+    await asyncio.to_thread(ingest_document, file_path, filename, processing_id, document, collection_name, tenant)
+
+def ingest_document(file_path: str, filename: str, processing_id: str, document: Dict,
+                    collection_name: str = "manuals", tenant: Optional[str] = None):
+    """
+    Extract, chunk, embed and store one uploaded document, publishing progress events.
+    Releases the tenant's ingestion slot taken when the job was queued.
+    """
+    catalog = upload_store.catalog
+    file_hash = document["file_hash"]
+    timer = StageTimer(INGEST_STAGE_SECONDS)
+    progress = JobProgress(progress_broker, processing_id, filename=filename)
     try:
         # Update status to processing
         processing_status[processing_id]["status"] = "processing"
         processing_status[processing_id]["message"] = "Extracting text from document..."
+        catalog.start_ingestion(file_hash, collection_name)
         
-        # Extract text from document
-        extracted_text = extract_text(file_path)
-        
-        if not extracted_text.strip():
-            processing_status[processing_id]["status"] = "error"
-            processing_status[processing_id]["message"] = "No text could be extracted from the document"
-            return
-        
-        processing_status[processing_id]["message"] = "Processing text and creating knowledge chunks..."
-        
-        # Process and add to knowledge base
-        doc_count = setup_knowledge_base(extracted_text, "manuals")
+        with profiled("ingestion"):
+            # Extract text from document
+            progress.stage("extract", message="Extracting text from document...")
+            with timer.stage("extract"):
+                pages = extract_pages(
+                    file_path,
+                    on_page=lambda done, total: progress.advance(done, total, pages_extracted=done, pages_total=total),
+                )
+            extracted_text = pages if isinstance(pages, str) else "\n".join(pages)
+            
+            if not extracted_text.strip():
+                INGEST_DOCUMENTS.inc(status="empty")
+                catalog.finish_ingestion(file_hash, collection_name, "empty", pages=count_pages(file_path),
+                                         text_length=0, timings=timer.as_dict())
+                processing_status[processing_id]["status"] = "error"
+                processing_status[processing_id]["message"] = "No text could be extracted from the document"
+                progress.finish("error", message=processing_status[processing_id]["message"])
+                return
+            
+            processing_status[processing_id]["message"] = "Processing text and creating knowledge chunks..."
+            
+            # Process and add to knowledge base
+            stats = {}
+            doc_count = setup_knowledge_base(pages, collection_name, timer, stats, progress, document,
+                                             quotas(tenant)["max_chunks"])
         
         # Update status to completed
+        forget_replaced(stats, file_hash, collection_name)
+        catalog.finish_ingestion(file_hash, collection_name, "completed", pages=count_pages(file_path),
+                                 chunks=stats["chunks"], text_length=len(extracted_text), timings=timer.as_dict())
+        INGEST_DOCUMENTS.inc(status="success")
         processing_status[processing_id]["status"] = "completed"
         processing_status[processing_id]["message"] = f"Successfully processed {filename}"
         processing_status[processing_id]["chunks_created"] = doc_count
         processing_status[processing_id]["text_length"] = len(extracted_text)
         processing_status[processing_id]["completed_at"] = datetime.now().isoformat()
+        progress.finish("completed", message=f"Successfully processed {filename}",
+                        chunks_created=stats["chunks"], timings=timer.as_dict())
         
     except Exception as e:
+        INGEST_DOCUMENTS.inc(status="error")
         processing_status[processing_id]["status"] = "error"
         processing_status[processing_id]["message"] = str(e)
-        
-        # Clean up temp file on error
-        if os.path.exists(file_path):
-            os.remove(file_path)
+        catalog.finish_ingestion(file_hash, collection_name, "error", timings=timer.as_dict(), error=str(e))
+        progress.finish("error", message=str(e))
+        # The stored object is kept: other names may share it, and a retry needs it
+    finally:
+        ingestion_slots.release(tenant)
+
+def forget_replaced(stats: Dict, file_hash: str, collection_name: str):
+    """Drop catalog ingestions of content whose chunks a re-ingested document just replaced"""
+    for replaced_hash in stats.get("replaced_hashes", []):
+        if replaced_hash != file_hash:
+            upload_store.catalog.delete_ingestion(replaced_hash, collection_name)
 
 @router.post("/")
 async def save_file(file: UploadFile = File(...)):
     """Save uploaded file"""
     try:
-        # Ensure uploads directory exists
-        os.makedirs("uploads", exist_ok=True)
-        
-        file_path = f"uploads/{file.filename}"
-        with open(file_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
+        stored = upload_store.save(file.file, file.filename)
             
-        return {"message": f"File saved at {file_path}", "filename": file.filename}
+        return {
+            "message": f"File saved at {stored['path']}",
+            "filename": file.filename,
+            "hash": stored["hash"],
+            "duplicate": stored["duplicate"],
+        }
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to save file: {str(e)}")
 
 @router.post("/process-async")
 async def process_document_async_endpoint(
     background_tasks: BackgroundTasks,
-    file: UploadFile = File(...)
+    file: UploadFile = File(...),
+    product_line: Optional[str] = Form(None),
+    tenant: Optional[str] = Form(None)
 ):
-    """Upload and process document asynchronously"""
+    """Upload and process document asynchronously (into the tenant's knowledge base, if given)"""
+    collection_name = resolve_tenant(tenant)
     try:
         # Generate unique processing ID
         processing_id = str(uuid.uuid4())
         
-        # Save file first
-        os.makedirs("uploads", exist_ok=True)
-        file_path = f"uploads/{file.filename}"
-        
-        with open(file_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
+        # Save file first (content-addressed, so identical uploads share one object)
+        stored = upload_store.save(file.file, file.filename)
         
         # Initialize processing status
         processing_status[processing_id] = {
             "status": "uploaded",
             "message": "File uploaded successfully, processing started...",
             "filename": file.filename,
-            "file_size": os.path.getsize(file_path),
+            "file_size": stored["size"],
+            "file_hash": stored["hash"],
             "started_at": datetime.now().isoformat()
         }
+        progress_broker.publish(processing_id, "uploaded", filename=file.filename, file_size=stored["size"])
+        
+        # Identical content already in the knowledge base: nothing to extract or embed
+        previous = upload_store.ingestion(stored["hash"], collection_name)
+        if previous:
+            INGEST_DOCUMENTS.inc(status="duplicate")
+            processing_status[processing_id].update({
+                "status": "completed",
+                "message": f"{file.filename} was already ingested; skipped",
+                "deduplicated": True,
+                "chunks_created": previous.get("chunks"),
+                "text_length": previous.get("text_length"),
+                "completed_at": datetime.now().isoformat(),
+            })
+            progress_broker.publish(processing_id, "duplicate", filename=file.filename,
+                                    message=processing_status[processing_id]["message"],
+                                    chunks_created=previous.get("chunks"))
+            return {
+                "processing_id": processing_id,
+                "message": "Identical content was already ingested. Nothing to process.",
+                "filename": file.filename,
+                "status": "duplicate"
+            }
         
-        # Start background processing
+        # Start background processing (the tenant's slot is released when the job ends)
+        try:
+            ingestion_slots.acquire(tenant)
+        except QuotaExceeded as e:
+            processing_status[processing_id].update({"status": "error", "message": str(e)})
+            progress_broker.publish(processing_id, "error", filename=file.filename, message=str(e))
+            raise HTTPException(status_code=429, detail=str(e))
         background_tasks.add_task(
             process_document_async,
-            file_path,
+            stored["path"],
             file.filename,
-            processing_id
+            processing_id,
+            document_metadata(stored, file.filename, product_line),
+            collection_name,
+            tenant
         )
         
         return {
@@ -110,6 +207,8 @@ async def process_document_async_endpoint(
             "status": "processing_started"
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to upload file: {str(e)}")
 
@@ -121,77 +220,177 @@ async def get_processing_status(processing_id: str):
     
     return processing_status[processing_id]
 
-@router.post("/process")
-async def process_and_feed_document(file: UploadFile = File(...)):
-    """Process document and add to knowledge base (synchronous - original endpoint)"""
-    """Process document and add to knowledge base"""
-    try:
-        # Save file temporarily
-        os.makedirs("uploads", exist_ok=True)
-        file_path = f"uploads/{file.filename}"
-        
-        with open(file_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
-        
+@router.get("/events/{processing_id}")
+async def stream_processing_events(processing_id: str, request: Request, after: int = 0):
+    """
+    Server-Sent Events stream of a job's progress (pages extracted, chunks embedded and written,
+    ETA). Events missed before connecting are replayed; reconnecting clients resume from
+    Last-Event-ID. The stream ends with a completed, duplicate or error event.
+    """
+    if not progress_broker.exists(processing_id):
+        raise HTTPException(status_code=404, detail="Processing ID not found")
+    last_event_id = request.headers.get("last-event-id", "")
+    if last_event_id.isdigit():
+        after = max(after, int(last_event_id))
+
+    async def events():
+        async for event in progress_broker.subscribe(processing_id, after, heartbeat=SSE_HEARTBEAT):
+            if event is None:
+                yield ": keep-alive\n\n"
+                continue
+            yield f"id: {event['seq']}\nevent: progress\ndata: {json.dumps(event)}\n\n"
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+def ingest_upload(file: UploadFile, doc_id: str, collection_name: str = "manuals", replace: bool = False,
+                  product_line: Optional[str] = None, max_chunks: int = 0) -> Dict:
+    """
+    Store an upload and ingest it synchronously as document doc_id, replacing that document's
+    previous chunks. Content already ingested is skipped unless replace is set; QuotaExceeded
+    is raised if the collection would hold more than max_chunks.
+    """
+    # Save file (content-addressed, so identical uploads share one object)
+    stored = upload_store.save(file.file, file.filename)
+    file_path = stored["path"]
+    
+    previous = upload_store.ingestion(stored["hash"], collection_name)
+    if previous and not replace:
+        INGEST_DOCUMENTS.inc(status="duplicate")
+        return {
+            "message": f"{file.filename} was already ingested; skipped",
+            "filename": file.filename,
+            "text_length": previous.get("text_length"),
+            "chunks_created": previous.get("chunks"),
+            "status": "duplicate"
+        }
+    
+    catalog = upload_store.catalog
+    timer = StageTimer(INGEST_STAGE_SECONDS)
+    catalog.start_ingestion(stored["hash"], collection_name)
+    with profiled("ingestion"):
         # Extract text from document
         try:
-            extracted_text = extract_text(file_path)
+            with timer.stage("extract"):
+                pages = extract_pages(file_path)
+            extracted_text = pages if isinstance(pages, str) else "\n".join(pages)
         except Exception as e:
-            # Clean up temp file
-            if os.path.exists(file_path):
-                os.remove(file_path)
+            INGEST_DOCUMENTS.inc(status="error")
+            catalog.finish_ingestion(stored["hash"], collection_name, "error", timings=timer.as_dict(), error=str(e))
             raise HTTPException(status_code=400, detail=f"Failed to extract text: {str(e)}")
-        
+    
         if not extracted_text.strip():
-            # Clean up temp file
-            if os.path.exists(file_path):
-                os.remove(file_path)
+            INGEST_DOCUMENTS.inc(status="empty")
+            catalog.finish_ingestion(stored["hash"], collection_name, "empty", pages=count_pages(file_path),
+                                     text_length=0, timings=timer.as_dict())
             raise HTTPException(status_code=400, detail="No text could be extracted from the document")
-        
+    
         # Process and add to knowledge base
         try:
-            doc_count = setup_knowledge_base(extracted_text, "manuals")
+            stats = {}
+            document = document_metadata(stored, doc_id, product_line)
+            doc_count = setup_knowledge_base(pages, collection_name, timer, stats, document=document,
+                                             max_chunks=max_chunks)
+        except QuotaExceeded as e:
+            INGEST_DOCUMENTS.inc(status="error")
+            catalog.finish_ingestion(stored["hash"], collection_name, "error", timings=timer.as_dict(), error=str(e))
+            raise
         except Exception as e:
-            # Clean up temp file
-            if os.path.exists(file_path):
-                os.remove(file_path)
+            INGEST_DOCUMENTS.inc(status="error")
+            catalog.finish_ingestion(stored["hash"], collection_name, "error", timings=timer.as_dict(), error=str(e))
             raise HTTPException(status_code=500, detail=f"Failed to process document: {str(e)}")
-        
-        # Clean up temp file (optional - you might want to keep it)
-        # if os.path.exists(file_path):
-        #     os.remove(file_path)
-        
-        return {
-            "message": f"Successfully processed {file.filename}",
-            "filename": file.filename,
-            "text_length": len(extracted_text),
-            "chunks_created": doc_count,
-            "status": "success"
-        }
-        
+    
+    forget_replaced(stats, stored["hash"], collection_name)
+    catalog.finish_ingestion(stored["hash"], collection_name, "completed", pages=count_pages(file_path),
+                             chunks=stats["chunks"], text_length=len(extracted_text), timings=timer.as_dict())
+    INGEST_DOCUMENTS.inc(status="success")
+    
+    return {
+        "message": f"Successfully processed {file.filename}",
+        "filename": file.filename,
+        "doc_id": doc_id,
+        "text_length": len(extracted_text),
+        "chunks_created": doc_count,
+        "chunks_replaced": stats["replaced_chunks"],
+        "status": "success"
+    }
+
+def ingest_for_tenant(file: UploadFile, doc_id: str, tenant: Optional[str], collection: str = "manuals",
+                      replace: bool = False, product_line: Optional[str] = None) -> Dict:
+    """ingest_upload into the tenant's collection, within its quotas (HTTP 429 when over one)"""
+    collection_name = resolve_tenant(tenant, collection)
+    try:
+        with ingestion_slots.slot(tenant):
+            return ingest_upload(file, doc_id, collection_name, replace, product_line, quotas(tenant)["max_chunks"])
+    except QuotaExceeded as e:
+        raise HTTPException(status_code=429, detail=str(e))
+
+@router.post("/process")
+async def process_and_feed_document(file: UploadFile = File(...), product_line: Optional[str] = Form(None),
+                                    tenant: Optional[str] = Form(None)):
+    """Process document and add to knowledge base (synchronous - original endpoint)"""
+    """Process document and add to knowledge base"""
+    try:
+        return await asyncio.to_thread(ingest_for_tenant, file, file.filename, tenant, product_line=product_line)
     except HTTPException:
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Unexpected error: {str(e)}")
 
+@router.put("/documents/{doc_id:path}")
+async def replace_document(doc_id: str, file: UploadFile = File(...), collection: str = "manuals",
+                           product_line: Optional[str] = Form(None), tenant: Optional[str] = None):
+    """
+    Replace one document's chunks with a new version of the file. The new chunks are written
+    before the old ones are deleted, so the document never disappears from search.
+    """
+    try:
+        return await asyncio.to_thread(ingest_for_tenant, file, doc_id, tenant, collection, True, product_line)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Unexpected error: {str(e)}")
+
+@router.delete("/documents/{doc_id:path}")
+async def remove_document(doc_id: str, collection: str = "manuals", tenant: Optional[str] = None):
+    """Delete every chunk of one document (its doc_id is the uploaded filename unless set on PUT)"""
+    collection = resolve_tenant(tenant, collection)
+    try:
+        removed = await asyncio.to_thread(delete_document, doc_id, collection)
+        for file_hash in removed["file_hashes"]:
+            upload_store.catalog.delete_ingestion(file_hash, collection)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to delete document: {str(e)}")
+    if not removed["chunks"]:
+        raise HTTPException(status_code=404, detail=f"Document not found: {doc_id}")
+    return {"doc_id": doc_id, "collection": collection, "chunks_deleted": removed["chunks"], "status": "deleted"}
+
 @router.get("/list")
-async def list_uploaded_files():
-    """List all uploaded files"""
+async def list_uploaded_files(
+    page: int = Query(1, ge=1),
+    page_size: int = Query(50, ge=1, le=500),
+    status: Optional[str] = Query(None, description="completed, processing, empty, error or uploaded (never ingested)"),
+    collection: Optional[str] = None,
+    tenant: Optional[str] = Query(None, description="Only files ingested into this tenant's knowledge base"),
+    search: Optional[str] = Query(None, description="Filename prefix (case-insensitive)"),
+    sort: str = "uploaded_at",
+    order: str = "desc",
+):
+    """List uploaded files from the catalog, paginated, filtered and sorted"""
+    if tenant:
+        collection = resolve_tenant(tenant, collection or "manuals")
     try:
-        if not os.path.exists("uploads"):
-            return {"files": []}
-        
-        files = []
-        for filename in os.listdir("uploads"):
-            file_path = os.path.join("uploads", filename)
-            if os.path.isfile(file_path):
-                stat = os.stat(file_path)
-                files.append({
-                    "filename": filename,
-                    "size": stat.st_size,
-                    "modified": stat.st_mtime
-                })
+        result = await asyncio.to_thread(
+            upload_store.catalog.list_files, page, page_size, status, collection, search, sort, order
+        )
+        for entry in result["files"]:
+            entry["modified"] = datetime.fromisoformat(entry["uploaded_at"]).timestamp()
         
-        return {"files": files}
+        return result
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to list files: {str(e)}")
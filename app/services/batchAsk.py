@@ -0,0 +1,90 @@
+import json
+import os
+import sys
+import time
+import urllib.error
+import urllib.request
+from typing import Any, Dict, Iterator, List
+
+# Add the project root to Python path so app.config resolves from scripts too
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+
+def read_questions(path: str) -> List[Any]:
+    """Questions from a .jsonl file (strings or {"question", "id", "scope"} objects) or a text file, one per line"""
+    with open(path, encoding="utf-8") as f:
+        lines = [line.strip() for line in f if line.strip()]
+    if path.endswith((".jsonl", ".ndjson")):
+        return [json.loads(line) for line in lines]
+    return lines
+
+
+def ask_server(url: str, payload: Dict[str, Any], timeout: float = 3600) -> Iterator[Dict[str, Any]]:
+    """Post a batch to a running server's /chat/batch and yield its NDJSON lines as they arrive"""
+    request = urllib.request.Request(
+        f"{url.rstrip('/')}/chat/batch",
+        data=json.dumps(payload).encode("utf-8"),
+        headers={"Content-Type": "application/json"},
+        method="POST",
+    )
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        for line in response:
+            if line.strip():
+                yield json.loads(line)
+
+
+def ask_local(payload: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    """Answer a batch in this process, without a server"""
+    from chatbot import AdaptiveKnowledgeChatbot, normalize_batch
+
+    bot = AdaptiveKnowledgeChatbot(collection_name="manuals")
+    yield from bot.answer_batch(normalize_batch(payload["questions"]), payload.get("tenant"), payload.get("k", 5),
+                                payload.get("concurrency"), payload.get("include_context", False))
+
+
+def main():
+    """Run a file of questions through batch question answering, writing NDJSON results"""
+    import argparse
+    from dotenv import load_dotenv
+
+    load_dotenv()
+
+    parser = argparse.ArgumentParser(description="Answer many questions in one batch (see POST /chat/batch).")
+    parser.add_argument("-i", "--input", required=True, help="Questions: .jsonl (strings or objects) or text, one per line")
+    parser.add_argument("-o", "--output", default="batch_results.ndjson", help="NDJSON results file")
+    parser.add_argument("--url", default="http://localhost:8000", help="Server to send the batch to")
+    parser.add_argument("--local", action="store_true", help="Answer in this process instead of through a server")
+    parser.add_argument("-t", "--tenant", help="Tenant whose knowledge base to search")
+    parser.add_argument("-k", type=int, default=5, help="Chunks retrieved per question (default: 5)")
+    parser.add_argument("-c", "--concurrency", type=int, help="LLM calls in flight (default: BATCH_LLM_CONCURRENCY)")
+    parser.add_argument("--include-context", action="store_true", help="Include the retrieved chunks in every result")
+    args = parser.parse_args()
+
+    questions = read_questions(args.input)
+    payload = {"questions": questions, "tenant": args.tenant, "k": args.k, "concurrency": args.concurrency,
+               "include_context": args.include_context}
+    print(f"📨 Sending {len(questions)} questions {'locally' if args.local else 'to ' + args.url}")
+
+    started = time.perf_counter()
+    done = 0
+    try:
+        with open(args.output, "w", encoding="utf-8") as out:
+            for item in (ask_local(payload) if args.local else ask_server(args.url, payload)):
+                out.write(json.dumps(item) + "\n")
+                if item.get("type") == "summary":
+                    print(f"📈 {item['answered']} answered, {item['failed']} failed in {item['seconds']:.1f}s "
+                          f"({item['questions_per_s']} questions/s) -> {args.output}")
+                    continue
+                done += 1
+                if done % 100 == 0 or done == len(questions):
+                    print(f"[{done}/{len(questions)}] {done / (time.perf_counter() - started):.1f} questions/s")
+    except urllib.error.HTTPError as e:
+        print(f"❌ {e.code}: {e.read().decode('utf-8', 'replace')}")
+        sys.exit(1)
+    except (OSError, ValueError) as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
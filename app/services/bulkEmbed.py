@@ -0,0 +1,116 @@
+import os
+import sys
+from time import perf_counter
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+# Add the project root to Python path so app.config resolves from scripts too
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from app.config import settings
+
+# MiniLM-L6 shape, used to estimate activation memory per text in a batch
+HIDDEN_SIZE = 384
+INTERMEDIATE_SIZE = 1536
+ATTENTION_HEADS = 12
+MIN_BATCH = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough WordPiece length (about 4 characters per token plus [CLS]/[SEP])"""
+    return len(text) // 4 + 2
+
+
+def batch_size_for(tokens: int, memory_target_bytes: int, max_batch: int) -> int:
+    """
+    Most texts of `tokens` length that fit the memory target: per text, float32 hidden and
+    feed-forward activations grow with length, attention scores with its square.
+    """
+    per_text = tokens * 4 * (4 * HIDDEN_SIZE + INTERMEDIATE_SIZE) + 2 * ATTENTION_HEADS * tokens * tokens * 4
+    return max(MIN_BATCH, min(max_batch, memory_target_bytes // max(per_text, 1)))
+
+
+def length_buckets(lengths: Sequence[int], memory_target_bytes: int, max_batch: int) -> List[List[int]]:
+    """
+    Group item indices into batches of similar length, shortest first. Each batch grows until
+    the batch size allowed for its (current) longest item is reached.
+    """
+    order = sorted(range(len(lengths)), key=lengths.__getitem__)
+    batches, batch = [], []
+    for index in order:
+        if batch and len(batch) >= batch_size_for(lengths[index], memory_target_bytes, max_batch):
+            batches.append(batch)
+            batch = []
+        batch.append(index)
+    if batch:
+        batches.append(batch)
+    return batches
+
+
+def embed_in_buckets(
+    embed_batch: Callable[[list], List[List[float]]],
+    items: Sequence,
+    lengths: Sequence[int],
+    memory_target_mb: Optional[float] = None,
+    max_batch: Optional[int] = None,
+    on_batch: Optional[Callable[[int, int], None]] = None,
+) -> Tuple[List[List[float]], Dict]:
+    """
+    Embed items (texts, or pre-tokenized encodings) in length-bucketed batches sized for the
+    memory target, returning vectors in the original order plus throughput stats.
+    on_batch(items_done, items_total) is called after every batch.
+    """
+    memory_target_bytes = int((memory_target_mb or settings.EMBEDDING_MEMORY_TARGET_MB) * 2**20)
+    max_batch = max_batch or settings.EMBEDDING_BATCH_SIZE
+    vectors: List[Optional[List[float]]] = [None] * len(items)
+    padded_tokens = 0
+
+    started = perf_counter()
+    batches = length_buckets(lengths, memory_target_bytes, max_batch)
+    done = 0
+    for batch in batches:
+        for index, vector in zip(batch, embed_batch([items[i] for i in batch])):
+            vectors[index] = vector
+        padded_tokens += len(batch) * max(lengths[i] for i in batch)
+        done += len(batch)
+        if on_batch:
+            on_batch(done, len(items))
+    seconds = perf_counter() - started
+
+    tokens = sum(lengths)
+    return vectors, {
+        "texts": len(items),
+        "tokens": tokens,
+        "batches": len(batches),
+        "seconds": seconds,
+        "tokens_per_s": tokens / seconds if seconds else 0.0,
+        # Share of computed positions that were real tokens rather than padding
+        "padding_efficiency": tokens / padded_tokens if padded_tokens else 1.0,
+    }
+
+
+def _sentence_transformer_batch(embedding_model) -> Optional[Callable[[List[str]], List[List[float]]]]:
+    """
+    Batch embedder for a HuggingFaceEmbeddings: its embed_documents re-batches at the
+    SentenceTransformer default of 32, so each bucket is encoded here as one forward pass
+    """
+    client = getattr(embedding_model, "client", None)
+    if not hasattr(client, "encode") or not hasattr(embedding_model, "encode_kwargs"):
+        return None
+    encode_kwargs = {key: value for key, value in (embedding_model.encode_kwargs or {}).items() if key != "batch_size"}
+
+    def embed_batch(texts: List[str]) -> List[List[float]]:
+        # Same input as embed_documents, which replaces newlines
+        texts = [text.replace("\n", " ") for text in texts]
+        return client.encode(texts, batch_size=len(texts), **encode_kwargs).tolist()
+
+    return embed_batch
+
+
+def bulk_embed(embedding_model, texts: List[str], memory_target_mb: Optional[float] = None,
+               on_batch: Optional[Callable[[int, int], None]] = None) -> Tuple[List[List[float]], Dict]:
+    """Embed a whole document's chunks with any embeddings object"""
+    if hasattr(embedding_model, "bulk_embed"):
+        return embedding_model.bulk_embed(texts, memory_target_mb, on_batch)
+    lengths = [estimate_tokens(text) for text in texts]
+    embed_batch = _sentence_transformer_batch(embedding_model) or embedding_model.embed_documents
+    return embed_in_buckets(embed_batch, texts, lengths, memory_target_mb, on_batch=on_batch)
@@ -1,27 +1,131 @@
 import os
-from typing import Dict, List, Any, Optional
+import sys
+import asyncio
+from typing import Dict, List, Any, Optional, Iterator, AsyncIterator, Tuple, Union
 from datetime import datetime
+from time import perf_counter
 import uuid
-import chromadb
-from langchain_huggingface import HuggingFaceEmbeddings
-from langchain_groq import ChatGroq
-from langchain.memory import ConversationBufferWindowMemory
-from langchain.schema import HumanMessage, AIMessage
 from dotenv import load_dotenv
+from draftCache import DraftCache
+from faqIndex import faq_collection_name, find_answer
+from metrics import ASK_STAGE_SECONDS, ASK_REQUESTS, DRAFT_PREFETCH_SECONDS, StageTimer
+from profiler import profiled
+from tenants import collection_cache, tenant_collection
+
+# chromadb and LangChain are imported lazily so that importing this module stays cheap;
+# the app loads them in a background warm-up task (see startup.py)
+
+# Add the project root to Python path so app.config resolves from scripts too
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from app.config import settings
 
 load_dotenv()
 
+# Query embeddings per multi-query vector search of a batch
+BATCH_QUERY_SIZE = 256
+# Scope keys that select chunks by metadata value, mapped to the chunk metadata field
+SCOPE_FIELDS = {"doc_ids": "doc_id", "product_lines": "product_line"}
+# Scope keys that bound the upload date, mapped to the comparison on uploaded_at
+SCOPE_DATE_BOUNDS = {"uploaded_after": "$gte", "uploaded_before": "$lt"}
+
+def scope_filter(scope: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """
+    Translate a retrieval scope into a Chroma where clause, applied as a pre-filter of the
+    vector search. A scope may name doc_ids and product_lines (lists, any of which match) and
+    bound the upload date with uploaded_after / uploaded_before (ISO dates or datetimes).
+    Raises ValueError for unknown keys or malformed values.
+    """
+    if not scope:
+        return None
+    if not isinstance(scope, dict):
+        raise ValueError("scope must be an object")
+    unknown = set(scope) - set(SCOPE_FIELDS) - set(SCOPE_DATE_BOUNDS)
+    if unknown:
+        raise ValueError(f"Unknown scope keys: {', '.join(sorted(unknown))}")
+    
+    conditions = []
+    for key, field in SCOPE_FIELDS.items():
+        values = scope.get(key)
+        if values is None:
+            continue
+        if isinstance(values, str):
+            values = [values]
+        if not isinstance(values, list) or not values or not all(isinstance(value, str) for value in values):
+            raise ValueError(f"{key} must be a non-empty list of strings")
+        conditions.append({field: {"$in": values}})
+    for key, operator in SCOPE_DATE_BOUNDS.items():
+        if scope.get(key) is None:
+            continue
+        try:
+            bound = datetime.fromisoformat(str(scope[key]))
+        except ValueError:
+            raise ValueError(f"{key} must be an ISO date, e.g. 2024-05-01")
+        conditions.append({"uploaded_at": {operator: int(bound.timestamp())}})
+    
+    if not conditions:
+        return None
+    return conditions[0] if len(conditions) == 1 else {"$and": conditions}
+
+def normalize_batch(questions: Any) -> List[Dict[str, Any]]:
+    """
+    Validate the questions of a batch (see AdaptiveKnowledgeChatbot.answer_batch): strings or
+    objects with "question" and optional "id" and "scope". Raises ValueError for a bad batch.
+    """
+    if not isinstance(questions, list) or not questions:
+        raise ValueError("questions must be a non-empty list")
+    if len(questions) > settings.BATCH_MAX_QUESTIONS:
+        raise ValueError(f"At most {settings.BATCH_MAX_QUESTIONS} questions per batch")
+    
+    normalized = []
+    for index, item in enumerate(questions):
+        if isinstance(item, str):
+            item = {"question": item}
+        if not isinstance(item, dict) or not isinstance(item.get("question"), str) or not item["question"].strip():
+            raise ValueError(f"Question {index} must be a non-empty string or an object with a \"question\"")
+        try:
+            scope_filter(item.get("scope"))
+        except ValueError as e:
+            raise ValueError(f"Question {index} has an invalid scope: {e}")
+        normalized.append({"id": item.get("id", index), "question": item["question"].strip(), "scope": item.get("scope")})
+    return normalized
+
+def create_llm():
+    """The configured chat model: Groq, or the local stub used by load tests"""
+    if settings.LLM_BACKEND == "stub":
+        from stubLLM import StubChatModel  # lazy import
+        
+        return StubChatModel(
+            latency_ms=settings.STUB_LLM_LATENCY_MS,
+            tokens_per_sec=settings.STUB_LLM_TOKENS_PER_SEC,
+            answer_tokens=settings.STUB_LLM_ANSWER_TOKENS
+        )
+    
+    api_key = os.getenv("GROQ_API_KEY")
+    if not api_key:
+        raise ValueError("GROQ_API_KEY not found in environment variables")
+    
+    from langchain_groq import ChatGroq  # lazy import
+    
+    return ChatGroq(
+        api_key=api_key,
+        model="llama-3.3-70b-versatile",
+        temperature=0.1,
+        max_tokens=1024
+    )
+
 class UserMemoryManager:
     """Manages separate conversation memory for each user"""
     
     def __init__(self, memory_window: int = 10):
-        self.user_memories: Dict[str, ConversationBufferWindowMemory] = {}
+        self.user_memories: Dict[str, "ConversationBufferWindowMemory"] = {}
         self.memory_window = memory_window
         self.user_sessions: Dict[str, Dict] = {}
     
-    def get_user_memory(self, user_id: str) -> ConversationBufferWindowMemory:
+    def get_user_memory(self, user_id: str) -> "ConversationBufferWindowMemory":
         """Get or create memory for a specific user"""
         if user_id not in self.user_memories:
+            from langchain.memory import ConversationBufferWindowMemory  # lazy import
             self.user_memories[user_id] = ConversationBufferWindowMemory(
                 k=self.memory_window,
                 return_messages=True
@@ -70,9 +174,13 @@ class UserMemoryManager:
 class AdaptiveKnowledgeChatbot:
     """Enhanced chatbot with user-specific memory and WebSocket support"""
     
-    def __init__(self, collection_name: str = "manuals"):
+    def __init__(self, collection_name: str = "manuals", embedding_model=None):
         self.collection_name = collection_name
         self.memory_manager = UserMemoryManager()
+        # Context retrieved from what users are still typing (see prefetch_draft)
+        self.drafts = DraftCache(settings.DRAFT_PREFETCH_TTL, settings.DRAFT_MIN_SIMILARITY)
+        # An explicit model (e.g. from a benchmark) replaces the one recorded on the collection
+        self._embedding_override = embedding_model
         
         # Initialize components
         self._init_vectorstore()
@@ -81,48 +189,63 @@ class AdaptiveKnowledgeChatbot:
     def _init_vectorstore(self):
         """Initialize ChromaDB vectorstore"""
         try:
-            self.chroma_client = chromadb.PersistentClient(path="./chroma_db")
-            self.collection = self.chroma_client.get_or_create_collection(name=self.collection_name)
-            self.embedding_model = HuggingFaceEmbeddings(
-                model_name="sentence-transformers/all-MiniLM-L6-v2"
-            )
+            self.collection, self.embedding_model = self._serving_collection(create=True)
             print(f"✅ Connected to vectorstore: {self.collection.count()} documents")
         except Exception as e:
             print(f"❌ Failed to initialize vectorstore: {e}")
             raise
     
+    def _serving_collection(self, tenant: Optional[str] = None, create: bool = False):
+        """
+        The collection currently behind collection_name (or the tenant's own, see tenants.py) and
+        the embedding model it was built with, from the shared handle cache; (None, None) when the
+        tenant has nothing ingested yet
+        """
+        collection, embedding_model = collection_cache.get(tenant_collection(tenant, self.collection_name), create,
+                                                           self._embedding_override)
+        if collection is not None and not tenant:
+            self.collection, self.embedding_model = collection, embedding_model
+        return collection, embedding_model
+    
     def _init_llm(self):
-        """Initialize Groq LLM"""
+        """Initialize Groq LLM (or the local stub used by load tests)"""
         try:
-            api_key = os.getenv("GROQ_API_KEY")
-            if not api_key:
-                raise ValueError("GROQ_API_KEY not found in environment variables")
-            
-            self.llm = ChatGroq(
-                api_key=api_key,
-                model="llama-3.3-70b-versatile",
-                temperature=0.1,
-                max_tokens=1024
-            )
-            print("✅ Connected to Groq LLM")
+            self.llm = create_llm()
+            print("✅ Using stub LLM" if settings.LLM_BACKEND == "stub" else "✅ Connected to Groq LLM")
         except Exception as e:
             print(f"❌ Failed to initialize LLM: {e}")
             raise
     
-    def _retrieve_context(self, query: str, k: int = 5) -> List[str]:
-        """Retrieve relevant context from vectorstore"""
+    def _retrieve_context(self, query: str, k: int = 5, timer: Optional[StageTimer] = None,
+                          where: Optional[Dict[str, Any]] = None, tenant: Optional[str] = None,
+                          query_embedding: Optional[List[float]] = None) -> List[str]:
+        """
+        Retrieve relevant context from vectorstore (the tenant's knowledge base, if any),
+        searching only chunks matching `where` (see scope_filter); query_embedding skips
+        embedding the query again
+        """
+        timer = timer or StageTimer(ASK_STAGE_SECONDS)
         try:
-            query_embedding = self.embedding_model.embed_query(query)
-            results = self.collection.query(
-                query_embeddings=[query_embedding],
-                n_results=k
-            )
+            collection, embedding_model = self._serving_collection(tenant)
+            if collection is None:
+                return []
+            if query_embedding is None:
+                with timer.stage("embed_query"):
+                    query_embedding = embedding_model.embed_query(query)
+            with timer.stage("vector_query"):
+                results = collection.query(
+                    query_embeddings=[query_embedding],
+                    n_results=k,
+                    where=where
+                )
             
             if results["documents"] and results["documents"][0]:
                 return results["documents"][0]
             return []
         except Exception as e:
             print(f"❌ Context retrieval error: {e}")
+            # The handle may be stale (collection deleted and recreated); reopen it next time
+            collection_cache.evict(tenant_collection(tenant, self.collection_name))
             return []
     
     def _calculate_confidence(self, query: str, context: List[str]) -> float:
@@ -140,92 +263,330 @@ class AdaptiveKnowledgeChatbot:
         
         return confidence
     
-    def ask_question(self, query: str, user_id: str = "default") -> Dict[str, Any]:
-        """Ask a question with user-specific memory"""
-        try:
-            # Retrieve relevant context
-            context = self._retrieve_context(query)
+    def _prepare_prompt(self, query: str, user_id: str, timer: StageTimer, scope: Optional[Dict[str, Any]] = None,
+                        tenant: Optional[str] = None, query_embedding: Optional[List[float]] = None,
+                        context: Optional[List[str]] = None) -> Tuple[List[str], float, str]:
+        """
+        Retrieve context (from the tenant's knowledge base, within the scope, if any) and build the
+        LLM prompt; context already prefetched (see prefetch_draft) is used as is
+        """
+        if context is None:
+            context = self._retrieve_context(query, timer=timer, where=scope_filter(scope), tenant=tenant,
+                                             query_embedding=query_embedding)
+        with timer.stage("confidence"):
             confidence = self._calculate_confidence(query, context)
-            
-            # Get user memory
-            memory = self.memory_manager.get_user_memory(user_id)
-            conversation_history = memory.chat_memory.messages[-6:] if memory.chat_memory.messages else []
-            
-            # Build context-aware prompt
-            context_text = "\n".join(context[:3]) if context else "No relevant context found."
-            
-            # Format conversation history
-            history_text = ""
-            if conversation_history:
-                history_text = "\n\nPrevious conversation:\n"
-                for i in range(0, len(conversation_history), 2):
-                    if i + 1 < len(conversation_history):
-                        history_text += f"User: {conversation_history[i].content}\n"
-                        history_text += f"Assistant: {conversation_history[i + 1].content}\n"
-            
-            prompt = f"""You are a helpful AI assistant with access to a knowledge base. Answer the user's question based on the provided context and conversation history.
+        
+        prompt_start = perf_counter()
+        # Get user memory
+        memory = self.memory_manager.get_user_memory(user_id)
+        conversation_history = memory.chat_memory.messages[-6:] if memory.chat_memory.messages else []
+        prompt = self._build_prompt(query, context, conversation_history)
+        timer.record("prompt_build", perf_counter() - prompt_start)
+        return context, confidence, prompt
+    
+    def _build_prompt(self, query: str, context: List[str], conversation_history: List[Any]) -> str:
+        """The LLM prompt for a question, its retrieved context and the recent conversation messages"""
+        # Build context-aware prompt
+        context_text = "\n".join(context[:3]) if context else "No relevant context found."
+        
+        # Format conversation history
+        history_text = ""
+        if conversation_history:
+            history_text = "\n\nPrevious conversation:\n"
+            for i in range(0, len(conversation_history), 2):
+                if i + 1 < len(conversation_history):
+                    history_text += f"User: {conversation_history[i].content}\n"
+                    history_text += f"Assistant: {conversation_history[i + 1].content}\n"
+        
+        prompt = f"""You are a helpful AI assistant with access to a knowledge base. Answer the user's question based on the provided context and conversation history.
 
-                Context from knowledge base:
-                {context_text}
+            Context from knowledge base:
+            {context_text}
 
-                Previous conversation history:
-                {history_text}
+            Previous conversation history:
+            {history_text}
 
-                User question: {query}
+            User question: {query}
 
-                Instructions:
-                - Use the context and conversation history to provide accurate answers
-                - If the information isn't in the context, say "I don't have enough information about that topic"
-                - Be conversational and remember previous parts of our conversation
-                - Keep responses concise but helpful
-                - No need of any citations or references or preamble like "Based on the provided context, etc."
-                Answer:"""
+            Instructions:
+            - Use the context and conversation history to provide accurate answers
+            - If the information isn't in the context, say "I don't have enough information about that topic"
+            - Be conversational and remember previous parts of our conversation
+            - Keep responses concise but helpful
+            - No need of any citations or references or preamble like "Based on the provided context, etc."
+            Answer:"""
+        return prompt
+    
+    def _faq_lookup(self, query: str, user_id: str, timer: StageTimer, scope: Optional[Dict[str, Any]] = None,
+                    tenant: Optional[str] = None) -> Tuple[Optional[Dict[str, Any]], Optional[List[float]]]:
+        """
+        The precomputed FAQ entry (see faqIndex.py) answering a user's first question, if one is
+        close enough, and the query embedding, when retrieval can reuse it after a miss
+        """
+        if self.memory_manager.get_user_memory(user_id).chat_memory.messages:
+            return None, None  # follow-ups depend on the conversation
+        alias = tenant_collection(tenant, self.collection_name)
+        faq_collection, faq_model = collection_cache.get(faq_collection_name(alias),
+                                                         embedding_model=self._embedding_override)
+        if faq_collection is None:
+            return None, None
+        with timer.stage("embed_query"):
+            query_embedding = faq_model.embed_query(query)
+        with timer.stage("faq_lookup"):
+            faq = find_answer(faq_collection, query_embedding, scope_filter(scope))
+        _, embedding_model = self._serving_collection(tenant)
+        return faq, query_embedding if embedding_model is faq_model else None
+    
+    def _faq_answer(self, query: str, user_id: str, faq: Dict[str, Any], timer: StageTimer) -> Dict[str, Any]:
+        response = self._finish_answer(query, user_id, faq["answer"], [faq["answer"]], faq["similarity"], timer)
+        response["faq"] = faq
+        return response
+    
+    def prefetch_draft(self, draft: str, user_id: str = "default", scope: Optional[Dict[str, Any]] = None,
+                       tenant: Optional[str] = None):
+        """
+        Retrieve context for a question the user is still typing, so that the final question, if
+        close enough to the draft, goes straight to the LLM (see DraftCache)
+        """
+        timer = StageTimer(DRAFT_PREFETCH_SECONDS)
+        context = self._retrieve_context(draft, timer=timer, where=scope_filter(scope), tenant=tenant)
+        self.drafts.put(user_id, draft, context, tenant, scope)
+    
+    @profiled("ask_question")
+    def ask_question(self, query: str, user_id: str = "default", scope: Optional[Dict[str, Any]] = None,
+                     tenant: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Ask a question with user-specific memory, searching the tenant's knowledge base (the shared
+        one without a tenant), optionally only the scope's documents
+        """
+        timer = StageTimer(ASK_STAGE_SECONDS)
+        try:
+            # Context prefetched from the user's draft of this question skips embedding it; otherwise
+            # a first question close to a precomputed FAQ entry is answered without the LLM
+            context = self.drafts.take(user_id, query, tenant, scope)
+            faq, query_embedding = self._faq_lookup(query, user_id, timer, scope, tenant) if context is None else (None, None)
+            if faq:
+                return self._faq_answer(query, user_id, faq, timer)
+            context, confidence, prompt = self._prepare_prompt(query, user_id, timer, scope, tenant, query_embedding,
+                                                               context)
+            
+            from langchain.schema import HumanMessage  # lazy import
             
             # Get response from LLM
-            response = self.llm.invoke([HumanMessage(content=prompt)])
+            with timer.stage("llm"):
+                response = self.llm.invoke([HumanMessage(content=prompt)])
             answer = response.content
             
-            # Add to user memory
-            self.memory_manager.add_message(user_id, query, answer)
-            
-            return {
-                "success": True,
-                "answer": answer,
-                "context": context,
-                "confidence": confidence,
-                "user_id": user_id
-            }
+            return self._finish_answer(query, user_id, answer, context, confidence, timer)
             
         except Exception as e:
-            error_msg = f"Sorry, I encountered an error: {str(e)}"
-            return {
-                "success": False,
-                "answer": error_msg,
-                "context": [],
-                "confidence": 0.0,
-                "user_id": user_id
-            }
+            return self._error_answer(user_id, e, timer)
+    
+    def stream_question(self, query: str, user_id: str = "default", scope: Optional[Dict[str, Any]] = None,
+                        tenant: Optional[str] = None) -> Iterator[Union[str, Dict[str, Any]]]:
+        """Like ask_question, but yields answer text deltas as they arrive and then the final response dict"""
+        with profiled("ask_question"):
+            timer = StageTimer(ASK_STAGE_SECONDS)
+            try:
+                context = self.drafts.take(user_id, query, tenant, scope)
+                faq, query_embedding = (self._faq_lookup(query, user_id, timer, scope, tenant) if context is None
+                                        else (None, None))
+                if faq:
+                    yield faq["answer"]
+                    yield self._faq_answer(query, user_id, faq, timer)
+                    return
+                context, confidence, prompt = self._prepare_prompt(query, user_id, timer, scope, tenant,
+                                                                   query_embedding, context)
+                
+                from langchain.schema import HumanMessage  # lazy import
+                
+                parts = []
+                llm_start = perf_counter()
+                for chunk in self.llm.stream([HumanMessage(content=prompt)]):
+                    if not chunk.content:
+                        continue
+                    if not parts:
+                        timer.record("llm_first_token", perf_counter() - llm_start)
+                    parts.append(chunk.content)
+                    yield chunk.content
+                timer.record("llm", perf_counter() - llm_start)
+                
+                yield self._finish_answer(query, user_id, "".join(parts), context, confidence, timer)
+                
+            except Exception as e:
+                yield self._error_answer(user_id, e, timer)
+    
+    async def astream_question(self, query: str, user_id: str = "default", scope: Optional[Dict[str, Any]] = None,
+                               tenant: Optional[str] = None) -> AsyncIterator[Union[str, Dict[str, Any]]]:
+        """Async wrapper around stream_question that runs the whole answer on one worker thread"""
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        done = object()
+        
+        def produce():
+            try:
+                for item in self.stream_question(query, user_id, scope, tenant):
+                    loop.call_soon_threadsafe(queue.put_nowait, item)
+            finally:
+                loop.call_soon_threadsafe(queue.put_nowait, done)
+        
+        worker = loop.run_in_executor(None, produce)
+        while True:
+            item = await queue.get()
+            if item is done:
+                break
+            yield item
+        await worker
+    
+    def answer_batch(self, questions: List[Dict[str, Any]], tenant: Optional[str] = None, k: int = 5,
+                     concurrency: Optional[int] = None, include_context: bool = False) -> Iterator[Dict[str, Any]]:
+        """
+        Answer many independent questions (see normalize_batch; no conversation memory), yielding
+        a "result" per question as soon as its answer is ready, in completion order, then a
+        "summary". All questions are embedded in one batched pass and searched with one
+        multi-query vector call per distinct scope; LLM calls run on at most `concurrency` threads
+        (capped by BATCH_LLM_CONCURRENCY). If retrieval fails, every question fails without an
+        LLM call rather than being answered without its context.
+        """
+        import json
+        from concurrent.futures import ThreadPoolExecutor, as_completed
+        from bulkEmbed import bulk_embed
+        from langchain.schema import HumanMessage  # lazy import
+        
+        started = perf_counter()
+        timer = StageTimer(ASK_STAGE_SECONDS)
+        queries = [item["question"] for item in questions]
+        contexts: List[List[str]] = [[] for _ in questions]
+        retrieval_error = None
+        try:
+            collection, embedding_model = self._serving_collection(tenant)
+            if collection is not None:
+                with timer.stage("batch_embed"):
+                    vectors, _ = bulk_embed(embedding_model, queries)
+                # Questions sharing a scope share one query call
+                groups: Dict[str, Tuple[Optional[Dict[str, Any]], List[int]]] = {}
+                for index, item in enumerate(questions):
+                    where = scope_filter(item.get("scope"))
+                    groups.setdefault(json.dumps(where, sort_keys=True), (where, []))[1].append(index)
+                with timer.stage("batch_vector_query"):
+                    for where, indices in groups.values():
+                        for start in range(0, len(indices), BATCH_QUERY_SIZE):
+                            part = indices[start:start + BATCH_QUERY_SIZE]
+                            results = collection.query(query_embeddings=[vectors[i] for i in part], n_results=k,
+                                                       where=where)
+                            for index, documents in zip(part, results["documents"]):
+                                contexts[index] = documents or []
+        except Exception as e:
+            print(f"❌ Batch retrieval error: {e}")
+            collection_cache.evict(tenant_collection(tenant, self.collection_name))
+            retrieval_error = e
+        
+        def answer(index: int) -> Dict[str, Any]:
+            query, context = queries[index], contexts[index]
+            item_timer = StageTimer(ASK_STAGE_SECONDS)
+            with item_timer.stage("confidence"):
+                confidence = self._calculate_confidence(query, context)
+            try:
+                if retrieval_error is not None:
+                    raise RuntimeError(f"context retrieval failed: {retrieval_error}")
+                with item_timer.stage("llm"):
+                    response = self.llm.invoke([HumanMessage(content=self._build_prompt(query, context, []))])
+                ASK_REQUESTS.inc(status="success")
+                result = {"success": True, "answer": response.content}
+            except Exception as e:
+                ASK_REQUESTS.inc(status="error")
+                result = {"success": False, "answer": f"Sorry, I encountered an error: {str(e)}"}
+            result.update({
+                "type": "result",
+                "index": index,
+                "id": questions[index].get("id", index),
+                "question": query,
+                "confidence": confidence,
+                "context_count": len(context),
+                "timings": item_timer.as_dict()
+            })
+            if include_context:
+                result["context"] = context
+            return result
+        
+        workers = max(1, min(concurrency or settings.BATCH_LLM_CONCURRENCY, settings.BATCH_LLM_CONCURRENCY))
+        pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="batch-llm")
+        answered = failed = 0
+        try:
+            futures = [pool.submit(answer, index) for index in range(len(questions))]
+            for future in as_completed(futures):
+                result = future.result()
+                answered += result["success"]
+                failed += not result["success"]
+                yield result
+        finally:
+            # A client that stops reading must not keep the remaining LLM calls running
+            pool.shutdown(wait=False, cancel_futures=True)
+        
+        seconds = perf_counter() - started
+        yield {
+            "type": "summary",
+            "questions": len(questions),
+            "answered": answered,
+            "failed": failed,
+            "concurrency": workers,
+            "seconds": round(seconds, 3),
+            "questions_per_s": round(len(questions) / seconds, 2) if seconds else None,
+            "timings": timer.as_dict()
+        }
+    
+    def _finish_answer(self, query: str, user_id: str, answer: str, context: List[str],
+                       confidence: float, timer: StageTimer) -> Dict[str, Any]:
+        """Store the turn in memory and build the success response"""
+        # Add to user memory
+        with timer.stage("memory_update"):
+            self.memory_manager.add_message(user_id, query, answer)
+        
+        ASK_REQUESTS.inc(status="success")
+        return {
+            "success": True,
+            "answer": answer,
+            "context": context,
+            "confidence": confidence,
+            "user_id": user_id,
+            "timings": timer.as_dict()
+        }
+    
+    def _error_answer(self, user_id: str, error: Exception, timer: StageTimer) -> Dict[str, Any]:
+        ASK_REQUESTS.inc(status="error")
+        error_msg = f"Sorry, I encountered an error: {str(error)}"
+        return {
+            "success": False,
+            "answer": error_msg,
+            "context": [],
+            "confidence": 0.0,
+            "user_id": user_id,
+            "timings": timer.as_dict()
+        }
     
     def clear_user_memory(self, user_id: str):
         """Clear memory for a specific user"""
         self.memory_manager.clear_user_memory(user_id)
+        self.drafts.discard(user_id)
         print(f"🧹 Cleared conversation memory for user: {user_id}")
     
     def get_user_conversation_history(self, user_id: str) -> List[Dict]:
         """Get conversation history for a user"""
         return self.memory_manager.get_conversation_history(user_id)
     
-    def get_vectorstore_info(self) -> Dict[str, Any]:
-        """Get information about the vectorstore"""
+    def get_vectorstore_info(self, tenant: Optional[str] = None) -> Dict[str, Any]:
+        """Get information about the vectorstore (the tenant's, if any)"""
+        collection_name = tenant_collection(tenant, self.collection_name)
         try:
-            count = self.collection.count()
+            collection, _ = self._serving_collection(tenant)
             return {
-                "document_count": count,
-                "collection_name": self.collection_name
+                "document_count": collection.count() if collection is not None else 0,
+                "collection_name": collection_name,
+                "serving_collection": collection.name if collection is not None else None
             }
         except Exception as e:
             print(f"❌ Error getting vectorstore info: {e}")
-            return {"document_count": 0, "collection_name": self.collection_name}
+            return {"document_count": 0, "collection_name": collection_name}
     
     def get_active_users(self) -> List[Dict]:
         """Get list of active users and their session info"""
@@ -0,0 +1,408 @@
+import json
+import os
+import sys
+import threading
+from contextlib import contextmanager, nullcontext
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+# Add the project root to Python path so app.config resolves from scripts too
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from app.config import settings
+
+# Physical collections of an alias are named <alias>__v<timestamp>
+VERSION_SEPARATOR = "__v"
+
+
+class AliasRegistry:
+    """
+    Maps the collection name the app uses (e.g. "manuals") to the versioned collection
+    currently serving it, plus the previous version for rollback.
+
+    The registry is a JSON file next to the ChromaDB, replaced atomically on every change, so
+    all processes switch to a new version at once. A name without an entry is its own
+    collection, which is how existing databases keep working.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._data: Dict[str, Dict] = {}
+        self._mtime: Optional[float] = None
+
+    def _load(self) -> Dict[str, Dict]:
+        # Cheap enough for every query: one stat, and a re-read only after a change
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+        except FileNotFoundError:
+            return {}
+        if mtime != self._mtime:
+            with open(self.path) as f:
+                self._data = json.load(f)
+            self._mtime = mtime
+        return self._data
+
+    def _save(self, data: Dict[str, Dict]):
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, "w") as f:
+            json.dump(data, f, indent=2)
+        os.replace(temp_path, self.path)
+
+    def resolve(self, alias: str) -> str:
+        """The physical collection serving alias"""
+        entry = self._load().get(alias)
+        return entry["current"] if entry else alias
+
+    def has(self, alias: str) -> bool:
+        return alias in self._load()
+
+    def describe(self, alias: str) -> Dict:
+        return dict(self._load().get(alias) or {"current": alias, "previous": None, "history": []})
+
+    def swap(self, alias: str, target: str) -> Dict:
+        """Point alias at target; the collection it served becomes the rollback version"""
+        with self._lock:
+            data = dict(self._load())
+            entry = self.describe(alias)
+            if entry["current"] == target:
+                return entry
+            entry["previous"] = entry["current"]
+            entry["current"] = target
+            entry["history"] = (entry.get("history") or [])[-19:] + [
+                {"collection": target, "swapped_at": datetime.now().isoformat()}
+            ]
+            data[alias] = entry
+            self._save(data)
+            return entry
+
+    def rollback(self, alias: str) -> Dict:
+        """Serve the previous version again (rolling back twice restores the newer one)"""
+        entry = self.describe(alias)
+        if not entry.get("previous"):
+            raise ValueError(f"No previous version of '{alias}' to roll back to")
+        return self.swap(alias, entry["previous"])
+
+
+registry = AliasRegistry(os.path.join(settings.CHROMA_PATH, "aliases.json"))
+
+
+def resolve(name: str) -> str:
+    """Physical collection name for a collection name or alias"""
+    return registry.resolve(name)
+
+
+@contextmanager
+def write_lock(alias: str, exclusive: bool = False):
+    """
+    Lock on writes to the collection serving alias: ingestion (feedDoc.store_chunks,
+    delete_document) holds it shared, rebuild exclusively while it catches up and swaps, so no
+    write lands on a version after its last reconcile. A file lock next to the ChromaDB, so it
+    holds across processes; versions themselves (being built) are not locked.
+    """
+    if VERSION_SEPARATOR in alias:
+        yield
+        return
+    import fcntl  # lazy import
+
+    os.makedirs(settings.CHROMA_PATH, exist_ok=True)
+    with open(os.path.join(settings.CHROMA_PATH, f".{alias}.write.lock"), "a") as f:
+        fcntl.flock(f, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def _client():
+    import chromadb  # lazy import
+
+    return chromadb.PersistentClient(path=settings.CHROMA_PATH)
+
+
+def new_version_name(alias: str) -> str:
+    return f"{alias}{VERSION_SEPARATOR}{datetime.now():%Y%m%d%H%M%S}"
+
+
+def versions(alias: str) -> List[Dict]:
+    """Every physical collection of the alias with its size and role"""
+    from faqIndex import FAQ_SUFFIX  # lazy import
+
+    client = _client()
+    entry = registry.describe(alias)
+    result = []
+    for collection in client.list_collections():
+        if collection.name != alias and not collection.name.startswith(alias + VERSION_SEPARATOR) \
+                or collection.name.endswith(FAQ_SUFFIX):
+            continue
+        role = {entry["current"]: "current", entry.get("previous"): "previous"}.get(collection.name, "inactive")
+        result.append({"collection": collection.name, "role": role,
+                       "count": client.get_collection(name=collection.name).count()})
+    return sorted(result, key=lambda version: version["collection"])
+
+
+def create_shadow(alias: str, metadata: Dict = None) -> str:
+    """
+    Create an empty new version of alias with the serving version's metadata (including its
+    embedding model), updated with metadata, and the configured index settings (vectorIndex)
+    """
+    from embeddings import collection_model_name, model_identity
+    from vectorIndex import create_collection
+
+    client = _client()
+    collection_metadata = {"embedding_model": model_identity()}
+    try:
+        current = client.get_collection(name=resolve(alias))
+        collection_metadata = {**(current.metadata or {}), "embedding_model": collection_model_name(current)}
+    except Exception:
+        pass  # first build of this alias
+    collection_metadata.update(metadata or {})
+    name = new_version_name(alias)
+    create_collection(client, name, alias, collection_metadata)
+    return name
+
+
+def validate(alias: str, shadow: str, min_count_ratio: float = 0.9, probes: int = 20,
+             min_hit_rate: float = 0.8) -> Dict:
+    """
+    Check a shadow collection before it serves: it holds at least min_count_ratio of the serving
+    version's chunks, with vectors of the same size (unless it uses another embedding model), and
+    searching it with sample chunks of the serving version finds the same document for at least
+    min_hit_rate of them.
+    """
+    from embeddings import collection_model_name, get_collection_embedding_model
+
+    client = _client()
+    shadow_collection = client.get_collection(name=shadow)
+    shadow_count = shadow_collection.count()
+    report = {"shadow": shadow, "shadow_count": shadow_count, "checks": {}}
+    report["checks"]["not_empty"] = shadow_count > 0
+
+    current_name = resolve(alias)
+    try:
+        current = client.get_collection(name=current_name) if current_name != shadow else None
+    except Exception:
+        current = None
+    current_count = current.count() if current else 0
+    report["current"] = current_name if current else None
+    report["current_count"] = current_count
+    if current_count and shadow_count:
+        report["count_ratio"] = round(shadow_count / current_count, 4)
+        report["checks"]["count_ratio"] = report["count_ratio"] >= min_count_ratio
+
+        report["embedding_model"] = collection_model_name(shadow_collection)
+        if report["embedding_model"] == collection_model_name(current):
+            shadow_sample = shadow_collection.get(limit=1, include=["embeddings"])["embeddings"]
+            current_sample = current.get(limit=1, include=["embeddings"])["embeddings"]
+            report["checks"]["dimensions"] = len(shadow_sample[0]) == len(current_sample[0])
+
+        # Probe with chunks spread over the serving version; a hit finds the same document
+        samples = [current.get(limit=1, offset=index * current_count // probes, include=["documents", "metadatas"])
+                   for index in range(min(probes, current_count))]
+        samples = [sample for sample in samples
+                   if sample["ids"] and sample["documents"][0] and (sample["metadatas"][0] or {}).get("doc_id")]
+        if samples and report["checks"].get("dimensions", True):
+            embedding_model = get_collection_embedding_model(shadow_collection)
+            vectors = embedding_model.embed_documents([sample["documents"][0] for sample in samples])
+            results = shadow_collection.query(query_embeddings=vectors, n_results=5, include=["metadatas"])
+            hits = sum(
+                sample["metadatas"][0]["doc_id"] in {(metadata or {}).get("doc_id") for metadata in found}
+                for sample, found in zip(samples, results["metadatas"])
+            )
+            report["probes"] = len(samples)
+            report["hit_rate"] = round(hits / len(samples), 4)
+            report["checks"]["probe_hit_rate"] = report["hit_rate"] >= min_hit_rate
+    report["ok"] = all(report["checks"].values())
+    return report
+
+
+def promote(alias: str, target: str, keep: int = 1) -> Dict:
+    """
+    Swap target in as the serving version of alias. The replaced version is kept for rollback;
+    other inactive versions beyond the `keep` newest (failed or superseded builds) are dropped.
+    """
+    entry = registry.swap(alias, target)
+    client = _client()
+    inactive = [version["collection"] for version in versions(alias)
+                if version["role"] == "inactive" and version["collection"] != alias]
+    for name in sorted(inactive)[:max(0, len(inactive) - (keep - 1))]:
+        client.delete_collection(name=name)
+        print(f"🗑️  Dropped old version {name}")
+    return entry
+
+
+def rollback(alias: str) -> Dict:
+    return registry.rollback(alias)
+
+
+def _uploaded_documents(alias: str) -> Dict[str, Dict]:
+    """Chunk metadata (with its version) of every document in the serving version, keyed by doc_id"""
+    try:
+        collection = _client().get_collection(name=resolve(alias))
+    except Exception:
+        return {}  # first build of this alias
+    documents = {}
+    total = collection.count()
+    for offset in range(0, total, 5000):
+        for metadata in collection.get(limit=5000, offset=offset, include=["metadatas"])["metadatas"]:
+            if metadata and metadata.get("doc_id") and metadata["doc_id"] not in documents:
+                documents[metadata["doc_id"]] = metadata
+    return documents
+
+
+def _rebuild_document(shadow: str, metadata: Dict) -> Optional[int]:
+    """Re-ingest one document from the upload store into shadow; its chunk count, or None if its upload is gone"""
+    import extractText
+    from feedDoc import setup_knowledge_base
+    from uploadStore import upload_store
+
+    ext = os.path.splitext(metadata.get("source", ""))[1].lower()
+    path = upload_store.object_path(metadata.get("file_hash", ""), ext)
+    if not metadata.get("file_hash") or not os.path.exists(path):
+        return None
+    document = {key: metadata.get(key) for key in ("doc_id", "file_hash", "source", "product_line", "uploaded_at")}
+    chunk_stats = {}
+    setup_knowledge_base(extractText.extract_pages(path), shadow, stats=chunk_stats, document=document)
+    return chunk_stats["chunks"]
+
+
+def rebuild_from_uploads(alias: str, shadow: str, progress=None, documents: Dict[str, Dict] = None) -> Dict:
+    """
+    Re-extract and re-chunk every document of the serving version (or of documents, as listed
+    by _uploaded_documents) from the upload store into the shadow collection, keeping each
+    document's id and metadata.
+    """
+    documents = _uploaded_documents(alias) if documents is None else documents
+    stats = {"documents": 0, "chunks": 0, "missing": []}
+    if progress:
+        progress.stage("rebuild", total=len(documents))
+    for done, (doc_id, metadata) in enumerate(sorted(documents.items()), start=1):
+        chunks = _rebuild_document(shadow, metadata)
+        if chunks is None:
+            stats["missing"].append(doc_id)
+            continue
+        stats["documents"] += 1
+        stats["chunks"] += chunks
+        if progress:
+            progress.advance(done, len(documents), documents_rebuilt=stats["documents"])
+    return stats
+
+
+def reconcile_uploads(alias: str, shadow: str, before: Dict[str, Dict]) -> Tuple[Dict, Dict[str, Dict]]:
+    """
+    Catch shadow up with the uploads, replacements and deletes that hit the serving version
+    since before (its _uploaded_documents when the rebuild started): new or changed documents
+    are re-ingested from the upload store, removed ones are deleted. Returns the counts and the
+    serving version's documents the shadow now matches.
+    """
+    after = _uploaded_documents(alias)
+    changed = sorted(doc_id for doc_id, metadata in after.items()
+                     if before.get(doc_id, {}).get("version") != metadata.get("version"))
+    removed = sorted(set(before) - set(after))
+    collection = _client().get_collection(name=shadow)
+    for doc_id in removed:
+        collection.delete(where={"doc_id": doc_id})
+    missing = [doc_id for doc_id in changed if _rebuild_document(shadow, after[doc_id]) is None]
+    return {"reconciled_added": len(changed) - len(missing), "reconciled_removed": len(removed),
+            "reconciled_missing": missing}, after
+
+
+def rebuild(alias: str, directory: str = None, pattern: str = "**/*", workers: int = None, swap: bool = True,
+            min_count_ratio: float = 0.9, progress=None) -> Dict:
+    """
+    Blue/green rebuild: fill a new version of alias (from the upload store, or from the documents
+    under directory), validate it against the serving version, and swap it in when it passes.
+    The serving version answers queries untouched until the swap. A rebuild from the upload
+    store applies documents uploaded, replaced or deleted meanwhile to the new version, the last
+    of them with ingestion held off (write_lock) until the swap; one from a directory serves
+    exactly that directory's documents.
+    """
+    before = _uploaded_documents(alias)
+    shadow = create_shadow(alias)
+    print(f"🔨 Building {shadow} for '{alias}'")
+    if directory:
+        import tempfile
+        from feedDoc import collect_sources, feed_documents
+
+        sources = collect_sources(directory, pattern)
+        checkpoint_path = os.path.join(tempfile.gettempdir(), f"feeddoc-{shadow}.checkpoint.json")
+        build = feed_documents(sources, shadow, workers, checkpoint_path, os.path.abspath(directory))
+    else:
+        build = rebuild_from_uploads(alias, shadow, progress, before)
+
+    reconciled = {}
+    if not directory:
+        # Catch up while ingestion goes on, then once more with it held off until the swap
+        if progress:
+            progress.stage("reconcile")
+        reconciled, before = reconcile_uploads(alias, shadow, before)
+    with write_lock(alias, exclusive=True) if not directory else nullcontext():
+        if not directory:
+            final, _ = reconcile_uploads(alias, shadow, before)
+            reconciled = {key: reconciled[key] + final[key] for key in reconciled}
+        if progress:
+            progress.stage("validate")
+        report = validate(alias, shadow, min_count_ratio)
+        report.update({"build": build, **reconciled})
+        report["swapped"] = bool(report["ok"] and swap)
+        if report["swapped"]:
+            report["alias"] = promote(alias, shadow)
+            print(f"✅ '{alias}' now served by {shadow} (previous: {report['alias']['previous']})")
+        else:
+            print(f"⚠️  {shadow} was not swapped in: {report['checks']}")
+    return report
+
+
+def main():
+    """Inspect, rebuild, swap and roll back versioned collections"""
+    import argparse
+    from dotenv import load_dotenv
+
+    load_dotenv()
+
+    parser = argparse.ArgumentParser(description="Blue/green versions of a knowledge-base collection.")
+    parser.add_argument("-a", "--alias", default="manuals", help="Collection name the app serves (default: manuals)")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("status", help="Show the serving and previous versions")
+    rebuild_parser = commands.add_parser("rebuild", help="Build, validate and swap in a new version")
+    rebuild_parser.add_argument("-d", "--dir", help="Rebuild from the documents under this directory "
+                                                    "(default: re-chunk the uploaded documents)")
+    rebuild_parser.add_argument("-g", "--glob", default="**/*", help="Pattern to match inside --dir")
+    rebuild_parser.add_argument("-w", "--workers", type=int, help="Extraction worker processes")
+    rebuild_parser.add_argument("--no-swap", action="store_true", help="Validate only; leave the new version inactive")
+    rebuild_parser.add_argument("--min-count-ratio", type=float, default=0.9,
+                                help="Fewest chunks the new version may have, relative to the serving one")
+    swap_parser = commands.add_parser("swap", help="Serve another version (validated first)")
+    swap_parser.add_argument("target", help="Physical collection to serve")
+    swap_parser.add_argument("--force", action="store_true", help="Swap even if validation fails")
+    commands.add_parser("rollback", help="Serve the previous version again")
+    args = parser.parse_args()
+
+    try:
+        if args.command == "status":
+            entry = registry.describe(args.alias)
+            print(f"📚 '{args.alias}' → {entry['current']} (previous: {entry.get('previous') or 'none'})")
+            for version in versions(args.alias):
+                print(f"   {version['collection']:<40} {version['role']:<9} {version['count']} chunks")
+        elif args.command == "rebuild":
+            report = rebuild(args.alias, args.dir, args.glob, args.workers, not args.no_swap, args.min_count_ratio)
+            if not report["ok"]:
+                sys.exit(1)
+        elif args.command == "swap":
+            report = validate(args.alias, args.target)
+            if not report["ok"] and not args.force:
+                print(f"❌ Validation failed: {report['checks']} (use --force to swap anyway)")
+                sys.exit(1)
+            entry = promote(args.alias, args.target)
+            print(f"✅ '{args.alias}' now served by {entry['current']} (previous: {entry['previous']})")
+        elif args.command == "rollback":
+            entry = rollback(args.alias)
+            print(f"↩️  '{args.alias}' rolled back to {entry['current']}")
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+import json
+import re
+import threading
+import time
+from difflib import SequenceMatcher
+from typing import Any, Dict, List, NamedTuple, Optional
+
+from metrics import DRAFT_PREFETCHES
+
+
+class Prefetch(NamedTuple):
+    draft: str
+    key: str
+    context: List[str]
+    expires_at: float
+
+
+def normalize(text: str) -> str:
+    """Lowercase words only, so punctuation and spacing edits don't count against a match"""
+    return " ".join(re.findall(r"\w+", text.lower()))
+
+
+def similarity(a: str, b: str) -> float:
+    """How close two questions are as typed (0-1), cheap enough to run before every answer"""
+    a, b = normalize(a), normalize(b)
+    if a == b:
+        return 1.0
+    return SequenceMatcher(None, a, b, autojunk=False).ratio()
+
+
+class DraftCache:
+    """
+    One prefetched retrieval per user, made from the draft the user is still typing. The final
+    question takes the slot (it is single-use) and gets its context when it is close enough to
+    the draft and searches the same knowledge base and scope; otherwise it retrieves as usual.
+    """
+
+    def __init__(self, ttl: float, min_similarity: float):
+        self.ttl = ttl
+        self.min_similarity = min_similarity
+        self._slots: Dict[str, Prefetch] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(tenant: Optional[str], scope: Optional[Dict[str, Any]]) -> str:
+        return json.dumps([tenant or "", scope or None], sort_keys=True)
+
+    def put(self, user_id: str, draft: str, context: List[str], tenant: Optional[str] = None,
+            scope: Optional[Dict[str, Any]] = None):
+        now = time.monotonic()
+        with self._lock:
+            for expired in [user for user, slot in self._slots.items() if slot.expires_at <= now]:
+                del self._slots[expired]
+            self._slots[user_id] = Prefetch(draft, self._key(tenant, scope), context, now + self.ttl)
+
+    def take(self, user_id: str, query: str, tenant: Optional[str] = None,
+             scope: Optional[Dict[str, Any]] = None) -> Optional[List[str]]:
+        """The prefetched context for query, or None (cleared either way); the outcome is counted in metrics"""
+        with self._lock:
+            slot = self._slots.pop(user_id, None)
+        if slot is None:
+            return None
+        if slot.expires_at <= time.monotonic():
+            outcome = "expired"
+        elif slot.key != self._key(tenant, scope) or similarity(slot.draft, query) < self.min_similarity:
+            outcome = "miss"
+        else:
+            outcome = "hit"
+        DRAFT_PREFETCHES.inc(outcome=outcome)
+        return slot.context if outcome == "hit" else None
+
+    def discard(self, user_id: str):
+        with self._lock:
+            self._slots.pop(user_id, None)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._slots)
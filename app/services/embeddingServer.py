@@ -0,0 +1,310 @@
+import asyncio
+import json
+import os
+import socket
+import struct
+import sys
+import threading
+import time
+from array import array
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from multiprocessing import resource_tracker, shared_memory
+from typing import Deque, Dict, List, Optional
+
+# Add the project root to Python path so app.config resolves from scripts too
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from app.config import settings
+
+# Wire format: every message is a 4-byte big-endian length followed by a UTF-8 JSON body.
+#   request  {"op": "ping"} | {"op": "embed", "kind": "query" | "documents", "texts": [...]}
+#   response {"ok": true, "shm": name, "rows": n, "dim": d} | {"ok": false, "error": "..."}
+# Embeddings travel through a float32 shared-memory block named in the response; the
+# client copies it out and unlinks it. Blocks that are never collected are swept after
+# ORPHAN_TTL seconds.
+HEADER = struct.Struct(">I")
+ORPHAN_TTL = 60.0
+# Largest request body accepted; a longer one is refused and its connection closed
+MAX_REQUEST_BYTES = 64 << 20
+
+
+def _untrack(shm: shared_memory.SharedMemory):
+    """Stop this process's resource tracker from unlinking a block the peer now owns"""
+    try:
+        resource_tracker.unregister(shm._name, "shared_memory")
+    except Exception:
+        pass
+
+
+class _Piece:
+    """Up to max_batch texts of one request, resolved together"""
+
+    def __init__(self, texts: List[str], future: asyncio.Future):
+        self.texts = texts
+        self.future = future
+
+
+class EmbeddingServer:
+    """Owns the embedding model and batches requests from every web worker into shared forward passes"""
+
+    def __init__(self, socket_path: str, backend: str, max_batch: int = 256, batch_wait_ms: float = 5.0):
+        self.socket_path = socket_path
+        self.backend = backend
+        self.max_batch = max_batch
+        self.batch_wait = batch_wait_ms / 1000
+        self.model = None
+        self.dimensions: Optional[int] = None
+        self.queries: Deque[_Piece] = deque()
+        self.documents: Deque[_Piece] = deque()
+        self.pending = None
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="embed")
+        self.blocks: Dict[str, float] = {}
+        self.stats = {"requests": 0, "texts": 0, "batches": 0}
+
+    async def serve(self):
+        from embeddings import create_embedding_model
+
+        print(f"🔄 Loading embedding backend '{self.backend}'...")
+        self.model = create_embedding_model(self.backend)
+        self.dimensions = len(self.model.embed_query("warm up"))
+        self.pending = asyncio.Event()
+
+        if os.path.exists(self.socket_path):
+            os.remove(self.socket_path)
+        server = await asyncio.start_unix_server(self._handle, path=self.socket_path)
+        os.chmod(self.socket_path, 0o660)
+        print(f"✅ Embedding server listening on {self.socket_path} (dim={self.dimensions})")
+
+        async with server:
+            await asyncio.gather(server.serve_forever(), self._batcher(), self._sweep())
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                try:
+                    header = await reader.readexactly(HEADER.size)
+                except asyncio.IncompleteReadError:
+                    break
+                size = HEADER.unpack(header)[0]
+                if size > MAX_REQUEST_BYTES:
+                    # The body can't be skipped safely; refuse it and drop the connection
+                    await self._respond(writer, {"ok": False, "error": f"Request of {size} bytes exceeds "
+                                                                       f"{MAX_REQUEST_BYTES}"})
+                    break
+                try:
+                    body = await reader.readexactly(size)
+                except asyncio.IncompleteReadError:
+                    break  # the client went away mid-request
+                try:
+                    response = await self._dispatch(json.loads(body))
+                except Exception as e:
+                    response = {"ok": False, "error": str(e)}
+                await self._respond(writer, response)
+        except ConnectionError:
+            pass  # the client went away before reading its response
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def _respond(writer: asyncio.StreamWriter, response: Dict):
+        body = json.dumps(response).encode()
+        writer.write(HEADER.pack(len(body)) + body)
+        await writer.drain()
+
+    async def _dispatch(self, request: Dict) -> Dict:
+        op = request.get("op")
+        if op == "ping":
+            return {"ok": True, "backend": self.backend, "dim": self.dimensions, **self.stats}
+        if op != "embed":
+            raise ValueError(f"Unknown op: {op}")
+
+        texts = request.get("texts") or []
+        if not texts:
+            return {"ok": True, "shm": None, "rows": 0, "dim": self.dimensions}
+        loop = asyncio.get_running_loop()
+        queue = self.queries if request.get("kind") == "query" else self.documents
+        pieces = []
+        for start in range(0, len(texts), self.max_batch):
+            piece = _Piece(texts[start:start + self.max_batch], loop.create_future())
+            queue.append(piece)
+            pieces.append(piece)
+        self.pending.set()
+        self.stats["requests"] += 1
+        self.stats["texts"] += len(texts)
+
+        vectors = [vector for part in await asyncio.gather(*(p.future for p in pieces)) for vector in part]
+        return {"ok": True, "shm": self._publish(vectors), "rows": len(vectors), "dim": self.dimensions}
+
+    def _publish(self, vectors: List[List[float]]) -> str:
+        data = array("f", (value for vector in vectors for value in vector)).tobytes()
+        shm = shared_memory.SharedMemory(create=True, size=max(len(data), 1))
+        shm.buf[:len(data)] = data
+        _untrack(shm)
+        self.blocks[shm.name] = time.monotonic()
+        shm.close()
+        return shm.name
+
+    def _next_batch(self) -> List[_Piece]:
+        """Queries first (latency-sensitive), then ingestion pieces, up to max_batch texts"""
+        batch, count = [], 0
+        for queue in (self.queries, self.documents):
+            while queue and (not batch or count + len(queue[0].texts) <= self.max_batch):
+                piece = queue.popleft()
+                batch.append(piece)
+                count += len(piece.texts)
+        return batch
+
+    async def _batcher(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            await self.pending.wait()
+            # Give concurrent requests from other workers a moment to join this batch
+            await asyncio.sleep(self.batch_wait)
+            batch = self._next_batch()
+            if not self.queries and not self.documents:
+                self.pending.clear()
+            if not batch:
+                continue
+
+            texts = [text for piece in batch for text in piece.texts]
+            try:
+                vectors = await loop.run_in_executor(self.executor, self.model.embed_documents, texts)
+            except Exception as e:
+                for piece in batch:
+                    if not piece.future.done():
+                        piece.future.set_exception(e)
+                continue
+            self.stats["batches"] += 1
+
+            offset = 0
+            for piece in batch:
+                if not piece.future.done():
+                    piece.future.set_result(vectors[offset:offset + len(piece.texts)])
+                offset += len(piece.texts)
+
+    async def _sweep(self):
+        """Unlink result blocks whose client never collected them (e.g. it crashed)"""
+        while True:
+            await asyncio.sleep(ORPHAN_TTL / 2)
+            cutoff = time.monotonic() - ORPHAN_TTL
+            for name, created in list(self.blocks.items()):
+                if created > cutoff:
+                    continue
+                del self.blocks[name]
+                try:
+                    shm = shared_memory.SharedMemory(name=name)
+                except FileNotFoundError:
+                    continue
+                shm.close()
+                shm.unlink()
+
+
+class RemoteEmbeddings:
+    """Embeddings client for the shared embedding server (EMBEDDING_BACKEND=remote)"""
+
+    def __init__(self, socket_path: str, timeout: float = 120.0):
+        self.socket_path = socket_path
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def _connection(self) -> socket.socket:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            conn.settimeout(self.timeout)
+            conn.connect(self.socket_path)
+            self._local.conn = conn
+        return conn
+
+    def _request(self, payload: Dict) -> Dict:
+        body = json.dumps(payload).encode()
+        for attempt in range(2):
+            conn = self._connection()
+            try:
+                conn.sendall(HEADER.pack(len(body)) + body)
+                size = HEADER.unpack(self._recv_exactly(conn, HEADER.size))[0]
+                response = json.loads(self._recv_exactly(conn, size))
+                break
+            except ConnectionError:
+                # The server restarted; reconnect once
+                self._disconnect(conn)
+                if attempt:
+                    raise
+            except OSError:
+                # A timeout (or other failure) may leave a response unread: never resend the batch,
+                # and start the next request on a fresh connection
+                self._disconnect(conn)
+                raise
+        if not response.get("ok"):
+            raise RuntimeError(f"Embedding server error: {response.get('error')}")
+        return response
+
+    def _disconnect(self, conn: socket.socket):
+        conn.close()
+        self._local.conn = None
+
+    @staticmethod
+    def _recv_exactly(conn: socket.socket, size: int) -> bytes:
+        chunks, remaining = [], size
+        while remaining:
+            chunk = conn.recv(min(remaining, 1 << 20))
+            if not chunk:
+                raise ConnectionError("Embedding server closed the connection")
+            chunks.append(chunk)
+            remaining -= len(chunk)
+        return b"".join(chunks)
+
+    def _embed(self, texts: List[str], kind: str) -> List[List[float]]:
+        response = self._request({"op": "embed", "kind": kind, "texts": texts})
+        rows, dim = response["rows"], response["dim"]
+        if not rows:
+            return []
+        shm = shared_memory.SharedMemory(name=response["shm"])
+        try:
+            values = array("f")
+            values.frombytes(bytes(shm.buf[:rows * dim * values.itemsize]))
+        finally:
+            shm.close()
+            shm.unlink()
+        return [values[i * dim:(i + 1) * dim].tolist() for i in range(rows)]
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self._embed(list(texts), "documents")
+
+    def embed_query(self, text: str) -> List[float]:
+        return self._embed([text], "query")[0]
+
+    def ping(self) -> Dict:
+        return self._request({"op": "ping"})
+
+
+def main():
+    """Run the shared embedding server"""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Serve embeddings to every uvicorn worker on this host over a Unix socket. "
+                    "Start it before the web workers and set EMBEDDING_BACKEND=remote for them."
+    )
+    parser.add_argument("--socket", default=settings.EMBEDDING_SOCKET, help="Unix socket path")
+    parser.add_argument("--backend", default=settings.EMBEDDING_SERVER_BACKEND,
+                        help="Embedding backend the server runs (default: huggingface)")
+    parser.add_argument("--max-batch", type=int, default=settings.EMBEDDING_MAX_BATCH,
+                        help="Most texts per forward pass")
+    parser.add_argument("--batch-wait-ms", type=float, default=settings.EMBEDDING_BATCH_WAIT_MS,
+                        help="How long to wait for other requests to join a batch")
+    args = parser.parse_args()
+
+    server = EmbeddingServer(args.socket, args.backend, args.max_batch, args.batch_wait_ms)
+    try:
+        asyncio.run(server.serve())
+    except KeyboardInterrupt:
+        print("\n👋 Embedding server stopped")
+    finally:
+        if os.path.exists(args.socket):
+            os.remove(args.socket)
+
+
+if __name__ == "__main__":
+    main()
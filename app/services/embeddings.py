@@ -0,0 +1,135 @@
+import hashlib
+import math
+import os
+import re
+import sys
+import threading
+from typing import List
+
+# Add the project root to Python path so app.config resolves from scripts too
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from app.config import settings
+
+MODEL_NAME = settings.EMBEDDING_MODEL
+# Model name recorded for collections embedded by the hash backend
+HASH_MODEL = "hash"
+
+# Process-wide models, keyed by the model they embed with
+_embedding_models = {}
+_embedding_lock = threading.Lock()
+
+
+class HashEmbeddings:
+    """
+    Tiny deterministic embedding stand-in (feature hashing of word unigrams and bigrams).
+
+    Costs microseconds per text and needs no model download, so benchmarks can measure
+    pipeline overhead separately from model time. Similar texts still get similar vectors,
+    which keeps retrieval results meaningful enough for load tests.
+    """
+
+    def __init__(self, dimensions: int = 384):
+        self.dimensions = dimensions
+
+    def _embed(self, text: str) -> List[float]:
+        vector = [0.0] * self.dimensions
+        words = re.findall(r"[a-z0-9]+", text.lower())
+        features = words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+        for feature in features:
+            digest = hashlib.blake2b(feature.encode(), digest_size=8).digest()
+            index = int.from_bytes(digest[:4], "little") % self.dimensions
+            vector[index] += 1.0 if digest[4] & 1 else -1.0
+        norm = math.sqrt(sum(value * value for value in vector)) or 1.0
+        return [value / norm for value in vector]
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return [self._embed(text) for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self._embed(text)
+
+
+def configure_model_cache():
+    """Point Hugging Face at the local model cache, and forbid network lookups in offline mode"""
+    if settings.EMBEDDING_CACHE_DIR:
+        os.environ.setdefault("HF_HOME", settings.EMBEDDING_CACHE_DIR)
+        os.environ.setdefault("SENTENCE_TRANSFORMERS_HOME", settings.EMBEDDING_CACHE_DIR)
+    if settings.HF_OFFLINE:
+        # Must be set before transformers / huggingface_hub are first imported
+        os.environ["HF_HUB_OFFLINE"] = "1"
+        os.environ["TRANSFORMERS_OFFLINE"] = "1"
+
+
+def model_identity(backend: str = None, model_name: str = None) -> str:
+    """
+    Name of the vector space a backend produces, recorded on collections as "embedding_model".
+    The huggingface, quantized and remote backends all run the named model.
+    """
+    if (backend or settings.EMBEDDING_BACKEND) == "hash":
+        return HASH_MODEL
+    return model_name or MODEL_NAME
+
+
+def backend_for(model_name: str) -> str:
+    """Backend that can embed with model_name in this process"""
+    backend = settings.EMBEDDING_BACKEND
+    if model_name == HASH_MODEL:
+        return "hash"
+    # The embedding server only runs the configured model
+    if backend == "hash" or (backend == "remote" and model_name != MODEL_NAME):
+        return "huggingface"
+    return backend
+
+
+def create_embedding_model(backend: str = None, model_name: str = None):
+    """Build a new embedding model for the given (or configured) backend and model"""
+    backend = backend or settings.EMBEDDING_BACKEND
+    model_name = model_name or MODEL_NAME
+    if backend == "hash":
+        return HashEmbeddings()
+    if backend == "huggingface":
+        configure_model_cache()
+        from langchain_huggingface import HuggingFaceEmbeddings  # lazy import
+        
+        kwargs = {"cache_folder": settings.EMBEDDING_CACHE_DIR} if settings.EMBEDDING_CACHE_DIR else {}
+        return HuggingFaceEmbeddings(model_name=model_name, **kwargs)
+    if backend == "quantized":
+        configure_model_cache()
+        from quantizedEmbeddings import QuantizedEmbeddings  # lazy import
+
+        return QuantizedEmbeddings(
+            model_name,
+            runtime=settings.EMBEDDING_QUANTIZED_RUNTIME,
+            threads=settings.EMBEDDING_THREADS,
+            batch_size=settings.EMBEDDING_BATCH_SIZE,
+            onnx_file=settings.EMBEDDING_ONNX_FILE,
+        )
+    if backend == "remote":
+        from embeddingServer import RemoteEmbeddings  # lazy import
+
+        return RemoteEmbeddings(settings.EMBEDDING_SOCKET)
+    raise ValueError(f"Unknown embedding backend: {backend}")
+
+
+def get_embedding_model(model_name: str = None):
+    """Get the process-wide embedding model (or the one for model_name), loading it on first use"""
+    key = model_name or model_identity()
+    if key not in _embedding_models:
+        with _embedding_lock:
+            if key not in _embedding_models:
+                if model_name is None or model_name == model_identity():
+                    _embedding_models[key] = create_embedding_model()
+                else:
+                    _embedding_models[key] = create_embedding_model(backend_for(model_name), model_name)
+    return _embedding_models[key]
+
+
+def collection_model_name(collection) -> str:
+    """The model a collection was embedded with (collections created before it was recorded use the configured one)"""
+    return (collection.metadata or {}).get("embedding_model") or model_identity()
+
+
+def get_collection_embedding_model(collection):
+    """The embedding model whose vectors match the collection's"""
+    return get_embedding_model(collection_model_name(collection))
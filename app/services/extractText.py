@@ -1,13 +1,21 @@
-def extract_text_from_pdf(file_path: str) -> str:
-    """Extract text from a PDF file."""
+def extract_pdf_pages(file_path: str, on_page=None) -> list:
+    """Text of each PDF page, calling on_page(pages_done, pages_total) after each page."""
     import PyPDF2  # lazy import
 
-    text = []
+    pages = []
     with open(file_path, "rb") as pdf_file:
         reader = PyPDF2.PdfReader(pdf_file)
-        for page in reader.pages:
-            text.append(page.extract_text() or "")
-    return "\n".join(text)
+        total = len(reader.pages)
+        for number, page in enumerate(reader.pages, start=1):
+            pages.append(page.extract_text() or "")
+            if on_page:
+                on_page(number, total)
+    return pages
+
+
+def extract_text_from_pdf(file_path: str, on_page=None) -> str:
+    """Extract text from a PDF file, calling on_page(pages_done, pages_total) after each page."""
+    return "\n".join(extract_pdf_pages(file_path, on_page))
 
 
 def extract_text_from_docx(file_path: str) -> str:
@@ -18,8 +26,33 @@ def extract_text_from_docx(file_path: str) -> str:
     return "\n".join([para.text for para in doc.paragraphs])
 
 
-def extract_text(file_path: str) -> str:
-    """Extract text from a file (PDF or DOCX)."""
+def count_pages(file_path: str):
+    """Page count of a PDF, or of a DOCX as last saved by Word (None when unknown)."""
+    import os  # lazy import
+
+    ext = os.path.splitext(file_path)[1].lower()
+    if ext == ".pdf":
+        import PyPDF2  # lazy import
+
+        with open(file_path, "rb") as pdf_file:
+            return len(PyPDF2.PdfReader(pdf_file).pages)
+    if ext == ".docx":
+        import re
+        import zipfile
+
+        with zipfile.ZipFile(file_path) as archive:
+            if "docProps/app.xml" not in archive.namelist():
+                return None
+            match = re.search(rb"<Pages>(\d+)</Pages>", archive.read("docProps/app.xml"))
+        return int(match.group(1)) if match else None
+    return None
+
+
+def extract_pages(file_path: str, on_page=None):
+    """
+    Extract a document keeping its pagination: a list of page texts for a PDF, a single string
+    for a DOCX (Word files store no page layout). on_page reports PDF page progress.
+    """
     import os  # lazy import
 
     # convert all \ to /
@@ -31,13 +64,19 @@ def extract_text(file_path: str) -> str:
     ext = os.path.splitext(file_path)[1].lower()
 
     if ext == ".pdf":
-        return extract_text_from_pdf(file_path)
+        return extract_pdf_pages(file_path, on_page)
     elif ext == ".docx":
         return extract_text_from_docx(file_path)
     else:
         raise ValueError("Unsupported file format. Only PDF and DOCX are supported.")
 
 
+def extract_text(file_path: str, on_page=None) -> str:
+    """Extract text from a file (PDF or DOCX); on_page reports PDF page progress."""
+    pages = extract_pages(file_path, on_page)
+    return pages if isinstance(pages, str) else "\n".join(pages)
+
+
 if __name__ == "__main__":
     # Example usage
     test_file = "./files/TRI.pdf"  # change to your file path
@@ -0,0 +1,271 @@
+import json
+import os
+import re
+import sys
+import time
+from typing import Dict, List, Optional
+
+# Add the project root to Python path so app.config resolves from scripts too
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from app.config import settings
+from tenants import collection_cache
+
+# Generated questions of an alias live beside its versions as <alias>__faq
+FAQ_SUFFIX = "__faq"
+# Most document text shown to the LLM when generating questions
+EXCERPT_CHARS = 12000
+# Chunk metadata copied onto FAQ entries, so retrieval scopes (chatbot.scope_filter) apply to them too
+DOCUMENT_FIELDS = ("doc_id", "file_hash", "source", "product_line", "uploaded_at")
+
+FAQ_PROMPT = """Write {count} questions that users are likely to ask about the document below, each with a short, self-contained answer taken only from the document.
+Reply with a JSON array of {{"question": ..., "answer": ...}} objects and nothing else.
+
+Document:
+{excerpt}"""
+
+_llm = None
+
+
+def faq_collection_name(alias: str) -> str:
+    return f"{alias}{FAQ_SUFFIX}"
+
+
+def _client():
+    import chromadb  # lazy import
+
+    return chromadb.PersistentClient(path=settings.CHROMA_PATH)
+
+
+def _get_llm():
+    global _llm
+    if _llm is None:
+        from chatbot import create_llm  # lazy import
+
+        _llm = create_llm()
+    return _llm
+
+
+def parse_pairs(text: str, count: int) -> List[Dict[str, str]]:
+    """The question/answer pairs in an LLM reply (a JSON array, possibly wrapped in prose)"""
+    match = re.search(r"\[.*\]", text, re.S)
+    if not match:
+        return []
+    try:
+        items = json.loads(match.group(0))
+    except json.JSONDecodeError:
+        return []
+    pairs = []
+    for item in items:
+        if isinstance(item, dict) and str(item.get("question", "")).strip() and str(item.get("answer", "")).strip():
+            pairs.append({"question": str(item["question"]).strip(), "answer": str(item["answer"]).strip()})
+    return pairs[:count]
+
+
+def extract_pairs(texts: List[str], count: int) -> List[Dict[str, str]]:
+    """Questions made from the document's own sentences, for the stub LLM backend (no model call)"""
+    sentences = [sentence.strip() for text in texts for sentence in re.split(r"(?<=[.!?])\s+", text)
+                 if 8 <= len(sentence.split()) <= 60]
+    if not sentences:
+        return []
+    step = max(1, len(sentences) // count)
+    return [
+        {"question": f"What does the document say about {' '.join(sentence.split()[:6]).rstrip('.,;:')}?",
+         "answer": sentence}
+        for sentence in sentences[::step][:count]
+    ]
+
+
+def generate_pairs(texts: List[str], count: int) -> List[Dict[str, str]]:
+    """Up to count likely questions about a document's chunks, with answers, from one LLM call"""
+    if settings.LLM_BACKEND == "stub":
+        return extract_pairs(texts, count)
+
+    from langchain.schema import HumanMessage  # lazy import
+
+    excerpt = ""
+    for text in texts:
+        if len(excerpt) + len(text) > EXCERPT_CHARS:
+            break
+        excerpt += text + "\n"
+    reply = _get_llm().invoke([HumanMessage(content=FAQ_PROMPT.format(count=count, excerpt=excerpt or texts[0]))])
+    return parse_pairs(reply.content, count)
+
+
+def _open(alias: str, create: bool = False):
+    """
+    The alias's FAQ collection (None if missing and not create). With create, it is made to
+    match the serving collection's embedding model, compared by cosine similarity; a FAQ left
+    behind by a model migration is recreated empty, as its entries must all be regenerated.
+    """
+    from embeddings import collection_model_name
+
+    name = faq_collection_name(alias)
+    client = _client()
+    try:
+        collection = client.get_collection(name=name)
+    except Exception:
+        collection = None
+    if not create:
+        return collection
+    serving, _ = collection_cache.get(alias)
+    if serving is None:
+        return None
+    model = collection_model_name(serving)
+    if collection is not None and collection_model_name(collection) != model:
+        print(f"⚠️  {name} was embedded with {collection_model_name(collection)}; recreating it for {model}")
+        client.delete_collection(name=name)
+        collection = None
+    if collection is None:
+        collection = client.create_collection(name=name, metadata={"embedding_model": model},
+                                              configuration={"hnsw": {"space": "cosine"}})
+        collection_cache.evict(name)
+    return collection
+
+
+def store_pairs(alias: str, pairs: List[Dict[str, str]], document: Dict, version: str) -> int:
+    """Embed the questions of one document and replace its earlier FAQ entries; returns the entries stored"""
+    from bulkEmbed import bulk_embed
+
+    collection = _open(alias, create=True)
+    if collection is None:
+        return 0
+    doc_id = document["doc_id"]
+    if pairs:
+        _, embedding_model = collection_cache.get(alias)
+        vectors, _ = bulk_embed(embedding_model, [pair["question"] for pair in pairs])
+        base = {key: document[key] for key in DOCUMENT_FIELDS if document.get(key) is not None}
+        collection.upsert(
+            ids=[f"{doc_id}:faq:{index}" for index in range(len(pairs))],
+            embeddings=vectors,
+            documents=[pair["question"] for pair in pairs],
+            metadatas=[{**base, "version": version, "answer": pair["answer"], "generated_at": int(time.time())}
+                       for pair in pairs],
+        )
+    collection.delete(where={"$and": [{"doc_id": doc_id}, {"version": {"$ne": version}}]})
+    return len(pairs)
+
+
+def build_document_faq(alias: str, texts: List[str], document: Dict, version: str, count: int = None) -> int:
+    """Generate and store the FAQ of one ingested document (see FAQ_QUESTIONS_PER_DOCUMENT); returns the entries stored"""
+    count = settings.FAQ_QUESTIONS_PER_DOCUMENT if count is None else count
+    pairs = generate_pairs(texts, count) if count and texts else []
+    return store_pairs(alias, pairs, document, version)
+
+
+def delete_document_faq(alias: str, doc_id: str, keep_version: Optional[str] = None) -> int:
+    """Drop a document's FAQ entries (except those of keep_version); returns how many were removed"""
+    collection = _open(alias)
+    if collection is None:
+        return 0
+    where = {"doc_id": doc_id}
+    if keep_version:
+        where = {"$and": [where, {"version": {"$ne": keep_version}}]}
+    found = collection.get(where=where, include=[])["ids"]
+    if found:
+        collection.delete(ids=found)
+    return len(found)
+
+
+def find_answer(collection, query_embedding: List[float], where: Optional[Dict] = None,
+                min_similarity: float = None) -> Optional[Dict]:
+    """The FAQ entry closest to a question, if at least min_similarity (cosine) close"""
+    min_similarity = settings.FAQ_MIN_SIMILARITY if min_similarity is None else min_similarity
+    results = collection.query(query_embeddings=[query_embedding], n_results=1, where=where,
+                               include=["documents", "metadatas", "distances"])
+    if not results["ids"] or not results["ids"][0]:
+        return None
+    similarity = 1.0 - results["distances"][0][0]
+    if similarity < min_similarity:
+        return None
+    metadata = results["metadatas"][0][0]
+    return {"question": results["documents"][0][0], "answer": metadata["answer"], "doc_id": metadata.get("doc_id"),
+            "similarity": round(similarity, 4)}
+
+
+def _documents(alias: str) -> Dict[str, Dict]:
+    """Chunk texts (in order) and metadata of every document serving alias, by doc_id"""
+    serving, _ = collection_cache.get(alias)
+    if serving is None:
+        raise ValueError(f"Collection '{alias}' does not exist")
+    found = serving.get(include=["documents", "metadatas"])
+    documents: Dict[str, Dict] = {}
+    for text, metadata in zip(found["documents"], found["metadatas"]):
+        metadata = metadata or {}
+        entry = documents.setdefault(metadata.get("doc_id", ""), {"metadata": metadata, "chunks": []})
+        entry["chunks"].append((metadata.get("chunk_index", 0), text or ""))
+    return documents
+
+
+def build(alias: str, count: int = None, doc_ids: List[str] = None, missing_only: bool = False) -> Dict:
+    """
+    Offline batch: generate the FAQ of every document of alias (or only doc_ids, or only those
+    without one), one LLM call per document
+    """
+    count = count or settings.FAQ_QUESTIONS_PER_DOCUMENT or 5
+    documents = _documents(alias)
+    existing = set()
+    faq = _open(alias)
+    if missing_only and faq is not None:
+        existing = {metadata.get("doc_id") for metadata in faq.get(include=["metadatas"])["metadatas"] if metadata}
+    selected = [doc_id for doc_id in sorted(documents)
+                if doc_id and (not doc_ids or doc_id in doc_ids) and doc_id not in existing]
+
+    started = time.perf_counter()
+    stored = failed = 0
+    for done, doc_id in enumerate(selected, 1):
+        entry = documents[doc_id]
+        texts = [text for _, text in sorted(entry["chunks"])]
+        try:
+            stored += build_document_faq(alias, texts, entry["metadata"], entry["metadata"].get("version", ""), count)
+        except Exception as e:
+            failed += 1
+            print(f"⚠️  FAQ generation failed for {doc_id}: {e}")
+        print(f"[{done}/{len(selected)}] {doc_id}")
+    return {"alias": alias, "documents": len(selected), "entries": stored, "failed": failed,
+            "seconds": time.perf_counter() - started}
+
+
+def main():
+    """Generate, inspect or clear the precomputed FAQ of a collection"""
+    import argparse
+    from dotenv import load_dotenv
+
+    load_dotenv()
+
+    parser = argparse.ArgumentParser(description="Precomputed question/answer index answered without the LLM.")
+    parser.add_argument("-a", "--alias", default="manuals", help="Collection (default: manuals)")
+    commands = parser.add_subparsers(dest="command", required=True)
+    build_parser = commands.add_parser("build", help="Generate questions and answers for the collection's documents")
+    build_parser.add_argument("-n", "--count", type=int,
+                              help="Questions per document (default: FAQ_QUESTIONS_PER_DOCUMENT, or 5)")
+    build_parser.add_argument("-d", "--doc-id", action="append", help="Only this document (repeatable)")
+    build_parser.add_argument("--missing-only", action="store_true", help="Skip documents that already have a FAQ")
+    commands.add_parser("list", help="Print the stored questions and answers")
+    commands.add_parser("clear", help="Delete the collection's FAQ")
+    args = parser.parse_args()
+
+    try:
+        if args.command == "build":
+            report = build(args.alias, args.count, args.doc_id, args.missing_only)
+            print(f"📈 {report['entries']} questions for {report['documents']} documents in {report['seconds']:.1f}s"
+                  f" ({report['failed']} failed)")
+        elif args.command == "list":
+            faq = _open(args.alias)
+            found = faq.get(include=["documents", "metadatas"]) if faq is not None else {"documents": [], "metadatas": []}
+            for question, metadata in zip(found["documents"], found["metadatas"]):
+                print(json.dumps({"doc_id": metadata.get("doc_id"), "question": question, "answer": metadata["answer"]}))
+        else:
+            name = faq_collection_name(args.alias)
+            if _open(args.alias) is None:
+                raise ValueError(f"'{args.alias}' has no FAQ")
+            _client().delete_collection(name=name)
+            collection_cache.evict(name)
+            print(f"🗑️  Deleted {name}")
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,7 @@ from langchain_huggingface import HuggingFaceEmbeddings
 import chromadb
 import cleanText
 import splitText
+from embeddings import MODEL_NAME
 
 load_dotenv()
 
@@ -24,7 +25,7 @@ def setup_knowledge_base(sample_text: str, collection_name: str = "manuals"):
     print(f"📄 Created {len(chunks)} text chunks")
     
     # Create embeddings
-    embedding_model = HuggingFaceEmbeddings(model_name="sentence-transformers/all-MiniLM-L6-v2")
+    embedding_model = HuggingFaceEmbeddings(model_name=MODEL_NAME)
     texts = [chunk.page_content for chunk in chunks]
     embeddings = embedding_model.embed_documents(texts)
     print("✅ Generated embeddings")
@@ -1,41 +1,221 @@
-def setup_knowledge_base(text: str, collection_name: str = "manuals"):
+from profiler import profiled
+
+# Chunks per Chroma add() call
+WRITE_BATCH_SIZE = 500
+
+
+def prepare_chunks(text, timer=None, progress=None):
     """
-    Process and load documents into ChromaDB
+    Clean and split extracted text into chunk strings (progress: an optional progress.JobProgress).
+    `text` is a string or a list of page texts (extractText.extract_pages); returns the chunk
+    strings and, for paged text, the (page_start, page_end) of every chunk, else None.
     """
-    print("🔄 Processing documents...")
-
-    # Lazy import heavy modules and helpers
-    from langchain_huggingface import HuggingFaceEmbeddings
-    import chromadb
-    import uuid
+    import bisect
     import cleanText
     import splitText
+    from app.config import settings
+    from metrics import INGEST_STAGE_SECONDS, StageTimer
 
-    # Clean and split text
-    cleaned_text = cleanText.clean_text(text)
-    chunks = splitText.split_text_to_chunks(cleaned_text)
-    print(f"📄 Created {len(chunks)} text chunks")
-
-    # Create embeddings
-    embedding_model = HuggingFaceEmbeddings(
-        model_name="sentence-transformers/all-MiniLM-L6-v2"
-    )
+    timer = timer or StageTimer(INGEST_STAGE_SECONDS)
+    if progress:
+        progress.stage("clean")
+    with timer.stage("clean"):
+        if isinstance(text, str):
+            cleaned_text, page_offsets = cleanText.clean_text(text), None
+        else:
+            # Clean page by page and remember where each page starts in the joined text
+            page_offsets, pieces, offset = [], [], 0
+            for number, cleaned_page in enumerate(cleanText.clean_pages(text, workers=settings.CLEAN_WORKERS), start=1):
+                if cleaned_page:
+                    page_offsets.append((offset, number))
+                    pieces.append(cleaned_page)
+                    offset += len(cleaned_page) + 1
+            cleaned_text = " ".join(pieces)
+    if progress:
+        progress.stage("split")
+    with timer.stage("split"):
+        chunks = splitText.split_text_to_chunks(cleaned_text)
     texts = [chunk.page_content for chunk in chunks]
-    embeddings = embedding_model.embed_documents(texts)
-    print("✅ Generated embeddings")
-
-    # Setup Chroma collection
-    chroma_client = chromadb.PersistentClient(path="./chroma_db")
-    collection = chroma_client.get_or_create_collection(name=collection_name)
-    for chunk, embedding in zip(chunks, embeddings):
-        collection.add(
-            ids=[str(uuid.uuid4())],
-            documents=[chunk.page_content],
-            embeddings=[embedding],
-        )
+    if page_offsets is None:
+        return texts, None
+
+    starts = [offset for offset, _ in page_offsets]
+
+    def page_at(position):
+        return page_offsets[bisect.bisect_right(starts, position) - 1][1]
+
+    pages = [
+        (page_at(chunk.metadata["start_index"]), page_at(chunk.metadata["start_index"] + len(chunk.page_content) - 1))
+        for chunk in chunks
+    ]
+    return texts, pages
+
+
+def _delete_chunks(collection, where: dict) -> dict:
+    """Delete the chunks matching a metadata filter; returns their count and source file hashes"""
+    found = collection.get(where=where, include=["metadatas"])
+    if found["ids"]:
+        collection.delete(where=where)
+    file_hashes = {metadata.get("file_hash") for metadata in found["metadatas"] if metadata}
+    return {"chunks": len(found["ids"]), "file_hashes": sorted(filter(None, file_hashes))}
+
+
+def store_chunks(texts: list, collection_name: str = "manuals", timer=None, progress=None,
+                 document: dict = None, pages: list = None, max_chunks: int = 0):
+    """
+    Embed chunk strings and write them to ChromaDB as one document; returns the collection size
+    and stats (embedding throughput, doc_id, replaced chunks).
+
+    document holds the doc_id plus metadata copied onto every chunk (file_hash, source,
+    product_line, uploaded_at as epoch seconds, defaulting to now); pages the (page_start,
+    page_end) of every chunk. Chunks are written under a fresh version and any
+    earlier version of the same doc_id is deleted only after all of them are stored, so
+    re-ingesting a document replaces it without a window where it is missing.
+    With max_chunks (a tenant quota), tenants.QuotaExceeded is raised before anything is
+    embedded if the collection would end up holding more chunks.
+    """
+    import time
+    import uuid
+    from bulkEmbed import bulk_embed
+    from collectionAlias import write_lock
+    from metrics import INGEST_STAGE_SECONDS, INGEST_CHUNKS, INGEST_EMBEDDED_TOKENS, StageTimer
+    from tenants import QuotaExceeded, collection_cache
+
+    timer = timer or StageTimer(INGEST_STAGE_SECONDS)
+    document = {key: value for key, value in (document or {}).items() if value is not None}
+    doc_id = document.setdefault("doc_id", uuid.uuid4().hex)
+    document.setdefault("uploaded_at", int(time.time()))
+    version = uuid.uuid4().hex[:12]
+    metadatas = []
+    for index in range(len(texts)):
+        metadata = {**document, "version": version, "chunk_index": index}
+        if pages:
+            metadata["page_start"], metadata["page_end"] = pages[index]
+        metadatas.append(metadata)
+
+    # Writes hold the alias's write lock (shared), so a rebuild can't swap in a version between
+    # looking up the serving collection and writing to it
+    with write_lock(collection_name):
+        # Setup Chroma collection (a new one records the model its vectors come from) and the
+        # collection's embedding model (loaded once per process)
+        collection, embedding_model = collection_cache.get(collection_name, create=True)
+        if max_chunks:
+            replacing = len(collection.get(where={"doc_id": doc_id}, include=[])["ids"])
+            if collection.count() - replacing + len(texts) > max_chunks:
+                raise QuotaExceeded(f"'{collection_name}' would exceed its quota of {max_chunks} chunks")
+
+        if progress:
+            progress.stage("embed", total=len(texts))
+        on_batch = (lambda done, total: progress.advance(done, total, chunks_embedded=done)) if progress else None
+        with timer.stage("embed"):
+            embeddings, embed_stats = bulk_embed(embedding_model, texts, on_batch=on_batch)
+        INGEST_EMBEDDED_TOKENS.inc(embed_stats["tokens"])
 
-    print(f"✅ Added {collection.count()} vectors to ChromaDB")
-    return collection.count()
+        if progress:
+            progress.stage("write", total=len(texts))
+        with timer.stage("write"):
+            try:
+                for start in range(0, len(texts), WRITE_BATCH_SIZE):
+                    end = start + WRITE_BATCH_SIZE
+                    collection.add(
+                        ids=[f"{doc_id}:{version}:{index}" for index in range(start, min(end, len(texts)))],
+                        documents=texts[start:end],
+                        embeddings=embeddings[start:end],
+                        metadatas=metadatas[start:end],
+                    )
+                    if progress:
+                        written = min(end, len(texts))
+                        progress.advance(written, len(texts), chunks_written=written)
+            except Exception:
+                # Leave the previous version in place rather than a partial new one
+                _delete_chunks(collection, {"version": version})
+                raise
+            replaced = _delete_chunks(collection, {"$and": [{"doc_id": doc_id}, {"version": {"$ne": version}}]})
+    INGEST_CHUNKS.inc(len(texts))
+    stats = {**embed_stats, "doc_id": doc_id, "version": version, "document": document,
+             "replaced_chunks": replaced["chunks"], "replaced_hashes": replaced["file_hashes"]}
+    return collection.count(), stats
+
+
+def delete_document(doc_id: str, collection_name: str = "manuals") -> dict:
+    """Remove every chunk (and FAQ entry) of one document; returns the chunk count and the file hashes they came from"""
+    import chromadb
+    from app.config import settings
+    from collectionAlias import resolve, write_lock
+    from faqIndex import delete_document_faq
+
+    chroma_client = chromadb.PersistentClient(path=settings.CHROMA_PATH)
+    with write_lock(collection_name):
+        try:
+            collection = chroma_client.get_collection(name=resolve(collection_name))
+        except Exception:
+            return {"chunks": 0, "file_hashes": []}
+        delete_document_faq(collection_name, doc_id)
+        return _delete_chunks(collection, {"doc_id": doc_id})
+
+
+def refresh_faq(collection_name: str, texts: list, store_stats: dict, timer=None, progress=None) -> int:
+    """
+    Optional ingestion stage: generate the stored document's FAQ (see faqIndex.py), or without
+    FAQ_QUESTIONS_PER_DOCUMENT just drop the FAQ of the version it replaced. A failure only
+    costs the FAQ, not the ingestion. Versions being built (collectionAlias rebuilds) get no
+    FAQ: lookups only read the alias's. Returns the entries stored.
+    """
+    from app.config import settings
+    from collectionAlias import VERSION_SEPARATOR
+    from faqIndex import build_document_faq, delete_document_faq
+    from metrics import INGEST_STAGE_SECONDS, StageTimer
+
+    if VERSION_SEPARATOR in collection_name:
+        return 0
+    if not settings.FAQ_QUESTIONS_PER_DOCUMENT:
+        if store_stats["replaced_chunks"]:
+            delete_document_faq(collection_name, store_stats["doc_id"], keep_version=store_stats["version"])
+        return 0
+    timer = timer or StageTimer(INGEST_STAGE_SECONDS)
+    if progress:
+        progress.stage("faq")
+    try:
+        with timer.stage("faq"):
+            entries = build_document_faq(collection_name, texts, store_stats["document"], store_stats["version"])
+    except Exception as e:
+        print(f"⚠️  FAQ generation failed for {store_stats['doc_id']}: {e}")
+        # The replaced version's answers must not outlive it
+        if store_stats["replaced_chunks"]:
+            delete_document_faq(collection_name, store_stats["doc_id"], keep_version=store_stats["version"])
+        return 0
+    print(f"❓ Stored {entries} FAQ entries for {store_stats['doc_id']}")
+    return entries
+
+
+@profiled("ingestion")
+def setup_knowledge_base(text, collection_name: str = "manuals", timer=None, stats: dict = None, progress=None,
+                         document: dict = None, max_chunks: int = 0):
+    """
+    Process and load documents into ChromaDB.
+    text is a string or a list of page texts; document carries the doc_id and chunk metadata
+    (see store_chunks) and an existing document with the same doc_id is replaced.
+    Pass a StageTimer to collect the stage breakdown, a dict to receive chunk and token counts,
+    and a progress.JobProgress to publish progress events; max_chunks caps the collection's size.
+    """
+    print("🔄 Processing documents...")
+
+    texts, pages = prepare_chunks(text, timer, progress)
+    print(f"📄 Created {len(texts)} text chunks")
+
+    count, store_stats = store_chunks(texts, collection_name, timer, progress, document, pages, max_chunks)
+    faq_entries = refresh_faq(collection_name, texts, store_stats, timer, progress)
+    if stats is not None:
+        stats.update({"chunks": len(texts), "tokens": store_stats["tokens"], "doc_id": store_stats["doc_id"],
+                      "replaced_chunks": store_stats["replaced_chunks"],
+                      "replaced_hashes": store_stats["replaced_hashes"], "faq_entries": faq_entries})
+    print(f"✅ Generated embeddings: {store_stats['tokens']} tokens in {store_stats['batches']} batches "
+          f"({store_stats['tokens_per_s']:.0f} tokens/s, {store_stats['padding_efficiency']:.0%} padding efficiency)")
+    if store_stats["replaced_chunks"]:
+        print(f"🗑️  Replaced {store_stats['replaced_chunks']} chunks of the previous version of {store_stats['doc_id']}")
+
+    print(f"✅ Added {count} vectors to ChromaDB")
+    return count
 
 
     # # Delete existing vectors
@@ -47,6 +227,190 @@ def setup_knowledge_base(text: str, collection_name: str = "manuals"):
 
     # Add new embeddings
 
+# Document types extract_text understands
+SUPPORTED_EXTENSIONS = (".pdf", ".docx")
+
+
+def collect_sources(directory: str = None, pattern: str = "**/*", manifest: str = None) -> list:
+    """Document paths from a directory (filtered by a glob) or a manifest of one path per line"""
+    import glob
+    import os
+
+    if manifest:
+        base = os.path.dirname(os.path.abspath(manifest))
+        with open(manifest) as f:
+            lines = [line.strip() for line in f]
+        paths = [os.path.join(base, line) for line in lines if line and not line.startswith("#")]
+    else:
+        paths = glob.glob(os.path.join(directory, pattern), recursive=True)
+    paths = [os.path.abspath(path) for path in paths if path.lower().endswith(SUPPORTED_EXTENSIONS)]
+    missing = [path for path in paths if not os.path.isfile(path)]
+    for path in missing:
+        print(f"⚠️  Not found, skipping: {path}")
+    paths = [path for path in paths if path not in missing]
+    return sorted(dict.fromkeys(paths))
+
+
+def _prepare_document(path: str) -> dict:
+    """Worker-process step: hash, extract, clean and split one document"""
+    import hashlib
+    import time
+    import extractText
+
+    started = time.perf_counter()
+    with open(path, "rb") as f:
+        file_hash = hashlib.sha256(f.read()).hexdigest()
+    text = extractText.extract_pages(path)
+    characters = len(text) if isinstance(text, str) else sum(len(page) for page in text)
+    texts, pages = prepare_chunks(text) if characters else ([], None)
+    return {"path": path, "hash": file_hash, "texts": texts, "pages": pages, "characters": characters,
+            "prepare_s": time.perf_counter() - started}
+
+
+def document_id(path: str, root: str) -> str:
+    """Stable doc_id of a bulk-ingested file: its path relative to the ingestion root"""
+    import os
+
+    return os.path.relpath(path, root).replace(os.sep, "/")
+
+
+def _file_signature(path: str) -> dict:
+    import os
+
+    stat = os.stat(path)
+    return {"size": stat.st_size, "mtime": stat.st_mtime}
+
+
+def load_checkpoint(path: str, collection_name: str) -> dict:
+    """Read a bulk-ingestion checkpoint, or start a new one"""
+    import json
+    import os
+
+    if not os.path.exists(path):
+        return {"collection": collection_name, "documents": {}, "failed": {}}
+    with open(path) as f:
+        checkpoint = json.load(f)
+    if checkpoint.get("collection") != collection_name:
+        raise ValueError(f"Checkpoint {path} belongs to collection '{checkpoint.get('collection')}'")
+    checkpoint.setdefault("failed", {})
+    return checkpoint
+
+
+def save_checkpoint(path: str, checkpoint: dict):
+    """Write the checkpoint atomically so an interrupted run never leaves it half-written"""
+    import json
+    import os
+    from datetime import datetime
+
+    checkpoint["updated_at"] = datetime.now().isoformat()
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "w") as f:
+        json.dump(checkpoint, f, indent=2)
+    os.replace(temp_path, path)
+
+
+def _format_duration(seconds: float) -> str:
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}h{minutes:02d}m{seconds:02d}s" if hours else f"{minutes}m{seconds:02d}s"
+
+
+def feed_documents(sources: list, collection_name: str = "manuals", workers: int = None, checkpoint_path: str = None,
+                   root: str = None, product_line: str = None) -> dict:
+    """
+    Bulk-ingest many documents: a process pool extracts, cleans and splits them while this
+    process embeds and writes with its single embedding model. Finished documents are
+    recorded in the checkpoint, so rerunning the same command skips them, and a changed
+    document replaces its previous chunks (doc_ids are paths relative to root, by default
+    the sources' common directory).
+    """
+    import multiprocessing
+    import os
+    import time
+    from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+    workers = workers or max(1, (os.cpu_count() or 2) - 1)
+    root = root or os.path.commonpath([os.path.dirname(path) for path in sources])
+    checkpoint = load_checkpoint(checkpoint_path, collection_name) if checkpoint_path else {"documents": {}, "failed": {}}
+    done = checkpoint["documents"]
+    # A document counts as done only if it has not changed since it was ingested
+    pending_paths = [
+        path for path in sources
+        if path not in done or {key: done[path].get(key) for key in ("size", "mtime")} != _file_signature(path)
+    ]
+    skipped = len(sources) - len(pending_paths)
+    if skipped:
+        print(f"⏭️  Skipping {skipped} documents already ingested (checkpoint {checkpoint_path})")
+    print(f"🔄 Ingesting {len(pending_paths)} documents with {workers} workers into '{collection_name}'")
+
+    stats = {"documents": 0, "empty": 0, "failed": 0, "chunks": 0, "tokens": 0}
+    started = time.perf_counter()
+    queue = iter(pending_paths)
+    # spawn: workers must not inherit a half-initialized model runtime or thread pools
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+        in_flight = {}
+        try:
+            while True:
+                # Keep a bounded number of prepared documents waiting for the embedder
+                while len(in_flight) < workers * 2:
+                    path = next(queue, None)
+                    if path is None:
+                        break
+                    in_flight[pool.submit(_prepare_document, path)] = path
+                if not in_flight:
+                    break
+
+                finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    path = in_flight.pop(future)
+                    try:
+                        result = future.result()
+                        doc_id = document_id(path, root)
+                        status = f"{len(result['texts'])} chunks"
+                        if result["texts"]:
+                            document = {"doc_id": doc_id, "file_hash": result["hash"], "source": os.path.basename(path),
+                                        "product_line": product_line}
+                            _, store_stats = store_chunks(result["texts"], collection_name,
+                                                          document=document, pages=result["pages"])
+                            refresh_faq(collection_name, result["texts"], store_stats)
+                            stats["chunks"] += len(result["texts"])
+                            stats["tokens"] += store_stats["tokens"]
+                            if store_stats["replaced_chunks"]:
+                                status += f" (replaced {store_stats['replaced_chunks']})"
+                        else:
+                            stats["empty"] += 1
+                        done[path] = {**_file_signature(path), "chunks": len(result["texts"]), "doc_id": doc_id}
+                        checkpoint["failed"].pop(path, None)
+                        stats["documents"] += 1
+                    except Exception as e:
+                        checkpoint["failed"][path] = str(e)
+                        stats["failed"] += 1
+                        status = f"❌ {e}"
+                    if checkpoint_path:
+                        save_checkpoint(checkpoint_path, checkpoint)
+
+                    processed = stats["documents"] + stats["failed"]
+                    elapsed = time.perf_counter() - started
+                    rate = processed / elapsed if elapsed else 0.0
+                    eta = (len(pending_paths) - processed) / rate if rate else 0.0
+                    print(f"[{processed}/{len(pending_paths)}] {os.path.basename(path)}: {status} | "
+                          f"{rate:.2f} docs/s, {stats['chunks'] / elapsed:.1f} chunks/s | ETA {_format_duration(eta)}")
+        except KeyboardInterrupt:
+            for future in in_flight:
+                future.cancel()
+            raise
+
+    elapsed = time.perf_counter() - started
+    stats.update({
+        "skipped": skipped,
+        "seconds": elapsed,
+        "docs_per_s": stats["documents"] / elapsed if elapsed else 0.0,
+        "chunks_per_s": stats["chunks"] / elapsed if elapsed else 0.0,
+        "tokens_per_s": stats["tokens"] / elapsed if elapsed else 0.0,
+    })
+    return stats
+
+
 def main():
     """Main function to feed documents to the knowledge base"""
     try:
@@ -55,29 +419,96 @@ def main():
         import os
         from dotenv import load_dotenv
         import extractText
+        from metrics import INGEST_STAGE_SECONDS
 
         load_dotenv()
 
         parser = argparse.ArgumentParser(
-            description="Extract text from a PDF or DOCX document and feed it into the knowledge base."
+            description="Extract text from PDF or DOCX documents and feed them into the knowledge base."
+        )
+        source = parser.add_mutually_exclusive_group(required=True)
+        source.add_argument(
+            "-s", "--source", help="Path to the document file (PDF or DOCX)"
+        )
+        source.add_argument(
+            "-d", "--dir", help="Ingest every PDF/DOCX under this directory (see --glob)"
+        )
+        source.add_argument(
+            "-m", "--manifest", help="Ingest the documents listed in this file, one path per line"
+        )
+        source.add_argument(
+            "--delete", metavar="DOC_ID", help="Delete every chunk of this document from the collection"
+        )
+        parser.add_argument(
+            "--doc-id",
+            help="Document id for --source (default: the file name); an existing document with this id is replaced",
+        )
+        parser.add_argument(
+            "-p", "--product-line", help="Product line recorded on every chunk, for scoped retrieval"
+        )
+        parser.add_argument(
+            "-g", "--glob", default="**/*", help="Pattern to match inside --dir (default: **/*)"
         )
         parser.add_argument(
-            "-s", "--source", required=True, help="Path to the document file (PDF or DOCX)"
+            "-w", "--workers", type=int, help="Extraction worker processes (default: CPU count - 1)"
+        )
+        parser.add_argument(
+            "--checkpoint",
+            help="Checkpoint file recording finished documents, so a rerun resumes "
+                 "(default: feeddoc-<collection>.checkpoint.json)",
         )
         parser.add_argument(
             "-c", "--collection", default="manuals", help="ChromaDB collection name (default: manuals)"
         )
+        parser.add_argument(
+            "-t", "--tenant", help="Tenant whose knowledge base to feed (its own collection, see tenants.py)"
+        )
         args = parser.parse_args()
+        if args.tenant:
+            from tenants import tenant_collection
+
+            args.collection = tenant_collection(args.tenant, args.collection)
 
         print("📚 Document Feeding System")
         print("=" * 50)
 
+        if args.delete:
+            from uploadStore import upload_store
+
+            removed = delete_document(args.delete, args.collection)
+            for file_hash in removed["file_hashes"]:
+                upload_store.catalog.delete_ingestion(file_hash, args.collection)
+            if removed["chunks"]:
+                print(f"🗑️  Deleted {removed['chunks']} chunks of {args.delete} from '{args.collection}'")
+            else:
+                print(f"❌ No chunks found for document {args.delete} in '{args.collection}'")
+            return
+
+        if args.dir or args.manifest:
+            sources = collect_sources(args.dir, args.glob, args.manifest)
+            if not sources:
+                print("❌ No PDF or DOCX documents found")
+                return
+            checkpoint_path = args.checkpoint or f"feeddoc-{args.collection}.checkpoint.json"
+            root = os.path.abspath(args.dir) if args.dir else os.path.dirname(os.path.abspath(args.manifest))
+            stats = feed_documents(sources, args.collection, args.workers, checkpoint_path, root, args.product_line)
+            print("\n📈 Bulk ingestion summary")
+            print(f"   {stats['documents']} documents ({stats['empty']} empty), {stats['skipped']} skipped, "
+                  f"{stats['failed']} failed")
+            print(f"   {stats['chunks']} chunks in {_format_duration(stats['seconds'])}: {stats['docs_per_s']:.2f} docs/s, "
+                  f"{stats['chunks_per_s']:.1f} chunks/s, {stats['tokens_per_s']:.0f} tokens/s")
+            if stats["failed"]:
+                print(f"⚠️  Failed documents are listed in {checkpoint_path} and retried on the next run")
+            return
+
         if not os.path.exists(args.source):
             print(f"❌ File not found: {args.source}")
             return
 
         print(f"📥 Reading from: {args.source}")
-        text = extractText.extract_text(args.source)
+        with INGEST_STAGE_SECONDS.time(stage="extract"):
+            pages = extractText.extract_pages(args.source)
+        text = pages if isinstance(pages, str) else "\n".join(pages)
 
         if not text.strip():
             print("❌ No text extracted. Exiting...")
@@ -85,8 +516,19 @@ def main():
 
         print(f"\n📄 Received {len(text)} characters of text")
 
-        # Setup knowledge base
-        doc_count = setup_knowledge_base(text, args.collection)
+        # Setup knowledge base (replacing an earlier version of the same document)
+        import hashlib
+        from uploadStore import upload_store
+
+        with open(args.source, "rb") as f:
+            file_hash = hashlib.sha256(f.read()).hexdigest()
+        document = {"doc_id": args.doc_id or os.path.basename(args.source), "file_hash": file_hash,
+                    "source": os.path.basename(args.source), "product_line": args.product_line}
+        stats = {}
+        doc_count = setup_knowledge_base(pages, args.collection, stats=stats, document=document)
+        for replaced_hash in stats["replaced_hashes"]:
+            if replaced_hash != file_hash:
+                upload_store.catalog.delete_ingestion(replaced_hash, args.collection)
 
         if doc_count > 0:
             print(f"✅ Successfully added {doc_count} document chunks to knowledge base")
@@ -95,7 +537,7 @@ def main():
             print("❌ Failed to add documents to knowledge base")
 
     except KeyboardInterrupt:
-        print("\n👋 Feeding cancelled by user")
+        print("\n👋 Feeding cancelled by user (rerun the same command to resume a bulk ingestion)")
     except Exception as e:
         print(f"❌ Error during document feeding: {e}")
 
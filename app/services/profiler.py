@@ -0,0 +1,235 @@
+import cProfile
+import io
+import marshal
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Set, Tuple
+
+TARGETS = ("process", "ask_question", "ingestion")
+FORMATS = ("pstats", "collapsed", "text")
+MAX_SECONDS = 300.0
+
+_active = None
+_capture_lock = threading.Lock()
+
+
+class ProfileSession:
+    """One time-boxed profile capture, either process-wide or of the next N hooked calls"""
+
+    def __init__(self, target: str, calls: int, fmt: str, interval: float):
+        self.target = target
+        self.fmt = fmt
+        self.interval = interval
+        self.calls_remaining = calls
+        self.calls_started = 0
+        self.in_flight = 0
+        self.samples = 0
+        self.stacks: Counter = Counter()
+        self.stats: Optional[pstats.Stats] = None
+        self.threads: Set[int] = set()
+        self.finished = threading.Event()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._sampler: Optional[threading.Thread] = None
+        self._ignored: Set[int] = {threading.get_ident()}
+
+    @property
+    def samples_stacks(self) -> bool:
+        return self.target == "process" or self.fmt == "collapsed"
+
+    def start(self):
+        if self.samples_stacks:
+            self._sampler = threading.Thread(target=self._sample, name="profiler-sampler", daemon=True)
+            self._sampler.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._sampler is not None:
+            self._sampler.join()
+
+    def claim_call(self) -> bool:
+        """Reserve one of the remaining call slots (0 means unlimited until the deadline)"""
+        with self._lock:
+            if self.finished.is_set():
+                return False
+            if self.calls_remaining and self.calls_started >= self.calls_remaining:
+                return False
+            self.calls_started += 1
+            self.in_flight += 1
+            return True
+
+    def release_call(self, profile: Optional[cProfile.Profile]):
+        with self._lock:
+            if profile is not None:
+                if self.stats is None:
+                    self.stats = pstats.Stats(profile)
+                else:
+                    self.stats.add(profile)
+            self.in_flight -= 1
+            if self.calls_remaining and self.calls_started >= self.calls_remaining and not self.in_flight:
+                self.finished.set()
+
+    def _sample(self):
+        self._ignored.add(threading.get_ident())
+        while not self._stop.wait(self.interval):
+            frames = sys._current_frames()
+            for ident, frame in frames.items():
+                if ident in self._ignored:
+                    continue
+                if self.target != "process" and ident not in self.threads:
+                    continue
+                self.stacks[_collapse(frame)] += 1
+            self.samples += 1
+
+    def render(self) -> Tuple[bytes, str]:
+        """Serialize the capture as (body, media type)"""
+        if self.fmt == "collapsed":
+            lines = [f"{stack} {count}" for stack, count in self.stacks.most_common()]
+            return ("\n".join(lines) + "\n").encode(), "text/plain; charset=utf-8"
+
+        if self.stats is None:
+            return b"", "application/octet-stream"
+
+        if self.fmt == "pstats":
+            # Same payload as Stats.dump_stats(), loadable with pstats.Stats(path)
+            return marshal.dumps(self.stats.stats), "application/octet-stream"
+
+        buffer = io.StringIO()
+        self.stats.stream = buffer
+        self.stats.sort_stats("cumulative").print_stats(50)
+        return buffer.getvalue().encode(), "text/plain; charset=utf-8"
+
+    def summary(self) -> Dict:
+        return {
+            "target": self.target,
+            "format": self.fmt,
+            "calls_profiled": self.calls_started,
+            "samples": self.samples,
+        }
+
+
+def _collapse(frame) -> str:
+    """Render a frame chain as a root-first 'a;b;c' stack for flame graphs"""
+    names: List[str] = []
+    while frame is not None:
+        code = frame.f_code
+        names.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+@contextmanager
+def profiled(target: str):
+    """Hook around ask_question / ingestion calls; a no-op unless a capture wants this target"""
+    session = _active
+    ident = threading.get_ident()
+    if session is None or session.target != target or ident in session.threads or not session.claim_call():
+        yield
+        return
+
+    profile = None
+    session.threads.add(ident)
+    if not session.samples_stacks:
+        profile = cProfile.Profile()
+        profile.enable()
+    try:
+        yield
+    finally:
+        if profile is not None:
+            profile.disable()
+        session.threads.discard(ident)
+        session.release_call(profile)
+
+
+def capture(target: str = "process", seconds: float = 10.0, calls: int = 0,
+            fmt: str = "collapsed", interval: float = 0.005) -> Tuple[bytes, str, Dict]:
+    """
+    Capture a CPU profile of the running app.
+
+    target "process" samples every thread's stack for `seconds`; "ask_question" and
+    "ingestion" profile the next `calls` hooked calls (or all of them until `seconds`
+    elapse when calls is 0). Blocks until the capture completes.
+    """
+    global _active
+
+    if target not in TARGETS:
+        raise ValueError(f"Unknown target '{target}'. Use one of: {', '.join(TARGETS)}")
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown format '{fmt}'. Use one of: {', '.join(FORMATS)}")
+    if target == "process" and fmt != "collapsed":
+        raise ValueError("Process-wide captures are sampled and only support the 'collapsed' format")
+    seconds = min(max(seconds, 0.1), MAX_SECONDS)
+
+    if not _capture_lock.acquire(blocking=False):
+        raise RuntimeError("A profile capture is already running")
+    try:
+        session = ProfileSession(target, calls, fmt, interval)
+        session.start()
+        _active = session
+        try:
+            deadline = time.monotonic() + seconds
+            if calls:
+                session.finished.wait(seconds)
+            else:
+                time.sleep(max(deadline - time.monotonic(), 0))
+        finally:
+            _active = None
+            session.finished.set()
+            session.stop()
+            # Let calls that were already profiling finish merging their stats
+            while session.in_flight and time.monotonic() < deadline + 5:
+                time.sleep(0.01)
+
+        body, media_type = session.render()
+        return body, media_type, session.summary()
+    finally:
+        _capture_lock.release()
+
+
+def snapshot_allocations(seconds: float = 10.0, top: int = 25, group_by: str = "lineno",
+                         frames: int = 10) -> Dict:
+    """Trace allocations with tracemalloc for `seconds` and report the biggest growth"""
+    if group_by not in ("lineno", "filename", "traceback"):
+        raise ValueError("group_by must be one of: lineno, filename, traceback")
+    seconds = min(max(seconds, 0.1), MAX_SECONDS)
+
+    if not _capture_lock.acquire(blocking=False):
+        raise RuntimeError("A profile capture is already running")
+    started_here = not tracemalloc.is_tracing()
+    try:
+        if started_here:
+            tracemalloc.start(frames)
+        tracemalloc.reset_peak()
+        before = tracemalloc.take_snapshot()
+        time.sleep(seconds)
+        after = tracemalloc.take_snapshot()
+        current, peak = tracemalloc.get_traced_memory()
+
+        ignore = [tracemalloc.Filter(False, tracemalloc.__file__)]
+        diffs = after.filter_traces(ignore).compare_to(before.filter_traces(ignore), group_by)
+        return {
+            "seconds": seconds,
+            "group_by": group_by,
+            "traced_current_bytes": current,
+            "traced_peak_bytes": peak,
+            "top": [
+                {
+                    "location": stat.traceback.format() if group_by == "traceback" else str(stat.traceback[0]),
+                    "size_bytes": stat.size,
+                    "size_diff_bytes": stat.size_diff,
+                    "count": stat.count,
+                    "count_diff": stat.count_diff,
+                }
+                for stat in diffs[:top]
+            ],
+        }
+    finally:
+        if started_here:
+            tracemalloc.stop()
+        _capture_lock.release()
@@ -0,0 +1,155 @@
+import asyncio
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from typing import AsyncIterator, Deque, Dict, List, Optional, Tuple
+
+# Events that end a job's stream
+TERMINAL_STATUSES = ("completed", "error", "duplicate")
+# Minimum seconds between two "advance" events of the same stage (stage changes always publish)
+PUBLISH_INTERVAL = 0.2
+
+
+class _Job:
+    def __init__(self, buffer_size: int):
+        self.events: Deque[Dict] = deque(maxlen=buffer_size)
+        self.seq = 0
+        self.finished_at: Optional[float] = None
+        self.subscribers: List[Tuple[asyncio.AbstractEventLoop, asyncio.Queue]] = []
+
+
+class ProgressBroker:
+    """
+    Fans ingestion progress events out to SSE and WebSocket subscribers.
+
+    publish() may be called from any thread (ingestion runs in worker threads). Every job keeps
+    its most recent events in a ring buffer, so a subscriber that connects late, or reconnects
+    with the last sequence number it saw, first replays what it missed and then follows live.
+    Finished jobs are forgotten after `retention` seconds.
+    """
+
+    def __init__(self, buffer_size: int = 256, retention: float = 900.0):
+        self.buffer_size = buffer_size
+        self.retention = retention
+        self._jobs: Dict[str, _Job] = {}
+        self._lock = threading.Lock()
+
+    def publish(self, job_id: str, status: str, **data) -> Dict:
+        with self._lock:
+            self._expire()
+            job = self._jobs.get(job_id)
+            if job is None:
+                job = self._jobs[job_id] = _Job(self.buffer_size)
+            job.seq += 1
+            event = {"job_id": job_id, "seq": job.seq, "status": status,
+                     "timestamp": datetime.now().isoformat(), **data}
+            job.events.append(event)
+            if status in TERMINAL_STATUSES:
+                job.finished_at = time.monotonic()
+            subscribers = list(job.subscribers)
+        for loop, queue in subscribers:
+            try:
+                loop.call_soon_threadsafe(queue.put_nowait, event)
+            except RuntimeError:
+                pass  # the subscriber's loop is closed
+        return event
+
+    def _expire(self):
+        cutoff = time.monotonic() - self.retention
+        for job_id in [job_id for job_id, job in self._jobs.items() if job.finished_at and job.finished_at < cutoff]:
+            del self._jobs[job_id]
+
+    def exists(self, job_id: str) -> bool:
+        with self._lock:
+            self._expire()
+            return job_id in self._jobs
+
+    async def subscribe(self, job_id: str, after: int = 0, heartbeat: float = None) -> AsyncIterator[Optional[Dict]]:
+        """
+        Yield events with seq > after, replaying the buffer first, until the job finishes.
+        With a heartbeat interval, None is yielded whenever no event arrived for that long.
+        Unknown (or expired) jobs, and finished ones with nothing newer than after, yield nothing.
+        """
+        queue: asyncio.Queue = asyncio.Queue()
+        entry = (asyncio.get_running_loop(), queue)
+        with self._lock:
+            self._expire()
+            job = self._jobs.get(job_id)
+            if job is None:
+                return
+            backlog = [event for event in job.events if event["seq"] > after]
+            if job.finished_at and not backlog:
+                return
+            job.subscribers.append(entry)
+        try:
+            for event in backlog:
+                after = event["seq"]
+                yield event
+                if event["status"] in TERMINAL_STATUSES:
+                    return
+            while True:
+                try:
+                    event = await asyncio.wait_for(queue.get(), heartbeat)
+                except asyncio.TimeoutError:
+                    yield None
+                    continue
+                if event["seq"] <= after:
+                    continue
+                after = event["seq"]
+                yield event
+                if event["status"] in TERMINAL_STATUSES:
+                    return
+        finally:
+            with self._lock:
+                if entry in job.subscribers:
+                    job.subscribers.remove(entry)
+
+
+class JobProgress:
+    """Progress reporter handed to one ingestion job: tracks stages, counts and ETA"""
+
+    def __init__(self, broker: ProgressBroker, job_id: str, **context):
+        self.broker = broker
+        self.job_id = job_id
+        self.context = context
+        self.started = time.monotonic()
+        self.stage_name: Optional[str] = None
+        self.stage_started = self.started
+        self.last_published = 0.0
+        self.counts: Dict[str, int] = {}
+
+    def stage(self, name: str, total: Optional[int] = None, message: str = None):
+        """Enter a pipeline stage (extract, clean, split, embed, write)"""
+        self.stage_name = name
+        self.stage_started = time.monotonic()
+        self._publish("processing", done=0, total=total, message=message)
+
+    def advance(self, done: int, total: Optional[int] = None, **counts):
+        """Report progress within the current stage; throttled unless the stage is complete"""
+        self.counts.update(counts)
+        now = time.monotonic()
+        if (total is None or done < total) and now - self.last_published < PUBLISH_INTERVAL:
+            return
+        eta = None
+        elapsed = now - self.stage_started
+        if total and done:
+            eta = round(elapsed / done * (total - done), 2)
+        self._publish("processing", done=done, total=total, eta_seconds=eta)
+
+    def finish(self, status: str, message: str = None, **data):
+        self.stage_name = None
+        self._publish(status, message=message, **data)
+
+    def _publish(self, status: str, **data):
+        self.last_published = time.monotonic()
+        self.broker.publish(self.job_id, status, **{
+            **self.context,
+            **self.counts,
+            "stage": self.stage_name,
+            "elapsed_seconds": round(self.last_published - self.started, 2),
+            **{key: value for key, value in data.items() if value is not None},
+        })
+
+
+broker = ProgressBroker()
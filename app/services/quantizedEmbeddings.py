@@ -0,0 +1,114 @@
+import os
+import sys
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+# Add the project root to Python path so app.config resolves from scripts too
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from app.config import settings
+from bulkEmbed import embed_in_buckets, estimate_tokens
+
+RUNTIMES = ("onnx", "torch")
+
+
+class QuantizedEmbeddings:
+    """
+    A sentence-transformers model (EMBEDDING_MODEL, all-MiniLM-L6-v2 by default) with int8
+    weights for CPU-only hosts.
+
+    runtime="onnx" runs the int8 ONNX export published with the model through ONNX Runtime
+    (only onnxruntime + tokenizers needed); runtime="torch" applies dynamic int8 quantization
+    to the Linear layers of the sentence-transformers model. Both produce mean-pooled,
+    L2-normalized vectors like the reference model, and embed_documents batches texts of
+    similar token length together (bulkEmbed) so little compute is spent on padding.
+    """
+
+    def __init__(self, model_name: str, runtime: str = "onnx", threads: int = 0, batch_size: int = 128,
+                 max_length: int = 256, onnx_file: str = "onnx/model_quint8_avx2.onnx"):
+        if runtime not in RUNTIMES:
+            raise ValueError(f"Unknown quantized runtime: {runtime} (expected one of {', '.join(RUNTIMES)})")
+        self.model_name = model_name
+        self.runtime = runtime
+        self.threads = threads
+        self.batch_size = batch_size
+        self.max_length = max_length
+        if runtime == "onnx":
+            self._load_onnx(onnx_file)
+        else:
+            self._load_torch()
+
+    def _load_onnx(self, onnx_file: str):
+        import onnxruntime as ort  # lazy import
+        from huggingface_hub import hf_hub_download
+        from tokenizers import Tokenizer
+
+        cache_dir = settings.EMBEDDING_CACHE_DIR or None
+        self.tokenizer = Tokenizer.from_file(hf_hub_download(self.model_name, "tokenizer.json", cache_dir=cache_dir))
+        self.tokenizer.enable_truncation(max_length=self.max_length)
+        self.tokenizer.no_padding()  # padding happens per length bucket in _run_onnx
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        options.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+        options.inter_op_num_threads = 1
+        if self.threads:
+            options.intra_op_num_threads = self.threads
+        self.session = ort.InferenceSession(
+            hf_hub_download(self.model_name, onnx_file, cache_dir=cache_dir),
+            sess_options=options,
+            providers=["CPUExecutionProvider"],
+        )
+        self.input_names = {model_input.name for model_input in self.session.get_inputs()}
+
+    def _load_torch(self):
+        import torch  # lazy import
+        from sentence_transformers import SentenceTransformer
+
+        if self.threads:
+            torch.set_num_threads(self.threads)
+        kwargs = {"cache_folder": settings.EMBEDDING_CACHE_DIR} if settings.EMBEDDING_CACHE_DIR else {}
+        model = SentenceTransformer(self.model_name, device="cpu", **kwargs)
+        model.max_seq_length = self.max_length
+        self.model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8).eval()
+
+    def _run_onnx(self, encodings) -> np.ndarray:
+        """Pad one length bucket to its own longest text, run it, mean-pool and normalize"""
+        width = max(len(encoding.ids) for encoding in encodings)
+        input_ids = np.zeros((len(encodings), width), dtype=np.int64)
+        attention_mask = np.zeros((len(encodings), width), dtype=np.int64)
+        for row, encoding in enumerate(encodings):
+            input_ids[row, :len(encoding.ids)] = encoding.ids
+            attention_mask[row, :len(encoding.ids)] = 1
+
+        feeds = {"input_ids": input_ids, "attention_mask": attention_mask}
+        if "token_type_ids" in self.input_names:
+            feeds["token_type_ids"] = np.zeros_like(input_ids)
+        hidden = self.session.run(None, feeds)[0]
+
+        mask = attention_mask[:, :, None].astype(hidden.dtype)
+        pooled = (hidden * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+        return pooled / np.clip(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12, None)
+
+    def _run_torch(self, texts: List[str]) -> np.ndarray:
+        return self.model.encode(texts, batch_size=len(texts), normalize_embeddings=True, convert_to_numpy=True)
+
+    def bulk_embed(self, texts: List[str], memory_target_mb: Optional[float] = None,
+                   on_batch: Optional[Callable[[int, int], None]] = None) -> Tuple[List[List[float]], Dict]:
+        """Length-bucketed embedding (see bulkEmbed.embed_in_buckets), with exact token counts on ONNX"""
+        if self.runtime == "torch":
+            items, lengths, run = list(texts), [estimate_tokens(text) for text in texts], self._run_torch
+        else:
+            items = self.tokenizer.encode_batch(list(texts))
+            lengths, run = [len(encoding.ids) for encoding in items], self._run_onnx
+        return embed_in_buckets(lambda batch: run(batch).tolist(), items, lengths, memory_target_mb,
+                                self.batch_size, on_batch)
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        if not texts:
+            return []
+        return self.bulk_embed(texts)[0]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed_documents([text])[0]
@@ -0,0 +1,185 @@
+import json
+import os
+import sys
+import time
+from typing import Dict, List
+
+# Add the project root to Python path so app.config resolves from scripts too
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from app.config import settings
+from bulkEmbed import bulk_embed
+from collectionAlias import create_shadow, promote, resolve, validate
+
+
+def _client():
+    import chromadb  # lazy import
+
+    return chromadb.PersistentClient(path=settings.CHROMA_PATH)
+
+
+def default_checkpoint_path(alias: str) -> str:
+    return os.path.join(settings.CHROMA_PATH, f"reembed-{alias}.checkpoint.json")
+
+
+def _save_checkpoint(path: str, checkpoint: Dict):
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "w") as f:
+        json.dump(checkpoint, f, indent=2)
+    os.replace(temp_path, path)
+
+
+def copy_chunks(source, target, embedding_model=None, ids: List[str] = None, offset: int = 0, limit: int = 0) -> int:
+    """
+    Copy one page of source chunks (by ids, or by offset/limit) into target, re-embedded with
+    embedding_model or with their stored vectors when it is None; returns the chunks copied
+    """
+    include = ["documents", "metadatas"] + ([] if embedding_model else ["embeddings"])
+    if ids is not None:
+        page = source.get(ids=ids, include=include)
+    else:
+        page = source.get(limit=limit, offset=offset, include=include)
+    if not page["ids"]:
+        return 0
+    documents = [document or "" for document in page["documents"]]
+    if embedding_model:
+        vectors, _ = bulk_embed(embedding_model, documents)
+    else:
+        vectors = page["embeddings"]
+    # upsert: a batch repeated after a crash between writing and checkpointing is harmless
+    target.upsert(ids=page["ids"], embeddings=vectors, documents=documents, metadatas=page["metadatas"])
+    return len(page["ids"])
+
+
+def reconcile(source, target, embedding_model=None, batch_size: int = 256) -> Dict:
+    """Catch target up with chunks added to or deleted from source since the copy started"""
+    source_ids = set(source.get(include=[])["ids"])
+    target_ids = set(target.get(include=[])["ids"])
+    missing = sorted(source_ids - target_ids)
+    for start in range(0, len(missing), batch_size):
+        copy_chunks(source, target, embedding_model, ids=missing[start:start + batch_size])
+    stale = sorted(target_ids - source_ids)
+    for start in range(0, len(stale), batch_size):
+        target.delete(ids=stale[start:start + batch_size])
+    return {"reconciled_added": len(missing), "reconciled_removed": len(stale)}
+
+
+def migrate(alias: str, model_name: str, batch_size: int = None, max_rate: float = None, checkpoint_path: str = None,
+            swap: bool = True, min_count_ratio: float = 0.9, progress=None) -> Dict:
+    """
+    Re-embed every chunk of the collection serving alias with another model into a new version,
+    then validate it and swap it in. Chunk texts and metadata are copied as stored, so no
+    source document is needed.
+
+    Batches are throttled to max_rate chunks per second so the migration leaves CPU for live
+    queries, which keep using the serving version until the swap. Progress is checkpointed
+    after every batch; rerunning resumes where it stopped. Chunks added to or deleted from the
+    serving version meanwhile are reconciled before validation.
+    """
+    from embeddings import collection_model_name, get_embedding_model
+
+    batch_size = batch_size or settings.REEMBED_BATCH_SIZE
+    max_rate = settings.REEMBED_MAX_RATE if max_rate is None else max_rate
+    checkpoint_path = checkpoint_path or default_checkpoint_path(alias)
+    client = _client()
+    # A model name ("hash" for the hash backend) is also the identity recorded on the collection
+    target_model = model_name
+
+    checkpoint = None
+    if os.path.exists(checkpoint_path):
+        with open(checkpoint_path) as f:
+            checkpoint = json.load(f)
+        if checkpoint.get("alias") != alias or checkpoint.get("model") != target_model:
+            raise ValueError(f"Checkpoint {checkpoint_path} belongs to another migration; delete it to start over")
+        if checkpoint["source"] != resolve(alias):
+            raise ValueError(f"'{alias}' was swapped since the checkpoint was written; delete it to start over")
+        print(f"⏭️  Resuming migration into {checkpoint['target']} at chunk {checkpoint['offset']}")
+    else:
+        source = client.get_collection(name=resolve(alias))
+        if collection_model_name(source) == target_model:
+            raise ValueError(f"'{alias}' is already embedded with {target_model}")
+        checkpoint = {"alias": alias, "model": target_model, "source": source.name,
+                      "target": create_shadow(alias, {"embedding_model": target_model}), "offset": 0}
+        _save_checkpoint(checkpoint_path, checkpoint)
+        print(f"🔨 Re-embedding {source.name} with {target_model} into {checkpoint['target']}")
+
+    source = client.get_collection(name=checkpoint["source"])
+    target = client.get_collection(name=checkpoint["target"])
+    embedding_model = get_embedding_model(target_model)
+    total = source.count()
+    if progress:
+        progress.stage("reembed", total=total)
+
+    started = time.perf_counter()
+    while checkpoint["offset"] < total:
+        batch_started = time.perf_counter()
+        copied = copy_chunks(source, target, embedding_model, offset=checkpoint["offset"], limit=batch_size)
+        if not copied:
+            break
+        checkpoint["offset"] += copied
+        _save_checkpoint(checkpoint_path, checkpoint)
+        if progress:
+            progress.advance(checkpoint["offset"], total, chunks_reembedded=checkpoint["offset"])
+        else:
+            elapsed = time.perf_counter() - started
+            print(f"[{checkpoint['offset']}/{total}] {checkpoint['offset'] / elapsed:.1f} chunks/s")
+        if max_rate:
+            time.sleep(max(0.0, copied / max_rate - (time.perf_counter() - batch_started)))
+
+    # Catch up with uploads and deletes that hit the serving version during the migration
+    if progress:
+        progress.stage("reconcile")
+    reconciled = reconcile(source, target, embedding_model, batch_size)
+
+    if progress:
+        progress.stage("validate")
+    report = validate(alias, checkpoint["target"], min_count_ratio)
+    report.update({"reembedded": checkpoint["offset"], **reconciled, "seconds": time.perf_counter() - started})
+    report["swapped"] = bool(report["ok"] and swap)
+    if report["swapped"]:
+        report["alias"] = promote(alias, checkpoint["target"])
+        print(f"✅ '{alias}' now served by {checkpoint['target']} ({target_model})")
+    elif not report["ok"]:
+        print(f"⚠️  {checkpoint['target']} failed validation: {report['checks']}")
+    if report["ok"]:
+        os.remove(checkpoint_path)
+    return report
+
+
+def main():
+    """Migrate a collection to another embedding model in the background"""
+    import argparse
+    from dotenv import load_dotenv
+
+    load_dotenv()
+
+    parser = argparse.ArgumentParser(
+        description="Re-embed a collection's stored chunks with a new model into a new version, then swap it in."
+    )
+    parser.add_argument("-m", "--model", required=True, help="Sentence-transformers model to migrate to")
+    parser.add_argument("-a", "--alias", default="manuals", help="Collection to migrate (default: manuals)")
+    parser.add_argument("-b", "--batch-size", type=int, help=f"Chunks per batch (default: {settings.REEMBED_BATCH_SIZE})")
+    parser.add_argument("-r", "--max-rate", type=float,
+                        help=f"Most chunks per second, 0 for unthrottled (default: {settings.REEMBED_MAX_RATE})")
+    parser.add_argument("--checkpoint", help="Checkpoint file (default: <CHROMA_PATH>/reembed-<alias>.checkpoint.json)")
+    parser.add_argument("--no-swap", action="store_true", help="Build and validate only; swap later with collectionAlias.py")
+    parser.add_argument("--min-count-ratio", type=float, default=0.9,
+                        help="Fewest chunks the new version may have, relative to the serving one")
+    args = parser.parse_args()
+
+    try:
+        report = migrate(args.alias, args.model, args.batch_size, args.max_rate, args.checkpoint,
+                         not args.no_swap, args.min_count_ratio)
+        print(f"📈 {report['reembedded']} chunks re-embedded in {report['seconds']:.1f}s "
+              f"(+{report['reconciled_added']} / -{report['reconciled_removed']} reconciled)")
+        if not report["ok"]:
+            sys.exit(1)
+    except KeyboardInterrupt:
+        print("\n👋 Migration paused (rerun the same command to resume)")
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
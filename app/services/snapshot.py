@@ -0,0 +1,247 @@
+import gzip
+import hashlib
+import json
+import os
+import shutil
+import sys
+from datetime import datetime
+from time import perf_counter
+from typing import Dict, Optional
+
+import numpy as np
+
+# Add the project root to Python path so app.config resolves from scripts too
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from app.config import settings
+from collectionAlias import new_version_name, promote, resolve
+from vectorIndex import create_collection
+
+SNAPSHOT_FORMAT = "wisebot-snapshot"
+SNAPSHOT_VERSION = 1
+EMBEDDINGS_FILE = "embeddings.npy"
+RECORDS_FILE = "records.jsonl.gz"
+MANIFEST_FILE = "manifest.json"
+# Rows read from Chroma per get() call while exporting
+EXPORT_PAGE_SIZE = 5000
+HASH_CHUNK_SIZE = 1 << 20
+
+
+def _sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _client():
+    import chromadb  # lazy import
+
+    return chromadb.PersistentClient(path=settings.CHROMA_PATH)
+
+
+def export_collection(collection_name: str, out_dir: str) -> Dict:
+    """
+    Write a collection to a snapshot directory: embeddings.npy (float32, one row per record),
+    records.jsonl.gz (id, document and metadata per line, in the same order) and manifest.json
+    (counts, embedding backend, index configuration and a sha256 per file).
+    The snapshot is assembled next to out_dir and renamed into place when complete.
+    """
+    collection = _client().get_collection(name=resolve(collection_name))
+    count = collection.count()
+    if not count:
+        raise ValueError(f"Collection '{collection_name}' is empty")
+
+    temp_dir = f"{out_dir.rstrip(os.sep)}.partial"
+    shutil.rmtree(temp_dir, ignore_errors=True)
+    os.makedirs(temp_dir)
+    started = perf_counter()
+    embeddings = None
+    written = 0
+    with gzip.open(os.path.join(temp_dir, RECORDS_FILE), "wt", encoding="utf-8") as records:
+        while written < count:
+            page = collection.get(limit=EXPORT_PAGE_SIZE, offset=written,
+                                  include=["embeddings", "documents", "metadatas"])
+            if not page["ids"]:
+                break
+            vectors = np.asarray(page["embeddings"], dtype=np.float32)
+            if embeddings is None:
+                # Preallocated on disk, so exporting never holds all vectors in memory
+                embeddings = np.lib.format.open_memmap(
+                    os.path.join(temp_dir, EMBEDDINGS_FILE), mode="w+", dtype=np.float32,
+                    shape=(count, vectors.shape[1]),
+                )
+            if written + len(page["ids"]) > count:
+                raise RuntimeError(f"Collection '{collection_name}' changed during export; retry")
+            embeddings[written:written + len(page["ids"])] = vectors
+            for record_id, document, metadata in zip(page["ids"], page["documents"], page["metadatas"]):
+                records.write(json.dumps({"id": record_id, "document": document, "metadata": metadata}) + "\n")
+            written += len(page["ids"])
+            print(f"📤 Exported {written}/{count} records")
+    if written != count:
+        raise RuntimeError(f"Collection '{collection_name}' changed during export; retry")
+    embeddings.flush()
+    dimensions = embeddings.shape[1]
+    del embeddings
+
+    manifest = {
+        "format": SNAPSHOT_FORMAT,
+        "version": SNAPSHOT_VERSION,
+        "collection": collection_name,
+        "created_at": datetime.now().isoformat(),
+        "count": count,
+        "dimensions": dimensions,
+        "dtype": "float32",
+        "embedding_backend": settings.EMBEDDING_BACKEND,
+        "collection_metadata": collection.metadata,
+        "hnsw": (getattr(collection, "configuration_json", None) or {}).get("hnsw"),
+        "files": {
+            name: {"sha256": _sha256(os.path.join(temp_dir, name)), "bytes": os.path.getsize(os.path.join(temp_dir, name))}
+            for name in (EMBEDDINGS_FILE, RECORDS_FILE)
+        },
+    }
+    with open(os.path.join(temp_dir, MANIFEST_FILE), "w") as f:
+        json.dump(manifest, f, indent=2)
+
+    shutil.rmtree(out_dir, ignore_errors=True)
+    os.replace(temp_dir, out_dir)
+    manifest["seconds"] = perf_counter() - started
+    return manifest
+
+
+def read_manifest(snapshot_dir: str, verify: bool = True) -> Dict:
+    """Load a snapshot's manifest, checking the format and (with verify) every file's checksum"""
+    with open(os.path.join(snapshot_dir, MANIFEST_FILE)) as f:
+        manifest = json.load(f)
+    if manifest.get("format") != SNAPSHOT_FORMAT or manifest.get("version") != SNAPSHOT_VERSION:
+        raise ValueError(f"{snapshot_dir} is not a version {SNAPSHOT_VERSION} {SNAPSHOT_FORMAT}")
+    if verify:
+        for name, expected in manifest["files"].items():
+            path = os.path.join(snapshot_dir, name)
+            if not os.path.exists(path):
+                raise ValueError(f"Snapshot file missing: {name}")
+            if os.path.getsize(path) != expected["bytes"] or _sha256(path) != expected["sha256"]:
+                raise ValueError(f"Checksum mismatch for {name}; the snapshot is corrupt or incomplete")
+    return manifest
+
+
+def import_snapshot(snapshot_dir: str, collection_name: Optional[str] = None, replace: bool = False,
+                    verify: bool = True, force: bool = False) -> Dict:
+    """
+    Bulk-load a snapshot into a collection without re-embedding anything.
+
+    Records are loaded into a new version of the target (see collectionAlias) that is swapped
+    in only once complete, so a node never serves a half-imported knowledge base and running
+    servers switch to it through the alias registry; the replaced collection stays for rollback.
+    An existing non-empty target is kept unless replace is set. Snapshots embedded with another
+    model than this node's are refused unless force is set, since queries would be embedded
+    into another vector space.
+    """
+    from embeddings import model_identity
+
+    manifest = read_manifest(snapshot_dir, verify)
+    collection_name = collection_name or manifest["collection"]
+    snapshot_model = (manifest.get("collection_metadata") or {}).get("embedding_model") \
+        or model_identity(manifest["embedding_backend"])
+    if snapshot_model != model_identity() and not force:
+        raise ValueError(f"Snapshot was embedded with '{snapshot_model}' but this node embeds with '{model_identity()}'")
+
+    client = _client()
+    existing = {collection.name for collection in client.list_collections()}
+    serving = resolve(collection_name)
+    if serving in existing and client.get_collection(name=serving).count() and not replace:
+        raise ValueError(f"Collection '{collection_name}' already has data (use replace to overwrite it)")
+
+    staging_name = new_version_name(collection_name)
+    # Keep the exported index settings: the vectors were tuned (and normalized) for that space
+    if manifest.get("hnsw"):
+        staging = client.create_collection(name=staging_name, metadata=manifest.get("collection_metadata") or None,
+                                           configuration={"hnsw": manifest["hnsw"]})
+    else:
+        staging = create_collection(client, staging_name, collection_name, manifest.get("collection_metadata"))
+
+    started = perf_counter()
+    embeddings = np.load(os.path.join(snapshot_dir, EMBEDDINGS_FILE), mmap_mode="r")
+    batch_size = client.get_max_batch_size()
+    loaded = 0
+    batch = []
+    try:
+        with gzip.open(os.path.join(snapshot_dir, RECORDS_FILE), "rt", encoding="utf-8") as records:
+            for line in records:
+                batch.append(json.loads(line))
+                if len(batch) == batch_size:
+                    loaded = _add_batch(staging, batch, embeddings, loaded, manifest["count"])
+                    batch = []
+            if batch:
+                loaded = _add_batch(staging, batch, embeddings, loaded, manifest["count"])
+        if loaded != manifest["count"]:
+            raise ValueError(f"Snapshot has {loaded} records but its manifest lists {manifest['count']}")
+    except Exception:
+        client.delete_collection(name=staging_name)
+        raise
+
+    promote(collection_name, staging_name)
+    return {"collection": collection_name, "records": loaded, "seconds": perf_counter() - started}
+
+
+def _add_batch(collection, batch: list, embeddings: np.ndarray, offset: int, total: int) -> int:
+    end = offset + len(batch)
+    collection.add(
+        ids=[record["id"] for record in batch],
+        documents=[record["document"] for record in batch],
+        metadatas=[record["metadata"] for record in batch],
+        embeddings=np.asarray(embeddings[offset:end]),
+    )
+    print(f"📥 Imported {end}/{total} records")
+    return end
+
+
+def bootstrap(snapshot_dir: str, collection_name: str = "manuals") -> bool:
+    """Import the snapshot when the collection is missing or empty (a fresh node); True if imported"""
+    client = _client()
+    if resolve(collection_name) in {collection.name for collection in client.list_collections()}:
+        if client.get_collection(name=resolve(collection_name)).count():
+            return False
+    result = import_snapshot(snapshot_dir, collection_name, replace=True)
+    print(f"✅ Bootstrapped '{collection_name}' with {result['records']} records in {result['seconds']:.1f}s")
+    return True
+
+
+def main():
+    """Export a collection to a snapshot, or import one"""
+    import argparse
+    from dotenv import load_dotenv
+
+    load_dotenv()
+
+    parser = argparse.ArgumentParser(description="Export or import knowledge-base snapshots (no re-embedding).")
+    commands = parser.add_subparsers(dest="command", required=True)
+    export_parser = commands.add_parser("export", help="Write a collection to a snapshot directory")
+    export_parser.add_argument("-c", "--collection", default="manuals", help="Collection to export (default: manuals)")
+    export_parser.add_argument("-o", "--out", required=True, help="Snapshot directory to create")
+    import_parser = commands.add_parser("import", help="Load a snapshot directory into ChromaDB")
+    import_parser.add_argument("-i", "--input", required=True, help="Snapshot directory")
+    import_parser.add_argument("-c", "--collection", help="Target collection (default: the exported one)")
+    import_parser.add_argument("--replace", action="store_true", help="Overwrite a collection that already has data")
+    import_parser.add_argument("--no-verify", action="store_true", help="Skip checksum verification")
+    import_parser.add_argument("--force", action="store_true",
+                               help="Import even if the snapshot was embedded with another model")
+    args = parser.parse_args()
+
+    try:
+        if args.command == "export":
+            manifest = export_collection(args.collection, args.out)
+            size = sum(entry["bytes"] for entry in manifest["files"].values())
+            print(f"✅ Exported {manifest['count']} records ({manifest['dimensions']} dims, {size / 2**20:.1f} MB) "
+                  f"to {args.out} in {manifest['seconds']:.1f}s")
+        else:
+            result = import_snapshot(args.input, args.collection, args.replace, not args.no_verify, args.force)
+            print(f"✅ Imported {result['records']} records into '{result['collection']}' in {result['seconds']:.1f}s")
+    except (ValueError, RuntimeError) as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,15 +2,17 @@ from langchain.text_splitter import RecursiveCharacterTextSplitter
 from langchain.schema import Document
 
 # Suppose you already cleaned text from PDF/Word
-def split_text_to_chunks(cleaned_text: str) -> list[Document]:
-    # Wrap into a LangChain Document
-    docs = [Document(page_content=cleaned_text, metadata={"source": "knowledge_base"})]
+def split_text_to_chunks(cleaned_text: str, chunk_size: int = 500, chunk_overlap: int = 50,
+                         metadata: dict = None) -> list[Document]:
+    # Wrap into a LangChain Document (every chunk inherits the metadata)
+    docs = [Document(page_content=cleaned_text, metadata=metadata or {"source": "knowledge_base"})]
 
-    # Split into chunks
+    # Split into chunks; start_index records where each chunk begins in cleaned_text
     splitter = RecursiveCharacterTextSplitter(
-        chunk_size=500,
-        chunk_overlap=50,
-        separators=["\n", ".", "?", "!"]  # smart splitting
+        chunk_size=chunk_size,
+        chunk_overlap=chunk_overlap,
+        separators=["\n", ".", "?", "!"],  # smart splitting
+        add_start_index=True
     )
     chunks = splitter.split_documents(docs)
     # print(f"Total chunks: {len(chunks)}")
@@ -0,0 +1,115 @@
+import threading
+import traceback
+from contextlib import contextmanager
+from datetime import datetime
+from time import perf_counter
+from typing import Any, Callable, Dict, List, Optional
+
+from metrics import REGISTRY, Gauge
+
+STARTUP_PHASE_SECONDS = REGISTRY.register(Gauge(
+    "wisebot_startup_phase_seconds",
+    "Duration of each startup / warm-up phase",
+    ("phase",),
+))
+
+
+class StartupReport:
+    """Tracks warm-up progress and how long each startup phase took"""
+
+    def __init__(self):
+        self.status = "starting"
+        self.error: Optional[str] = None
+        self.started_at = datetime.now().isoformat()
+        self.ready_at: Optional[str] = None
+        self.phases: List[Dict[str, Any]] = []
+        self.ready = threading.Event()
+
+    @contextmanager
+    def phase(self, name: str):
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, perf_counter() - start)
+
+    def record(self, name: str, seconds: float):
+        self.phases.append({"phase": name, "seconds": round(seconds, 3)})
+        STARTUP_PHASE_SECONDS.set(seconds, phase=name)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "status": self.status,
+            "error": self.error,
+            "started_at": self.started_at,
+            "ready_at": self.ready_at,
+            "total_seconds": round(sum(phase["seconds"] for phase in self.phases), 3),
+            "phases": self.phases,
+        }
+
+    def print_summary(self):
+        print("⏱️  Startup breakdown:")
+        for phase in self.phases:
+            print(f"   {phase['phase']:<22} {phase['seconds']:8.3f}s")
+        print(f"   {'total':<22} {sum(phase['seconds'] for phase in self.phases):8.3f}s")
+
+
+report = StartupReport()
+
+
+def record_app_import(started_at: float):
+    """Record how long importing the app's modules took, given a perf_counter() taken first thing"""
+    report.record("import_app", perf_counter() - started_at)
+
+
+def warm_up(build_chatbot: Callable[[], Any]):
+    """
+    Load everything the first question needs: heavy libraries, the embedding model and
+    tokenizer (with one real embedding), the vectorstore and the LLM client.
+    Runs on a background thread started from the app lifespan.
+    """
+    report.status = "warming"
+    try:
+        from embeddings import configure_model_cache, get_embedding_model
+
+        configure_model_cache()
+        with report.phase("import_chromadb"):
+            import chromadb  # noqa: F401
+        with report.phase("import_langchain"):
+            import langchain.memory  # noqa: F401
+            import langchain.schema  # noqa: F401
+        with report.phase("load_embedding_model"):
+            embedding_model = get_embedding_model()
+        with report.phase("first_embedding"):
+            embedding_model.embed_query("warm up")
+        from app.config import settings
+
+        if settings.SNAPSHOT_BOOTSTRAP:
+            import snapshot
+
+            with report.phase("snapshot_import"):
+                snapshot.bootstrap(settings.SNAPSHOT_BOOTSTRAP)
+        with report.phase("build_chatbot"):
+            bot = build_chatbot()
+        if bot is None:
+            raise RuntimeError("Chatbot could not be initialized")
+        with report.phase("first_vector_query"):
+            bot.collection.query(query_embeddings=[bot.embedding_model.embed_query("warm up")], n_results=1)
+
+        report.status = "ready"
+        report.ready_at = datetime.now().isoformat()
+        print("✅ Warm-up complete")
+    except Exception as e:
+        report.status = "failed"
+        report.error = str(e)
+        print(f"❌ Warm-up failed: {e}")
+        traceback.print_exc()
+    finally:
+        report.print_summary()
+        report.ready.set()
+
+
+def start_warm_up(build_chatbot: Callable[[], Any]) -> threading.Thread:
+    thread = threading.Thread(target=warm_up, args=(build_chatbot,), name="warm-up", daemon=True)
+    thread.start()
+    return thread
@@ -0,0 +1,37 @@
+import re
+import time
+from typing import Iterator, List
+
+from langchain_core.messages import AIMessage, AIMessageChunk
+
+
+class StubChatModel:
+    """
+    Local stand-in for ChatGroq used by load tests.
+
+    Waits `latency_ms` before the first token, then emits `answer_tokens` tokens at
+    `tokens_per_sec`. The answer is built from words in the prompt's context section,
+    so responses look plausible without any network call.
+    """
+
+    def __init__(self, latency_ms: float = 300, tokens_per_sec: float = 80, answer_tokens: int = 60):
+        self.latency = latency_ms / 1000
+        self.token_interval = 1 / tokens_per_sec if tokens_per_sec > 0 else 0.0
+        self.answer_tokens = answer_tokens
+
+    def _tokens(self, messages: List) -> List[str]:
+        prompt = messages[-1].content if messages else ""
+        match = re.search(r"Context from knowledge base:(.*?)Previous conversation history:", prompt, re.S)
+        words = (match.group(1) if match else prompt).split() or ["I", "don't", "know."]
+        return [words[i % len(words)] for i in range(self.answer_tokens)]
+
+    def stream(self, messages: List) -> Iterator[AIMessageChunk]:
+        tokens = self._tokens(messages)
+        time.sleep(self.latency)
+        for i, token in enumerate(tokens):
+            if i:
+                time.sleep(self.token_interval)
+            yield AIMessageChunk(content=token if i == 0 else f" {token}")
+
+    def invoke(self, messages: List) -> AIMessage:
+        return AIMessage(content="".join(chunk.content for chunk in self.stream(messages)))
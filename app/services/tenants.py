@@ -0,0 +1,158 @@
+import json
+import os
+import re
+import sys
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Dict, Optional, Tuple
+
+# Add the project root to Python path so app.config resolves from scripts too
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from app.config import settings
+from collectionAlias import resolve
+
+# Tenant ids become part of collection names, so they are kept to Chroma-safe characters
+# (and never contain "__", which separates an alias from its versions)
+TENANT_PATTERN = re.compile(r"^[a-z0-9](?:[a-z0-9-]{0,61}[a-z0-9])?$")
+
+
+class QuotaExceeded(Exception):
+    """A tenant is over one of its quotas (see TENANT_QUOTAS)"""
+
+
+def tenant_collection(tenant: Optional[str], base: str = "manuals") -> str:
+    """The collection holding a tenant's chunks; without a tenant, the shared base collection"""
+    if not tenant:
+        return base
+    if not TENANT_PATTERN.match(tenant):
+        raise ValueError("tenant must be 1-63 lowercase letters, digits or dashes, starting and ending with a letter or digit")
+    return f"{base}-{tenant}"
+
+
+def quotas(tenant: Optional[str]) -> Dict[str, int]:
+    """A tenant's quotas (0 = unlimited); the shared collection has none"""
+    if not tenant:
+        return {"max_chunks": 0, "max_concurrent_ingestions": 0}
+    limits = {
+        "max_chunks": settings.TENANT_MAX_CHUNKS,
+        "max_concurrent_ingestions": settings.TENANT_MAX_CONCURRENT_INGESTIONS,
+    }
+    overrides = json.loads(settings.TENANT_QUOTAS or "{}").get(tenant, {})
+    unknown = set(overrides) - set(limits)
+    if unknown:
+        raise ValueError(f"Unknown quota for tenant '{tenant}': {', '.join(sorted(unknown))}")
+    limits.update(overrides)
+    return limits
+
+
+class IngestionSlots:
+    """Caps how many ingestions each tenant runs at once, so one tenant's bulk upload can't hog the workers"""
+
+    def __init__(self):
+        self._active: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, tenant: Optional[str]):
+        """Take a slot or raise QuotaExceeded; pair with release()"""
+        limit = quotas(tenant)["max_concurrent_ingestions"]
+        key = tenant or ""
+        with self._lock:
+            if limit and self._active.get(key, 0) >= limit:
+                raise QuotaExceeded(f"Tenant '{tenant}' already has {limit} ingestions running; retry when one finishes")
+            self._active[key] = self._active.get(key, 0) + 1
+
+    def release(self, tenant: Optional[str]):
+        key = tenant or ""
+        with self._lock:
+            self._active[key] = max(0, self._active.get(key, 0) - 1)
+
+    @contextmanager
+    def slot(self, tenant: Optional[str]):
+        self.acquire(tenant)
+        try:
+            yield
+        finally:
+            self.release(tenant)
+
+    def active(self) -> Dict[str, int]:
+        with self._lock:
+            return {key: count for key, count in self._active.items() if count}
+
+
+class CollectionCache:
+    """
+    LRU of open collection handles, each with the embedding model its vectors come from, keyed
+    by alias. Aliases are re-resolved on every lookup, so a blue/green swap or model migration
+    replaces the cached handle without a restart; the least recently used tenants fall out once
+    more than capacity are open.
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = max(1, capacity)
+        self._entries: "OrderedDict[str, Tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._client = None
+
+    @property
+    def client(self):
+        if self._client is None:
+            import chromadb  # lazy import
+
+            self._client = chromadb.PersistentClient(path=settings.CHROMA_PATH)
+        return self._client
+
+    def get(self, alias: str, create: bool = False, embedding_model=None) -> Tuple:
+        """
+        (collection, embedding model) serving alias; a missing collection is created with create,
+        else returned as (None, None). With embedding_model (a caller's override) the collection's
+        own model is not loaded; it is otherwise loaded on the first lookup that needs it.
+        """
+        import vectorIndex  # lazy import
+        from embeddings import get_collection_embedding_model
+
+        name = resolve(alias)
+        with self._lock:
+            entry = self._entries.get(alias)
+            current = entry if entry and entry[0].name == name else None
+            if current:
+                self._entries.move_to_end(alias)
+        if current is None:
+            if create:
+                collection = vectorIndex.get_or_create_collection(self.client, name, alias)
+            else:
+                try:
+                    collection = vectorIndex.get_collection(self.client, name, alias)
+                except Exception:
+                    return None, None  # nothing ingested for this tenant yet
+            if entry:
+                print(f"🔀 Now serving {name} for '{alias}'")
+            current = (collection, None)
+            self._store(alias, current)
+        if embedding_model is not None:
+            return current[0], embedding_model
+        if current[1] is None:
+            current = (current[0], get_collection_embedding_model(current[0]))
+            self._store(alias, current)
+        return current
+
+    def _store(self, alias: str, entry: Tuple):
+        with self._lock:
+            self._entries[alias] = entry
+            self._entries.move_to_end(alias)
+            while len(self._entries) > self.capacity:
+                self._entries.popitem(last=False)
+
+    def evict(self, alias: str):
+        """Drop a cached handle, e.g. after its collection was deleted and recreated"""
+        with self._lock:
+            self._entries.pop(alias, None)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {"capacity": self.capacity, "open": list(self._entries)}
+
+
+collection_cache = CollectionCache(settings.COLLECTION_CACHE_SIZE)
+ingestion_slots = IngestionSlots()
@@ -0,0 +1,179 @@
+import json
+import os
+import sqlite3
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, List, Optional
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    filename TEXT PRIMARY KEY,
+    hash TEXT NOT NULL,
+    ext TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    uploaded_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_files_hash ON files (hash);
+CREATE INDEX IF NOT EXISTS idx_files_uploaded_at ON files (uploaded_at);
+CREATE INDEX IF NOT EXISTS idx_files_size ON files (size);
+CREATE INDEX IF NOT EXISTS idx_files_filename_nocase ON files (filename COLLATE NOCASE);
+
+CREATE TABLE IF NOT EXISTS ingestions (
+    hash TEXT NOT NULL,
+    collection TEXT NOT NULL,
+    status TEXT NOT NULL,
+    pages INTEGER,
+    chunks INTEGER,
+    text_length INTEGER,
+    timings TEXT,
+    error TEXT,
+    started_at TEXT,
+    completed_at TEXT,
+    PRIMARY KEY (hash, collection)
+);
+CREATE INDEX IF NOT EXISTS idx_ingestions_collection_status ON ingestions (collection, status);
+CREATE INDEX IF NOT EXISTS idx_ingestions_status ON ingestions (status);
+"""
+
+# Sortable fields exposed by /upload/list, mapped to their (indexed where it matters) columns
+SORT_COLUMNS = {
+    "filename": "f.filename COLLATE NOCASE",
+    "size": "f.size",
+    "uploaded_at": "f.uploaded_at",
+    "status": "i.status",
+    "pages": "i.pages",
+    "chunks": "i.chunks",
+    "completed_at": "i.completed_at",
+}
+# Listing filter for files that were stored but never ingested
+UPLOADED_ONLY = "uploaded"
+
+
+class UploadCatalog:
+    """SQLite catalog of uploaded files (name → content hash) and their ingestion per collection"""
+
+    def __init__(self, path: str):
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        # One short-lived connection per call keeps it safe across threads and worker processes
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def is_empty(self) -> bool:
+        with self._connect() as conn:
+            return conn.execute("SELECT 1 FROM files LIMIT 1").fetchone() is None
+
+    def record_upload(self, filename: str, file_hash: str, ext: str, size: int, uploaded_at: str = None):
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO files (filename, hash, ext, size, uploaded_at) VALUES (?, ?, ?, ?, ?)",
+                (filename, file_hash, ext, size, uploaded_at or datetime.now().isoformat()),
+            )
+
+    def start_ingestion(self, file_hash: str, collection_name: str):
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO ingestions (hash, collection, status, started_at) VALUES (?, ?, 'processing', ?)",
+                (file_hash, collection_name, datetime.now().isoformat()),
+            )
+
+    def finish_ingestion(self, file_hash: str, collection_name: str, status: str, pages: int = None,
+                         chunks: int = None, text_length: int = None, timings: Dict = None, error: str = None):
+        """Record the outcome: completed, empty or error"""
+        with self._connect() as conn:
+            conn.execute(
+                """
+                INSERT INTO ingestions (hash, collection, status, pages, chunks, text_length, timings, error, started_at, completed_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (hash, collection) DO UPDATE SET
+                    status = excluded.status, pages = excluded.pages, chunks = excluded.chunks,
+                    text_length = excluded.text_length, timings = excluded.timings, error = excluded.error,
+                    completed_at = excluded.completed_at
+                """,
+                (file_hash, collection_name, status, pages, chunks, text_length,
+                 json.dumps(timings) if timings is not None else None, error,
+                 datetime.now().isoformat(), datetime.now().isoformat()),
+            )
+
+    def delete_ingestion(self, file_hash: str, collection_name: str):
+        """Forget an ingestion whose chunks were deleted or replaced, so the content can be ingested again"""
+        with self._connect() as conn:
+            conn.execute("DELETE FROM ingestions WHERE hash = ? AND collection = ?", (file_hash, collection_name))
+
+    def ingestion(self, file_hash: str, collection_name: str) -> Optional[Dict]:
+        """The completed ingestion of this content into the collection, or None"""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT * FROM ingestions WHERE hash = ? AND collection = ? AND status = 'completed'",
+                (file_hash, collection_name),
+            ).fetchone()
+        return self._row(row) if row else None
+
+    def list_files(self, page: int = 1, page_size: int = 50, status: str = None, collection: str = None,
+                   search: str = None, sort: str = "uploaded_at", order: str = "desc") -> Dict:
+        """
+        One row per file and collection it was ingested into (files never ingested have no
+        collection). status="uploaded" selects files without any ingestion; search matches a
+        filename prefix, case-insensitively.
+        """
+        if sort not in SORT_COLUMNS:
+            raise ValueError(f"Unknown sort field: {sort} (expected one of {', '.join(SORT_COLUMNS)})")
+        if order.lower() not in ("asc", "desc"):
+            raise ValueError("order must be asc or desc")
+
+        join = "LEFT JOIN ingestions i ON i.hash = f.hash"
+        params: List = []
+        if collection:
+            join += " AND i.collection = ?"
+            params.append(collection)
+        where = []
+        if status == UPLOADED_ONLY:
+            where.append("i.status IS NULL")
+        elif status:
+            where.append("i.status = ?")
+            params.append(status)
+        elif collection:
+            where.append("i.collection IS NOT NULL")
+        if search:
+            where.append("f.filename LIKE ? ESCAPE '\\'")
+            params.append(search.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%")
+        where_sql = f"WHERE {' AND '.join(where)}" if where else ""
+
+        with self._connect() as conn:
+            total = conn.execute(f"SELECT COUNT(*) FROM files f {join} {where_sql}", params).fetchone()[0]
+            rows = conn.execute(
+                f"""
+                SELECT f.filename, f.hash, f.ext, f.size, f.uploaded_at, i.collection, i.status, i.pages,
+                       i.chunks, i.text_length, i.timings, i.error, i.started_at, i.completed_at
+                FROM files f {join} {where_sql}
+                ORDER BY {SORT_COLUMNS[sort]} {order.upper()}, f.filename
+                LIMIT ? OFFSET ?
+                """,
+                params + [page_size, (page - 1) * page_size],
+            ).fetchall()
+        return {
+            "files": [self._row(row) for row in rows],
+            "total": total,
+            "page": page,
+            "page_size": page_size,
+        }
+
+    @staticmethod
+    def _row(row: sqlite3.Row) -> Dict:
+        item = dict(row)
+        if item.get("timings"):
+            item["timings"] = json.loads(item["timings"])
+        if "status" in item and item["status"] is None:
+            item["status"] = UPLOADED_ONLY
+        return item
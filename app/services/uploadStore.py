@@ -0,0 +1,108 @@
+import hashlib
+import os
+import sys
+import tempfile
+import threading
+from datetime import datetime
+from typing import BinaryIO, Dict, Optional
+
+# Add the project root to Python path so app.config resolves from scripts too
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from app.config import settings
+from uploadCatalog import UploadCatalog
+
+HASH_CHUNK_SIZE = 1 << 20
+
+
+def _hash_file(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class UploadStore:
+    """
+    Content-addressed upload storage.
+
+    Files live at <root>/objects/<hash[:2]>/<hash><ext>, so identical content is stored once no
+    matter how often or under which name it is uploaded. The SQLite catalog (uploadCatalog) maps
+    each uploaded name to its hash and records each hash's ingestion into every collection.
+    """
+
+    def __init__(self, root: str = None):
+        self.root = root or settings.UPLOAD_DIR
+        self._catalog: Optional[UploadCatalog] = None
+        self._lock = threading.Lock()
+
+    @property
+    def catalog(self) -> UploadCatalog:
+        """Open the catalog on first use, bringing in uploads saved flat by older versions"""
+        if self._catalog is None:
+            with self._lock:
+                if self._catalog is None:
+                    catalog = UploadCatalog(os.path.join(self.root, "catalog.sqlite3"))
+                    if catalog.is_empty():
+                        self._adopt_legacy_files(catalog)
+                    self._catalog = catalog
+        return self._catalog
+
+    def _adopt_legacy_files(self, catalog: UploadCatalog):
+        """Move files saved flat as <root>/<filename> into the store and catalog them"""
+        adopted = 0
+        for filename in sorted(os.listdir(self.root)):
+            legacy_path = os.path.join(self.root, filename)
+            if filename.startswith((".", "catalog.")) or not os.path.isfile(legacy_path):
+                continue
+            file_hash = _hash_file(legacy_path)
+            ext = os.path.splitext(filename)[1].lower()
+            path = self.object_path(file_hash, ext)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            os.replace(legacy_path, path)
+            catalog.record_upload(filename, file_hash, ext, os.path.getsize(path),
+                                  datetime.fromtimestamp(os.path.getmtime(path)).isoformat())
+            adopted += 1
+        if adopted:
+            print(f"📦 Moved {adopted} existing uploads into the content-addressed store")
+
+    def object_path(self, file_hash: str, ext: str) -> str:
+        return os.path.join(self.root, "objects", file_hash[:2], f"{file_hash}{ext}")
+
+    def save(self, fileobj: BinaryIO, filename: str) -> Dict:
+        """Stream an upload into the store, hashing as it is written"""
+        ext = os.path.splitext(filename)[1].lower()
+        os.makedirs(self.root, exist_ok=True)
+        catalog = self.catalog
+        digest = hashlib.sha256()
+        size = 0
+        with tempfile.NamedTemporaryFile(dir=self.root, prefix=".upload-", delete=False) as temp:
+            while True:
+                block = fileobj.read(HASH_CHUNK_SIZE)
+                if not block:
+                    break
+                digest.update(block)
+                temp.write(block)
+                size += len(block)
+        file_hash = digest.hexdigest()
+
+        path = self.object_path(file_hash, ext)
+        existed = os.path.exists(path)
+        if existed:
+            os.remove(temp.name)
+        else:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            os.replace(temp.name, path)
+
+        uploaded_at = datetime.now().isoformat()
+        catalog.record_upload(filename, file_hash, ext, size, uploaded_at)
+        return {"filename": filename, "path": path, "duplicate": existed, "hash": file_hash,
+                "ext": ext, "size": size, "uploaded_at": uploaded_at}
+
+    def ingestion(self, file_hash: str, collection_name: str) -> Optional[Dict]:
+        """How this content was ingested into the collection, or None if it was not"""
+        return self.catalog.ingestion(file_hash, collection_name)
+
+
+upload_store = UploadStore()
@@ -0,0 +1,223 @@
+import json
+import os
+import sqlite3
+import struct
+import sys
+import time
+from typing import Dict, Optional
+
+# Add the project root to Python path so app.config resolves from scripts too
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from app.config import settings
+from collectionAlias import create_shadow, promote, resolve, validate
+
+# Setting names (also the HNSW_COLLECTION_SETTINGS keys) -> Chroma's HNSW configuration keys
+HNSW_SETTINGS = {"space": "space", "M": "max_neighbors", "construction_ef": "ef_construction", "search_ef": "ef_search"}
+# Fixed when an index is built; changing them takes a compaction
+STRUCTURAL = ("space", "max_neighbors", "ef_construction")
+# hnswlib's persisted header.bin, after Chroma's 4-byte format version
+HEADER_FORMAT = "<iQQQQQQiIQQQdQ"
+# Share of index slots still held by deleted chunks at which a compaction is recommended
+COMPACT_FRAGMENTATION = 0.2
+# Chunks copied per get()/upsert() while compacting
+COPY_PAGE_SIZE = 1000
+
+
+def _client():
+    import chromadb  # lazy import
+
+    return chromadb.PersistentClient(path=settings.CHROMA_PATH)
+
+
+def hnsw_settings(alias: str) -> Dict:
+    """Configured HNSW parameters for the collections of alias, in Chroma's terms"""
+    hnsw = {
+        "space": settings.HNSW_SPACE,
+        "max_neighbors": settings.HNSW_M,
+        "ef_construction": settings.HNSW_CONSTRUCTION_EF,
+        "ef_search": settings.HNSW_SEARCH_EF,
+    }
+    overrides = json.loads(settings.HNSW_COLLECTION_SETTINGS or "{}").get(alias, {})
+    for key, value in overrides.items():
+        if key not in HNSW_SETTINGS:
+            raise ValueError(f"Unknown HNSW setting for '{alias}': {key} (use {', '.join(HNSW_SETTINGS)})")
+        hnsw[HNSW_SETTINGS[key]] = value
+    return hnsw
+
+
+def apply_search_ef(collection, ef_search: int):
+    """Set a collection's query-time ef, the one HNSW parameter that can change after creation"""
+    hnsw = (getattr(collection, "configuration_json", None) or {}).get("hnsw")
+    if hnsw and hnsw.get("ef_search") != ef_search:
+        collection.modify(configuration={"hnsw": {"ef_search": ef_search}})
+    return collection
+
+
+def create_collection(client, name: str, alias: Optional[str] = None, metadata: Optional[Dict] = None):
+    """Create a collection (or a version of alias) with the configured index settings"""
+    return client.create_collection(name=name, metadata=metadata or None,
+                                    configuration={"hnsw": hnsw_settings(alias or name)})
+
+
+def get_or_create_collection(client, name: str, alias: Optional[str] = None):
+    """
+    Open the collection the app writes to or serves from, creating it with the configured index
+    settings and the current embedding model on first use. An existing collection keeps its
+    index structure but gets the configured search ef.
+    """
+    from embeddings import model_identity
+
+    hnsw = hnsw_settings(alias or name)
+    collection = client.get_or_create_collection(
+        name=name, metadata={"embedding_model": model_identity()}, configuration={"hnsw": hnsw}
+    )
+    return apply_search_ef(collection, hnsw["ef_search"])
+
+
+def get_collection(client, name: str, alias: Optional[str] = None):
+    """Open an existing collection with the configured search ef"""
+    return apply_search_ef(client.get_collection(name=name), hnsw_settings(alias or name)["ef_search"])
+
+
+def _vector_segment_dir(collection) -> Optional[str]:
+    """Directory of the collection's persisted HNSW index (named after its vector segment)"""
+    database = sqlite3.connect(f"file:{os.path.join(settings.CHROMA_PATH, 'chroma.sqlite3')}?mode=ro", uri=True)
+    try:
+        row = database.execute(
+            "SELECT id FROM segments WHERE collection = ? AND scope = 'VECTOR'", (str(collection.id),)
+        ).fetchone()
+    finally:
+        database.close()
+    return os.path.join(settings.CHROMA_PATH, row[0]) if row else None
+
+
+def _read_header(path: str) -> Optional[Dict]:
+    try:
+        with open(path, "rb") as f:
+            raw = f.read(struct.calcsize(HEADER_FORMAT))
+    except FileNotFoundError:
+        return None
+    if len(raw) < struct.calcsize(HEADER_FORMAT):
+        return None
+    fields = struct.unpack(HEADER_FORMAT, raw)
+    return {"capacity": fields[2], "indexed": fields[3], "bytes_per_element": fields[4],
+            "levels": fields[7] + 1, "M": fields[11], "ef_construction": fields[13]}
+
+
+def index_stats(name: str, alias: Optional[str] = None) -> Dict:
+    """
+    Size and health of one collection's vector index: its HNSW parameters against the configured
+    ones, bytes on disk, and how many index slots deleted chunks still hold. The index file is
+    written every few hundred changes, so slot counts lag the most recent writes.
+    """
+    collection = _client().get_collection(name=name)
+    count = collection.count()
+    hnsw = (getattr(collection, "configuration_json", None) or {}).get("hnsw") or {}
+    configured = hnsw_settings(alias or name)
+    stats = {
+        "collection": name,
+        "count": count,
+        "hnsw": hnsw,
+        "configured": configured,
+        "drift": [key for key in STRUCTURAL if hnsw.get(key) != configured[key]],
+        "index_bytes": 0,
+    }
+    segment_dir = _vector_segment_dir(collection)
+    if segment_dir and os.path.isdir(segment_dir):
+        stats["index_bytes"] = sum(entry.stat().st_size for entry in os.scandir(segment_dir) if entry.is_file())
+        header = _read_header(os.path.join(segment_dir, "header.bin"))
+        if header:
+            stats.update({"indexed_elements": header["indexed"], "capacity": header["capacity"],
+                          "graph_levels": header["levels"], "bytes_per_element": header["bytes_per_element"]})
+            stats["deleted_slots"] = max(0, header["indexed"] - count)
+            stats["fragmentation"] = round(stats["deleted_slots"] / header["indexed"], 4) if header["indexed"] else 0.0
+    stats["needs_compaction"] = bool(stats["drift"]) or stats.get("fragmentation", 0.0) >= COMPACT_FRAGMENTATION
+    return stats
+
+
+def alias_stats(alias: str) -> Dict:
+    """Index stats of the version serving alias, plus the size of the whole database"""
+    database_path = os.path.join(settings.CHROMA_PATH, "chroma.sqlite3")
+    return {
+        "alias": alias,
+        "serving": index_stats(resolve(alias), alias),
+        "database_bytes": os.path.getsize(database_path) if os.path.exists(database_path) else 0,
+    }
+
+
+def compact(alias: str, swap: bool = True, min_count_ratio: float = 0.99, progress=None) -> Dict:
+    """
+    Rebuild the serving version's index from its stored vectors (nothing is re-embedded) into a
+    new version created with the configured HNSW settings, then validate it and swap it in.
+    This drops the slots of deleted chunks and applies space / M / construction ef changes.
+    """
+    from reembed import copy_chunks, reconcile
+
+    client = _client()
+    source = client.get_collection(name=resolve(alias))
+    before = index_stats(source.name, alias)
+    shadow = create_shadow(alias)
+    target = client.get_collection(name=shadow)
+    total = source.count()
+    print(f"🧹 Compacting {source.name} into {shadow}")
+    if progress:
+        progress.stage("compact", total=total)
+
+    started = time.perf_counter()
+    copied = 0
+    while copied < total:
+        page = copy_chunks(source, target, offset=copied, limit=COPY_PAGE_SIZE)
+        if not page:
+            break
+        copied += page
+        if progress:
+            progress.advance(copied, total, chunks_copied=copied)
+    if progress:
+        progress.stage("reconcile")
+    reconciled = reconcile(source, target, batch_size=COPY_PAGE_SIZE)
+
+    if progress:
+        progress.stage("validate")
+    report = validate(alias, shadow, min_count_ratio)
+    report.update({"copied": copied, **reconciled, "before": before, "seconds": time.perf_counter() - started})
+    report["swapped"] = bool(report["ok"] and swap)
+    if report["swapped"]:
+        report["alias"] = promote(alias, shadow)
+        print(f"✅ '{alias}' now served by compacted {shadow}")
+    elif not report["ok"]:
+        print(f"⚠️  {shadow} failed validation: {report['checks']}")
+    return report
+
+
+def main():
+    """Report vector index stats, or compact a collection's index"""
+    import argparse
+    from dotenv import load_dotenv
+
+    load_dotenv()
+
+    parser = argparse.ArgumentParser(description="Inspect and compact the HNSW index behind a collection.")
+    parser.add_argument("-a", "--alias", default="manuals", help="Collection (default: manuals)")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("stats", help="Show index parameters, size and fragmentation")
+    compact_parser = commands.add_parser("compact", help="Rebuild the index with the configured settings")
+    compact_parser.add_argument("--no-swap", action="store_true", help="Build and validate only")
+    args = parser.parse_args()
+
+    try:
+        if args.command == "stats":
+            print(json.dumps(alias_stats(args.alias), indent=2))
+        else:
+            report = compact(args.alias, swap=not args.no_swap)
+            print(f"📈 {report['copied']} chunks copied in {report['seconds']:.1f}s "
+                  f"(fragmentation was {report['before'].get('fragmentation', 0.0):.0%})")
+            if not report["ok"]:
+                sys.exit(1)
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,216 @@
+import json
+import math
+import os
+import platform
+import random
+import resource
+import subprocess
+import sys
+from datetime import datetime
+from typing import Dict, List, Optional
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+
+# Make app.* and the services modules importable from benchmark scripts
+sys.path.append(ROOT_DIR)
+sys.path.append(os.path.join(ROOT_DIR, 'app', 'services'))
+
+PRODUCTS = ["TRI gateway", "BG content adapter", "edge router", "media encoder", "license server",
+            "session broker", "archive node", "sync agent"]
+COMPONENTS = ["power supply", "fan module", "network card", "cache volume", "admin console",
+              "status LED", "config file", "backup job", "TLS certificate", "worker pool"]
+ACTIONS = ["reset", "replace", "configure", "monitor", "restart", "upgrade", "calibrate", "disable"]
+SETTINGS = ["timeout", "retry limit", "log level", "batch size", "port", "heartbeat interval"]
+
+
+def percentile(values: List[float], pct: float) -> Optional[float]:
+    """Nearest-rank percentile, None for an empty list"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = min(max(math.ceil(pct / 100 * len(ordered)) - 1, 0), len(ordered) - 1)
+    return ordered[rank]
+
+
+def summarize(values: List[float]) -> Dict:
+    """count/mean/p50/p95/p99/max of a list of samples"""
+    if not values:
+        return {"count": 0}
+    return {
+        "count": len(values),
+        "mean": sum(values) / len(values),
+        "p50": percentile(values, 50),
+        "p95": percentile(values, 95),
+        "p99": percentile(values, 99),
+        "max": max(values),
+    }
+
+
+def rss_bytes(pid: Optional[int] = None) -> Optional[int]:
+    """Current resident set size of a process (Linux /proc, psutil elsewhere)"""
+    pid = pid or os.getpid()
+    try:
+        with open(f"/proc/{pid}/status") as status:
+            for line in status:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    try:
+        import psutil  # optional
+        return psutil.Process(pid).memory_info().rss
+    except Exception:
+        return None
+
+
+def peak_rss_bytes() -> int:
+    """Peak resident set size of this process"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def environment_info() -> Dict:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT_DIR, capture_output=True, text=True
+        ).stdout.strip()
+    except OSError:
+        commit = ""
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "git_commit": commit,
+        "timestamp": datetime.now().isoformat(),
+    }
+
+
+def synthetic_chunks(count: int, seed: int = 42) -> List[str]:
+    """Deterministic manual-like text chunks for a synthetic knowledge base"""
+    rng = random.Random(seed)
+    chunks = []
+    for i in range(count):
+        product, component = rng.choice(PRODUCTS), rng.choice(COMPONENTS)
+        action, setting = rng.choice(ACTIONS), rng.choice(SETTINGS)
+        value = rng.randint(2, 600)
+        chunks.append(
+            f"section {i}. to {action} the {component} on the {product}, open the admin console "
+            f"and select {component} settings. set the {setting} to {value} and apply the change. "
+            f"if the {component} does not respond, {rng.choice(ACTIONS)} the {product} and check "
+            f"the status led. the {setting} default for the {product} is {value // 2}."
+        )
+    return chunks
+
+
+def synthetic_question(kind: str, rng: random.Random) -> str:
+    """A question of the given kind: factoid, follow_up, off_topic or long"""
+    product, component = rng.choice(PRODUCTS), rng.choice(COMPONENTS)
+    if kind == "follow_up":
+        return rng.choice([f"and what about the {component}?", "can you explain that in more detail?",
+                           f"what is the default {rng.choice(SETTINGS)} for it?"])
+    if kind == "off_topic":
+        return rng.choice(["what's the weather like today?", "tell me a joke",
+                           "who won the football match yesterday?"])
+    if kind == "long":
+        return (f"we have a {product} in production and after the last upgrade the {component} keeps "
+                f"failing every few hours. what is the recommended way to {rng.choice(ACTIONS)} it, "
+                f"and which {rng.choice(SETTINGS)} should we change to stop it happening again?")
+    return f"how do I {rng.choice(ACTIONS)} the {component} on the {product}?"
+
+
+def save_results(name: str, data: Dict, output: Optional[str] = None) -> str:
+    """Write benchmark results as JSON (default: benchmarks/results/<name>-<timestamp>.json)"""
+    if not output:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        output = os.path.join(RESULTS_DIR, f"{name}-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json")
+    with open(output, "w") as f:
+        json.dump(data, f, indent=2)
+    return output
+
+
+def compare_results(previous_path: str, current: Dict, keys: List[str]):
+    """Print the change of selected summary values against an earlier results file"""
+    with open(previous_path) as f:
+        previous = json.load(f)
+    print(f"\n📊 Compared with {previous_path}")
+    for key in keys:
+        old, new = _lookup(previous, key), _lookup(current, key)
+        if isinstance(old, (int, float)) and isinstance(new, (int, float)) and old:
+            print(f"   {key}: {old:.4g} → {new:.4g} ({(new - old) / old * 100:+.1f}%)")
+        else:
+            print(f"   {key}: {old} → {new}")
+
+
+def _lookup(data: Dict, dotted_key: str):
+    for part in dotted_key.split("."):
+        if not isinstance(data, dict):
+            return None
+        data = data.get(part)
+    return data
+
+
+def _pdf_escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def synthetic_page_lines(page: int, rng: random.Random, lines: int = 50, width: int = 95) -> List[str]:
+    """Wrapped manual text for one page, with the URLs, emails and bullets cleanText strips"""
+    words = " ".join(synthetic_chunks(6, seed=rng.randint(0, 10**9))).split()
+    for noise in (f"https://docs.example.com/p{page}", f"support{page}@example.com", "-"):
+        words.insert(rng.randrange(len(words)), noise)
+    text, current = [], ""
+    for word in (words * 3):
+        if len(current) + len(word) + 1 > width:
+            text.append(current)
+            current = ""
+            if len(text) == lines:
+                break
+        current = f"{current} {word}".strip()
+    return text
+
+
+def write_synthetic_pdf(path: str, pages: int, seed: int = 42):
+    """Write a text PDF with `pages` pages using only the standard Helvetica font"""
+    rng = random.Random(seed)
+    objects = ["<< /Type /Catalog /Pages 2 0 R >>", None, "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    page_ids = []
+    for page in range(pages):
+        body = "BT /F1 9 Tf 40 760 Td 14 TL " + " ".join(
+            f"({_pdf_escape(line)}) Tj T*" for line in synthetic_page_lines(page, rng)
+        ) + " ET"
+        objects.append(f"<< /Length {len(body)} >>\nstream\n{body}\nendstream")
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {len(objects)} 0 R >>"
+        )
+        page_ids.append(len(objects))
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(f'{i} 0 R' for i in page_ids)}] /Count {pages} >>"
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, obj in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n{obj}\nendobj\n".encode("latin-1")
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    out += "".join(f"{offset:010d} 00000 n \n" for offset in offsets).encode()
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    with open(path, "wb") as f:
+        f.write(out)
+
+
+def write_synthetic_docx(path: str, pages: int, seed: int = 42):
+    """Write a DOCX with `pages` page-break separated sections (needs python-docx)"""
+    from docx import Document
+    from docx.enum.text import WD_BREAK
+
+    rng = random.Random(seed)
+    document = Document()
+    for page in range(pages):
+        lines = synthetic_page_lines(page, rng)
+        for start in range(0, len(lines), 5):
+            document.add_paragraph("• " + " ".join(lines[start:start + 5]))
+        if page < pages - 1:
+            document.add_paragraph().add_run().add_break(WD_BREAK.PAGE)
+    document.save(path)
@@ -0,0 +1,99 @@
+import argparse
+import random
+import sys
+import time
+from typing import Callable, Dict, List
+
+from benchUtils import compare_results, environment_info, save_results, summarize, synthetic_page_lines
+
+# Characters extracted PDFs and DOCX files are full of: smart quotes, bullets, ligatures, NBSP, symbols
+UNICODE_NOISE = ["“", "”", "’", "•", "–", "—", "ﬁ", " ", "©", "™", "½", "é", "📌", "<b>", "</b>"]
+
+
+def synthetic_pages(count: int, seed: int) -> List[str]:
+    """Manual-like page texts with URLs, emails, markup and non-ASCII characters to clean"""
+    rng = random.Random(seed)
+    pages = []
+    for page in range(count):
+        words = "\n".join(synthetic_page_lines(page, rng)).split(" ")
+        for _ in range(len(words) // 20):
+            words.insert(rng.randrange(len(words)), rng.choice(UNICODE_NOISE))
+        pages.append(" ".join(words))
+    return pages
+
+
+def measure(clean: Callable[[List[str]], List[str]], pages: List[str], repeats: int) -> Dict:
+    """Seconds per run of cleaning every page, and the cleaned pages of the last run"""
+    seconds = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        output = clean(pages)
+        seconds.append(time.perf_counter() - started)
+    return {"seconds": summarize(seconds), "output": output}
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compare the batch text cleaner (cleanText.clean_pages) with the original clean_text: "
+                    "throughput per worker count, and identical output."
+    )
+    parser.add_argument("--pages", type=int, default=2000, help="Synthetic pages to clean (default: 2000)")
+    parser.add_argument("--workers", default="0,2,4", help="Comma-separated worker counts for clean_pages")
+    parser.add_argument("--repeats", type=int, default=3, help="Timed runs per variant")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="Results JSON path (default: benchmarks/results/)")
+    parser.add_argument("--compare", help="Earlier results JSON to compare against")
+    args = parser.parse_args()
+
+    import cleanText
+
+    pages = synthetic_pages(args.pages, args.seed)
+    characters = sum(len(page) for page in pages)
+    print(f"🔄 Cleaning {len(pages)} pages ({characters / 1e6:.1f}M characters), {args.repeats} runs each")
+
+    # Time the worker pools on every document size, not only above the in-process threshold
+    cleanText.PARALLEL_MIN_CHARS = 0
+    variants = {"reference": lambda batch: [cleanText.reference_clean_text(page) for page in batch]}
+    for workers in (int(value) for value in args.workers.split(",")):
+        variants[f"clean_pages(workers={workers})"] = (
+            lambda batch, workers=workers: cleanText.clean_pages(batch, workers=workers)
+        )
+
+    rows, expected, mismatched = [], None, []
+    for name, clean in variants.items():
+        clean(pages[:8])  # warm up: start worker processes, fill the translate table
+        result = measure(clean, pages, args.repeats)
+        if expected is None:
+            expected = result["output"]
+        elif result["output"] != expected:
+            mismatched.append(name)
+        p50 = result["seconds"]["p50"]
+        rows.append({"variant": name, "seconds": result["seconds"], "pages_per_s": len(pages) / p50,
+                     "mb_per_s": characters / p50 / 1e6, "speedup": rows[0]["seconds"]["p50"] / p50 if rows else 1.0})
+
+    print("\n📈 Text cleaning")
+    print("=" * 50)
+    for row in rows:
+        print(f"{row['variant']:<24} p50 {row['seconds']['p50'] * 1000:8.1f} ms  {row['pages_per_s']:9.0f} pages/s  "
+              f"{row['mb_per_s']:6.1f} MB/s  ×{row['speedup']:.2f}")
+
+    results = {
+        "benchmark": "clean",
+        "config": {key: value for key, value in vars(args).items() if key not in ("output", "compare")},
+        "environment": environment_info(),
+        "characters": characters,
+        "results": {row["variant"]: row for row in rows},
+    }
+    path = save_results("clean", results, args.output)
+    print(f"\n💾 Results saved to {path}")
+    if args.compare:
+        compare_results(args.compare, results, [f"results.{row['variant']}.seconds.p50" for row in rows])
+
+    if mismatched:
+        print(f"❌ Output differs from the reference: {', '.join(mismatched)}")
+        sys.exit(1)
+    print("✅ Every variant matches the reference output")
+
+
+if __name__ == "__main__":
+    main()
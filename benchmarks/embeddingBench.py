@@ -0,0 +1,159 @@
+import argparse
+import random
+import sys
+import time
+from typing import Dict, List
+
+import numpy as np
+
+from benchUtils import environment_info, peak_rss_bytes, save_results, summarize, synthetic_chunks, synthetic_question
+
+
+def mixed_length_texts(count: int, seed: int) -> List[str]:
+    """Synthetic chunks cut to between a few words and full length, like real split output"""
+    rng = random.Random(seed)
+    texts = []
+    for chunk in synthetic_chunks(count, seed):
+        words = chunk.split()
+        texts.append(" ".join(words[:rng.randint(4, len(words))]))
+    return texts
+
+
+def load_backend(spec: str, threads: int, batch_size: int):
+    """spec is an embedding backend name, or quantized:<runtime>"""
+    from embeddings import MODEL_NAME, configure_model_cache, create_embedding_model
+
+    backend, _, runtime = spec.partition(":")
+    if backend == "quantized" and runtime:
+        from quantizedEmbeddings import QuantizedEmbeddings
+
+        configure_model_cache()
+        return QuantizedEmbeddings(MODEL_NAME, runtime=runtime, threads=threads, batch_size=batch_size)
+    return create_embedding_model(backend)
+
+
+def measure(model, texts: List[str], queries: List[str], repeats: int) -> Dict:
+    """Single-query latency and bulk embed_documents throughput"""
+    model.embed_query("warm up")
+    latencies = []
+    for query in queries:
+        for _ in range(repeats):
+            started = time.perf_counter()
+            model.embed_query(query)
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    vectors = model.embed_documents(texts)
+    bulk_s = time.perf_counter() - started
+    return {
+        "query_ms": {key: value * 1000 if key != "count" else value for key, value in summarize(latencies).items()},
+        "bulk_s": bulk_s,
+        "bulk_texts_per_s": len(texts) / bulk_s if bulk_s else 0.0,
+        "doc_vectors": np.asarray(vectors, dtype=np.float32),
+        "query_vectors": np.asarray([model.embed_query(query) for query in queries], dtype=np.float32),
+    }
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    return vectors / np.clip(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12, None)
+
+
+def accuracy(reference: Dict, candidate: Dict, top_k: int) -> Dict:
+    """Cosine similarity of each vector to the reference, and top-k retrieval agreement"""
+    ref_docs, cand_docs = _normalize(reference["doc_vectors"]), _normalize(candidate["doc_vectors"])
+    ref_queries, cand_queries = _normalize(reference["query_vectors"]), _normalize(candidate["query_vectors"])
+    cosines = np.concatenate([(ref_docs * cand_docs).sum(axis=1), (ref_queries * cand_queries).sum(axis=1)])
+
+    ref_top = np.argsort(-(ref_queries @ ref_docs.T), axis=1)[:, :top_k]
+    cand_top = np.argsort(-(cand_queries @ cand_docs.T), axis=1)[:, :top_k]
+    overlap = [len(set(a) & set(b)) / top_k for a, b in zip(ref_top.tolist(), cand_top.tolist())]
+    return {
+        "cosine_mean": float(cosines.mean()),
+        "cosine_p1": float(np.percentile(cosines, 1)),
+        "cosine_min": float(cosines.min()),
+        f"top{top_k}_overlap": float(np.mean(overlap)),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compare quantized embedding backends with the reference model: vector accuracy, "
+                    "query latency and bulk ingestion throughput."
+    )
+    parser.add_argument("--reference", default="huggingface", help="Reference backend (default: huggingface)")
+    parser.add_argument("--candidates", default="quantized:onnx,quantized:torch",
+                        help="Comma-separated backends to compare; quantized:<runtime> picks the runtime")
+    parser.add_argument("--texts", type=int, default=1000, help="Chunks to embed in the bulk run")
+    parser.add_argument("--queries", type=int, default=100, help="Queries for latency and retrieval agreement")
+    parser.add_argument("--repeats", type=int, default=3, help="Timed embed_query calls per query")
+    parser.add_argument("--threads", type=int, default=0, help="Intra-op threads for quantized backends (0 = default)")
+    parser.add_argument("--batch-size", type=int, default=128, help="Largest batch for quantized backends")
+    parser.add_argument("--top-k", type=int, default=5, help="k for retrieval agreement")
+    parser.add_argument("--min-cosine", type=float, default=0.98,
+                        help="Fail (exit 1) if a candidate's mean cosine to the reference is below this "
+                             "(a candidate that fails to load also fails the run)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="Results JSON path (default: benchmarks/results/)")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    texts = mixed_length_texts(args.texts, args.seed)
+    queries = [synthetic_question(rng.choice(["factoid", "long", "follow_up"]), rng) for _ in range(args.queries)]
+
+    print(f"🔄 Reference: {args.reference}")
+    reference = measure(load_backend(args.reference, args.threads, args.batch_size), texts, queries, args.repeats)
+    rows = [{"backend": args.reference, **{k: v for k, v in reference.items() if not k.endswith("_vectors")}}]
+
+    failed, skipped = [], []
+    for spec in args.candidates.split(","):
+        print(f"🔄 Candidate: {spec}")
+        try:
+            model = load_backend(spec, args.threads, args.batch_size)
+        except Exception as e:
+            print(f"⚠️  Skipping {spec}: {e}")
+            skipped.append(spec)
+            continue
+        result = measure(model, texts, queries, args.repeats)
+        scores = accuracy(reference, result, args.top_k)
+        rows.append({
+            "backend": spec,
+            **{k: v for k, v in result.items() if not k.endswith("_vectors")},
+            **scores,
+            "query_speedup": reference["query_ms"]["p50"] / result["query_ms"]["p50"],
+            "bulk_speedup": reference["bulk_s"] / result["bulk_s"],
+        })
+        if scores["cosine_mean"] < args.min_cosine:
+            failed.append(spec)
+
+    print("\n📈 Embedding backends")
+    print("=" * 50)
+    for row in rows:
+        print(f"{row['backend']:<18} query p50 {row['query_ms']['p50']:7.2f} ms  p99 {row['query_ms']['p99']:7.2f} ms  "
+              f"bulk {row['bulk_texts_per_s']:8.1f} texts/s")
+        if "cosine_mean" in row:
+            print(f"{'':<18} speedup query ×{row['query_speedup']:.2f}, bulk ×{row['bulk_speedup']:.2f}; "
+                  f"cosine mean {row['cosine_mean']:.4f}, min {row['cosine_min']:.4f}, "
+                  f"top-{args.top_k} overlap {row[f'top{args.top_k}_overlap']:.3f}")
+    print(f"Peak RSS: {peak_rss_bytes() / 2**20:.0f} MiB")
+
+    results = {
+        "benchmark": "embedding",
+        "config": {key: value for key, value in vars(args).items() if key != "output"},
+        "environment": environment_info(),
+        "results": rows,
+        "skipped": skipped,
+    }
+    path = save_results("embedding", results, args.output)
+    print(f"\n💾 Results saved to {path}")
+
+    if failed:
+        print(f"❌ Mean cosine below {args.min_cosine}: {', '.join(failed)}")
+    if skipped:
+        print(f"❌ Could not load: {', '.join(skipped)}")
+    if failed or skipped:
+        sys.exit(1)
+    print(f"✅ All candidates within accuracy threshold ({args.min_cosine})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+import argparse
+import contextlib
+import io
+import os
+import shutil
+import tempfile
+import time
+import tracemalloc
+from typing import Dict, List
+
+from benchUtils import (
+    compare_results, environment_info, peak_rss_bytes, rss_bytes, save_results,
+    write_synthetic_docx, write_synthetic_pdf,
+)
+
+STAGES = ("extract", "clean", "split", "embed", "write")
+
+
+def generate_corpus(directory: str, sizes: List[int], docs_per_size: int, formats: List[str], seed: int) -> List[Dict]:
+    """Write synthetic documents of each size and format into `directory`"""
+    corpus = []
+    for size in sizes:
+        for n in range(docs_per_size):
+            for fmt in formats:
+                path = os.path.join(directory, f"synthetic-{size}p-{n}.{fmt}")
+                writer = write_synthetic_pdf if fmt == "pdf" else write_synthetic_docx
+                writer(path, size, seed=seed + size * 1000 + n)
+                corpus.append({"path": path, "format": fmt, "pages": size, "bytes": os.path.getsize(path)})
+    return corpus
+
+
+def stage_totals() -> Dict[str, float]:
+    from metrics import INGEST_STAGE_SECONDS
+    return {key[0]: total for key, (_, total) in INGEST_STAGE_SECONDS.totals().items()}
+
+
+def ingest_document(doc: Dict, collection_name: str, verbose: bool) -> Dict:
+    """Run one document through the real extract → setup_knowledge_base path"""
+    import extractText
+    from feedDoc import setup_knowledge_base
+    from metrics import INGEST_STAGE_SECONDS
+
+    chunks_before = _collection_count(collection_name)
+    before = stage_totals()
+    started = time.perf_counter()
+    output = contextlib.nullcontext() if verbose else contextlib.redirect_stdout(io.StringIO())
+    with output:
+        with INGEST_STAGE_SECONDS.time(stage="extract"):
+            text = extractText.extract_text(doc["path"])
+        total_count = setup_knowledge_base(text, collection_name)
+    elapsed = time.perf_counter() - started
+    after = stage_totals()
+    stages = {stage: after.get(stage, 0.0) - before.get(stage, 0.0) for stage in STAGES}
+
+    return {
+        **{key: value for key, value in doc.items() if key != "path"},
+        "file": os.path.basename(doc["path"]),
+        "characters": len(text),
+        "chunks": total_count - chunks_before,
+        "total_s": elapsed,
+        "stages_s": stages,
+        # Client setup, counts and logging between the instrumented stages
+        "other_s": elapsed - sum(stages.values()),
+    }
+
+
+def _collection_count(collection_name: str) -> int:
+    import chromadb
+    from app.config import settings
+    return chromadb.PersistentClient(path=settings.CHROMA_PATH).get_or_create_collection(name=collection_name).count()
+
+
+def aggregate(documents: List[Dict]) -> Dict:
+    total_s = sum(doc["total_s"] for doc in documents)
+    pages = sum(doc["pages"] for doc in documents)
+    chunks = sum(doc["chunks"] for doc in documents)
+    stages = {stage: sum(doc["stages_s"][stage] for doc in documents) for stage in STAGES}
+    return {
+        "documents": len(documents),
+        "pages": pages,
+        "chunks": chunks,
+        "total_s": total_s,
+        "pages_per_s": pages / total_s if total_s else 0.0,
+        "chunks_per_s": chunks / total_s if total_s else 0.0,
+        "stages_s": stages,
+        "stage_share": {stage: (value / total_s if total_s else 0.0) for stage, value in stages.items()},
+    }
+
+
+def print_summary(summary: Dict):
+    print("\n📈 Ingestion benchmark results")
+    print("=" * 50)
+    for label, stats in [("all", summary["overall"])] + list(summary["by_format"].items()):
+        print(f"{label:>4}: {stats['documents']} docs, {stats['pages']} pages, {stats['chunks']} chunks "
+              f"in {stats['total_s']:.2f}s → {stats['pages_per_s']:.1f} pages/s, {stats['chunks_per_s']:.1f} chunks/s")
+    print("Stage breakdown:")
+    for stage, seconds in summary["overall"]["stages_s"].items():
+        print(f"   {stage:<8} {seconds:8.3f}s  {summary['overall']['stage_share'][stage] * 100:5.1f}%")
+    print(f"Peak RSS: {summary['peak_rss_bytes'] / 2**20:.0f} MiB")
+    if summary.get("traced_peak_bytes"):
+        print(f"Peak traced Python allocations: {summary['traced_peak_bytes'] / 2**20:.1f} MiB")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark extract → clean → split → embed → Chroma write on synthetic PDF and DOCX files."
+    )
+    parser.add_argument("--sizes", default="1,10,50", help="Comma-separated page counts (default: 1,10,50)")
+    parser.add_argument("--docs", type=int, default=2, help="Documents per size and format")
+    parser.add_argument("--formats", default="pdf,docx", help="pdf, docx or both")
+    parser.add_argument("--embedding-backend", default="hash",
+                        help="hash (default, isolates pipeline overhead) or huggingface (includes model time)")
+    parser.add_argument("--trace-memory", action="store_true", help="Track peak Python allocations with tracemalloc (slower)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--verbose", action="store_true", help="Show the pipeline's own progress output")
+    parser.add_argument("--output", help="Results JSON path (default: benchmarks/results/)")
+    parser.add_argument("--compare", help="Earlier results JSON to compare against")
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp(prefix="wisebot-ingest-bench-")
+    os.environ["CHROMA_PATH"] = os.path.join(work_dir, "chroma_db")
+    os.environ["EMBEDDING_BACKEND"] = args.embedding_backend
+
+    try:
+        sizes = [int(size) for size in args.sizes.split(",")]
+        formats = [fmt.strip() for fmt in args.formats.split(",")]
+        print(f"📝 Generating {len(sizes) * args.docs * len(formats)} synthetic documents...")
+        corpus = generate_corpus(work_dir, sizes, args.docs, formats, args.seed)
+
+        # Load the embedder and open Chroma up front so start-up is not billed to the first document
+        from embeddings import get_embedding_model
+        get_embedding_model().embed_documents(["warm up"])
+        _collection_count("bench")
+
+        rss_before = rss_bytes()
+        if args.trace_memory:
+            tracemalloc.start()
+        documents = []
+        for doc in corpus:
+            result = ingest_document(doc, "bench", args.verbose)
+            documents.append(result)
+            print(f"   {result['file']}: {result['chunks']} chunks in {result['total_s']:.2f}s")
+        traced_peak = tracemalloc.get_traced_memory()[1] if args.trace_memory else None
+        if args.trace_memory:
+            tracemalloc.stop()
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    summary = {
+        "overall": aggregate(documents),
+        "by_format": {fmt: aggregate([d for d in documents if d["format"] == fmt]) for fmt in formats},
+        "by_size": {str(size): aggregate([d for d in documents if d["pages"] == size]) for size in sizes},
+        "rss_before_bytes": rss_before,
+        "peak_rss_bytes": peak_rss_bytes(),
+        "traced_peak_bytes": traced_peak,
+    }
+    results = {
+        "benchmark": "ingest",
+        "config": {key: value for key, value in vars(args).items() if key not in ("output", "compare", "verbose")},
+        "environment": environment_info(),
+        "summary": summary,
+        "documents": documents,
+    }
+    print_summary(summary)
+    path = save_results("ingest", results, args.output)
+    print(f"\n💾 Results saved to {path}")
+    if args.compare:
+        compare_results(args.compare, results, [
+            "summary.overall.pages_per_s", "summary.overall.chunks_per_s",
+            *[f"summary.overall.stages_s.{stage}" for stage in STAGES], "summary.peak_rss_bytes",
+        ])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,255 @@
+import argparse
+import asyncio
+import json
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from typing import Dict, List
+
+from benchUtils import (
+    ROOT_DIR, compare_results, environment_info, rss_bytes, save_results, summarize,
+    synthetic_chunks, synthetic_question,
+)
+
+DEFAULT_MIX = "factoid=6,follow_up=2,long=1,off_topic=1"
+
+
+def parse_mix(mix: str) -> Dict[str, float]:
+    weights = {}
+    for part in mix.split(","):
+        kind, _, weight = part.partition("=")
+        weights[kind.strip()] = float(weight or 1)
+    return weights
+
+
+def seed_knowledge_base(chroma_path: str, collection_name: str, chunk_count: int, seed: int):
+    """Fill a fresh Chroma collection with synthetic chunks using the configured embedder"""
+    import chromadb
+    from embeddings import get_embedding_model
+
+    print(f"🌱 Seeding {chunk_count} synthetic chunks into {chroma_path}")
+    chunks = synthetic_chunks(chunk_count, seed)
+    embedding_model = get_embedding_model()
+    collection = chromadb.PersistentClient(path=chroma_path).get_or_create_collection(name=collection_name)
+    for start in range(0, len(chunks), 500):
+        batch = chunks[start:start + 500]
+        collection.add(
+            ids=[f"synthetic-{start + i}" for i in range(len(batch))],
+            documents=batch,
+            embeddings=embedding_model.embed_documents(batch),
+        )
+    print(f"✅ Knowledge base ready: {collection.count()} chunks")
+
+
+def start_server(host: str, port: int, env: Dict[str, str]) -> subprocess.Popen:
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--host", host, "--port", str(port),
+         "--log-level", "warning"],
+        cwd=ROOT_DIR,
+        env=env,
+    )
+    deadline = time.monotonic() + 180
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"Server exited with code {server.returncode}")
+        try:
+            with urllib.request.urlopen(f"http://{host}:{port}/ready", timeout=1):
+                return server
+        except OSError:
+            time.sleep(0.25)
+    server.terminate()
+    raise RuntimeError("Server did not become ready in time")
+
+
+async def sample_rss(pid: int, samples: List[int], stop: asyncio.Event):
+    while not stop.is_set():
+        rss = rss_bytes(pid)
+        if rss:
+            samples.append(rss)
+        try:
+            await asyncio.wait_for(stop.wait(), 0.5)
+        except asyncio.TimeoutError:
+            pass
+
+
+async def run_client(url: str, client_id: int, args, weights: Dict[str, float], results: List[Dict]):
+    """One simulated user asking questions sequentially over its own WebSocket"""
+    import websockets
+
+    rng = random.Random(args.seed * 1000 + client_id)
+    kinds, kind_weights = list(weights), list(weights.values())
+    user_id = f"loadtest-{client_id}"
+
+    async with websockets.connect(f"{url}/ws/{user_id}", max_size=None) as socket:
+        # Welcome and knowledge base frames
+        for _ in range(2):
+            frame = json.loads(await socket.recv())
+            if frame.get("type") == "error":
+                raise RuntimeError(frame.get("message"))
+
+        for _ in range(args.questions):
+            kind = rng.choices(kinds, kind_weights)[0]
+            question = synthetic_question(kind, rng)
+            sent = time.perf_counter()
+            first_token = None
+            await socket.send(json.dumps({"message": question, "stream": args.stream, "timings": True}))
+
+            while True:
+                frame = json.loads(await socket.recv())
+                frame_type = frame.get("type")
+                if frame_type == "assistant_delta" and first_token is None:
+                    first_token = time.perf_counter() - sent
+                elif frame_type in ("assistant", "error"):
+                    latency = time.perf_counter() - sent
+                    results.append({
+                        "client": client_id,
+                        "kind": kind,
+                        "ok": frame_type == "assistant" and not frame.get("message", "").startswith("Sorry, I encountered an error"),
+                        "latency": latency,
+                        "ttft": first_token if first_token is not None else latency,
+                        "server_timings": frame.get("timings", {}),
+                    })
+                    break
+
+            if args.think_ms:
+                await asyncio.sleep(rng.uniform(0, 2 * args.think_ms) / 1000)
+
+
+async def drive_load(args, server_pid: int) -> Dict:
+    url = f"ws://{args.host}:{args.port}"
+    weights = parse_mix(args.mix)
+    results: List[Dict] = []
+    rss_samples: List[int] = []
+    stop = asyncio.Event()
+    sampler = asyncio.create_task(sample_rss(server_pid, rss_samples, stop))
+
+    async def ramped(client_id: int):
+        await asyncio.sleep(client_id * args.ramp_ms / 1000)
+        await run_client(url, client_id, args, weights, results)
+
+    print(f"🚀 Driving {args.clients} clients × {args.questions} questions")
+    started = time.perf_counter()
+    outcomes = await asyncio.gather(*(ramped(i) for i in range(args.clients)), return_exceptions=True)
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await sampler
+
+    client_errors = [repr(outcome) for outcome in outcomes if isinstance(outcome, Exception)]
+    ok = [r for r in results if r["ok"]]
+    stages = sorted({stage for r in ok for stage in r["server_timings"]})
+    return {
+        "duration_s": elapsed,
+        "requests": len(results),
+        "errors": len(results) - len(ok) + len(client_errors),
+        "client_errors": client_errors[:10],
+        "throughput_rps": len(ok) / elapsed if elapsed else 0.0,
+        "latency_s": summarize([r["latency"] for r in ok]),
+        "ttft_s": summarize([r["ttft"] for r in ok]),
+        "latency_by_kind_s": {
+            kind: summarize([r["latency"] for r in ok if r["kind"] == kind]) for kind in weights
+        },
+        "server_stage_ms": {
+            stage: summarize([r["server_timings"][stage] for r in ok if stage in r["server_timings"]])
+            for stage in stages
+        },
+        "server_rss_bytes": {
+            "start": rss_samples[0] if rss_samples else None,
+            "peak": max(rss_samples) if rss_samples else None,
+            "end": rss_samples[-1] if rss_samples else None,
+        },
+    }
+
+
+def print_summary(summary: Dict):
+    latency, ttft = summary["latency_s"], summary["ttft_s"]
+    print("\n📈 Load test results")
+    print("=" * 50)
+    print(f"Requests: {summary['requests']} ({summary['errors']} errors) in {summary['duration_s']:.1f}s")
+    print(f"Throughput: {summary['throughput_rps']:.2f} answers/s")
+    if latency["count"]:
+        print(f"Latency p50/p95/p99: {latency['p50'] * 1000:.0f} / {latency['p95'] * 1000:.0f} / {latency['p99'] * 1000:.0f} ms")
+        print(f"TTFT    p50/p95/p99: {ttft['p50'] * 1000:.0f} / {ttft['p95'] * 1000:.0f} / {ttft['p99'] * 1000:.0f} ms")
+    for stage, stats in summary["server_stage_ms"].items():
+        print(f"   {stage:<16} p50 {stats['p50']:.1f} ms   p99 {stats['p99']:.1f} ms")
+    rss = summary["server_rss_bytes"]
+    if rss["peak"]:
+        print(f"Server RSS: start {rss['start'] / 2**20:.0f} MiB, peak {rss['peak'] / 2**20:.0f} MiB")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Load-test the WebSocket chat endpoint against a stub LLM and a synthetic knowledge base."
+    )
+    parser.add_argument("--clients", type=int, default=20, help="Concurrent WebSocket clients")
+    parser.add_argument("--questions", type=int, default=10, help="Questions per client")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help=f"Question mix weights (default: {DEFAULT_MIX})")
+    parser.add_argument("--stream", action="store_true", help="Request streamed answers (measures real TTFT)")
+    parser.add_argument("--think-ms", type=float, default=0, help="Mean think time between questions")
+    parser.add_argument("--ramp-ms", type=float, default=50, help="Delay between client start-ups")
+    parser.add_argument("--llm-latency-ms", type=float, default=300, help="Stub LLM time to first token")
+    parser.add_argument("--tokens-per-sec", type=float, default=80, help="Stub LLM streaming rate")
+    parser.add_argument("--answer-tokens", type=int, default=60, help="Stub LLM answer length")
+    parser.add_argument("--embedding-backend", default="hash", help="hash (default), huggingface or remote")
+    parser.add_argument("--kb-chunks", type=int, default=2000, help="Synthetic knowledge base size")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--chroma-path", help="Reuse this Chroma directory instead of a fresh temp one")
+    parser.add_argument("--output", help="Results JSON path (default: benchmarks/results/)")
+    parser.add_argument("--compare", help="Earlier results JSON to compare against")
+    args = parser.parse_args()
+
+    temp_dir = None
+    chroma_path = args.chroma_path
+    if not chroma_path:
+        temp_dir = tempfile.mkdtemp(prefix="wisebot-loadtest-")
+        chroma_path = os.path.join(temp_dir, "chroma_db")
+
+    env = dict(os.environ)
+    env.update({
+        "LLM_BACKEND": "stub",
+        "STUB_LLM_LATENCY_MS": str(args.llm_latency_ms),
+        "STUB_LLM_TOKENS_PER_SEC": str(args.tokens_per_sec),
+        "STUB_LLM_ANSWER_TOKENS": str(args.answer_tokens),
+        "EMBEDDING_BACKEND": args.embedding_backend,
+        "CHROMA_PATH": chroma_path,
+    })
+    # The seeding step reads the same settings in this process
+    os.environ.update(env)
+
+    server = None
+    try:
+        if not args.chroma_path:
+            seed_knowledge_base(chroma_path, "manuals", args.kb_chunks, args.seed)
+        server = start_server(args.host, args.port, env)
+        summary = asyncio.run(drive_load(args, server.pid))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait(timeout=30)
+        if temp_dir:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+    results = {
+        "benchmark": "loadtest",
+        "config": {key: value for key, value in vars(args).items() if key not in ("output", "compare")},
+        "environment": environment_info(),
+        "summary": summary,
+    }
+    print_summary(summary)
+    path = save_results("loadtest", results, args.output)
+    print(f"\n💾 Results saved to {path}")
+    if args.compare:
+        compare_results(args.compare, results, [
+            "summary.throughput_rps", "summary.latency_s.p50", "summary.latency_s.p95",
+            "summary.latency_s.p99", "summary.ttft_s.p50", "summary.server_rss_bytes.peak",
+        ])
+
+
+if __name__ == "__main__":
+    main()
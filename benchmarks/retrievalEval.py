@@ -0,0 +1,198 @@
+import argparse
+import contextlib
+import io
+import itertools
+import json
+import os
+import re
+import shutil
+import tempfile
+import time
+from typing import Dict, List
+
+from benchUtils import environment_info, percentile, save_results, synthetic_chunks
+
+
+def load_labels(path: str) -> List[Dict]:
+    """
+    Read labelled questions, one JSON object per line:
+    {"question": "...", "expected": ["text that a relevant chunk contains", ...]}
+    """
+    labels = []
+    with open(path) as f:
+        for line in f:
+            if line.strip():
+                item = json.loads(line)
+                expected = item.get("expected", [])
+                labels.append({"question": item["question"], "expected": [expected] if isinstance(expected, str) else expected})
+    return labels
+
+
+def synthetic_dataset(sections: int, questions: int, seed: int):
+    """A synthetic corpus plus questions whose answers are known phrases in it"""
+    chunks = synthetic_chunks(sections, seed)
+    labels = []
+    for chunk in chunks[:: max(len(chunks) // questions, 1)][:questions]:
+        action, component, product = re.search(r"to (\w+) the (.+?) on the (.+?),", chunk).groups()
+        labels.append({
+            "question": f"How do I {action} the {component} on the {product}?",
+            "expected": [f"to {action} the {component} on the {product}"],
+        })
+    return "\n".join(chunks), labels
+
+
+def build_collection(text: str, collection_name: str, chunk_size: int, overlap: int, embedding_model) -> int:
+    """Index the corpus with one chunking configuration"""
+    import chromadb
+    import cleanText
+    import splitText
+    from app.config import settings
+
+    chunks = splitText.split_text_to_chunks(cleanText.clean_text(text), chunk_size=chunk_size, chunk_overlap=overlap)
+    texts = [chunk.page_content for chunk in chunks]
+    client = chromadb.PersistentClient(path=settings.CHROMA_PATH)
+    collection = client.get_or_create_collection(name=collection_name)
+    for start in range(0, len(texts), 500):
+        batch = texts[start:start + 500]
+        collection.add(
+            ids=[f"{collection_name}-{start + i}" for i in range(len(batch))],
+            documents=batch,
+            embeddings=embedding_model.embed_documents(batch),
+        )
+    return len(texts)
+
+
+def score(retrieved: List[str], expected: List[str]) -> Dict[str, float]:
+    """recall = share of expected snippets found in the retrieved chunks; rr = 1/rank of the first hit"""
+    found = {snippet for snippet in expected if any(snippet in chunk for chunk in retrieved)}
+    first_hit = next(
+        (rank for rank, chunk in enumerate(retrieved, start=1) if any(snippet in chunk for snippet in expected)),
+        None,
+    )
+    return {
+        "recall": len(found) / len(expected) if expected else 0.0,
+        "rr": 1 / first_hit if first_hit else 0.0,
+    }
+
+
+def evaluate(bot, labels: List[Dict], k: int, repeats: int) -> Dict:
+    """Run AdaptiveKnowledgeChatbot._retrieve_context for every question at one k"""
+    latencies, recalls, rrs = [], [], []
+    for label in labels:
+        for _ in range(repeats):
+            started = time.perf_counter()
+            retrieved = bot._retrieve_context(label["question"], k=k)
+            latencies.append(time.perf_counter() - started)
+        result = score(retrieved, label["expected"])
+        recalls.append(result["recall"])
+        rrs.append(result["rr"])
+    return {
+        "recall@k": sum(recalls) / len(recalls),
+        "mrr": sum(rrs) / len(rrs),
+        "latency_p50_ms": percentile(latencies, 50) * 1000,
+        "latency_p99_ms": percentile(latencies, 99) * 1000,
+    }
+
+
+def print_table(rows: List[Dict]):
+    header = f"{'backend':<12} {'chunk':>6} {'overlap':>7} {'k':>3} {'chunks':>7} {'recall@k':>9} {'MRR':>6} {'p50 ms':>8} {'p99 ms':>8}"
+    print("\n" + header)
+    print("-" * len(header))
+    for row in rows:
+        print(f"{row['backend']:<12} {row['chunk_size']:>6} {row['overlap']:>7} {row['k']:>3} {row['chunks']:>7} "
+              f"{row['recall@k']:>9.3f} {row['mrr']:>6.3f} {row['latency_p50_ms']:>8.2f} {row['latency_p99_ms']:>8.2f}")
+
+
+def int_list(value: str) -> List[int]:
+    return [int(item) for item in value.split(",")]
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Offline retrieval evaluation: recall@k, MRR and latency across k, chunking and embedding backends."
+    )
+    parser.add_argument("--labels", help="JSONL of {\"question\", \"expected\": [snippets]} (omit with --synthetic)")
+    parser.add_argument("--source", action="append", default=[],
+                        help="Document (PDF, DOCX or .txt) to index; repeatable")
+    parser.add_argument("--synthetic", type=int, metavar="SECTIONS",
+                        help="Use a generated corpus of this many sections with generated labels")
+    parser.add_argument("--questions", type=int, default=50, help="Questions to generate with --synthetic")
+    parser.add_argument("--k", default="1,3,5,10", help="Comma-separated k values")
+    parser.add_argument("--chunk-sizes", default="500", help="Comma-separated chunk sizes")
+    parser.add_argument("--overlaps", default="50", help="Comma-separated chunk overlaps")
+    parser.add_argument("--backends", default="hash", help="Comma-separated embedding backends")
+    parser.add_argument("--repeats", type=int, default=3, help="Timed retrievals per question")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="Results JSON path (default: benchmarks/results/)")
+    parser.add_argument("--compare", help="Earlier results JSON to compare against")
+    args = parser.parse_args()
+
+    if args.synthetic:
+        text, labels = synthetic_dataset(args.synthetic, args.questions, args.seed)
+    else:
+        if not args.labels or not args.source:
+            parser.error("--labels and at least one --source are required unless --synthetic is used")
+        import extractText
+        labels = load_labels(args.labels)
+        text = "\n".join(
+            open(path).read() if path.endswith(".txt") else extractText.extract_text(path) for path in args.source
+        )
+
+    work_dir = tempfile.mkdtemp(prefix="wisebot-retrieval-eval-")
+    os.environ["CHROMA_PATH"] = os.path.join(work_dir, "chroma_db")
+    os.environ["LLM_BACKEND"] = "stub"
+
+    import cleanText
+    from chatbot import AdaptiveKnowledgeChatbot
+    from embeddings import create_embedding_model
+
+    # Chunks are cleaned (and lowercased) before indexing, so snippets must be too
+    for label in labels:
+        label["expected"] = [cleanText.clean_text(snippet) for snippet in label["expected"]]
+
+    rows = []
+    try:
+        for backend in args.backends.split(","):
+            embedding_model = create_embedding_model(backend)
+            for chunk_size, overlap in itertools.product(int_list(args.chunk_sizes), int_list(args.overlaps)):
+                if overlap >= chunk_size:
+                    continue
+                collection_name = f"eval-{backend}-{chunk_size}-{overlap}"
+                chunk_count = build_collection(text, collection_name, chunk_size, overlap, embedding_model)
+                with contextlib.redirect_stdout(io.StringIO()):
+                    bot = AdaptiveKnowledgeChatbot(collection_name=collection_name, embedding_model=embedding_model)
+                bot._retrieve_context(labels[0]["question"])  # warm up
+                for k in int_list(args.k):
+                    row = {"backend": backend, "chunk_size": chunk_size, "overlap": overlap, "k": k,
+                           "chunks": chunk_count, **evaluate(bot, labels, k, args.repeats)}
+                    rows.append(row)
+                    print(f"   {backend} chunk={chunk_size} overlap={overlap} k={k}: "
+                          f"recall@k {row['recall@k']:.3f}, MRR {row['mrr']:.3f}, p50 {row['latency_p50_ms']:.2f} ms")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    print_table(rows)
+    results = {
+        "benchmark": "retrieval",
+        "config": {key: value for key, value in vars(args).items() if key not in ("output", "compare")},
+        "environment": environment_info(),
+        "questions": len(labels),
+        "results": rows,
+    }
+    path = save_results("retrieval", results, args.output)
+    print(f"\n💾 Results saved to {path}")
+    if args.compare:
+        print(f"\n📊 Compared with {args.compare}")
+        with open(args.compare) as f:
+            previous = {json.dumps([r["backend"], r["chunk_size"], r["overlap"], r["k"]]): r for r in json.load(f)["results"]}
+        for row in rows:
+            key = json.dumps([row["backend"], row["chunk_size"], row["overlap"], row["k"]])
+            if key in previous:
+                old = previous[key]
+                print(f"   {key}: recall@k {old['recall@k']:.3f} → {row['recall@k']:.3f}, "
+                      f"MRR {old['mrr']:.3f} → {row['mrr']:.3f}, "
+                      f"p50 {old['latency_p50_ms']:.2f} → {row['latency_p50_ms']:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,18 @@
+"""Test environment: hash embeddings, the stub LLM and a throwaway ChromaDB and upload store"""
+import os
+import sys
+import tempfile
+
+# Set before app.config is imported, which reads the environment once
+_root = tempfile.mkdtemp(prefix="wisebot-tests-")
+os.environ.update({
+    "EMBEDDING_BACKEND": "hash",
+    "LLM_BACKEND": "stub",
+    "STUB_LLM_LATENCY_MS": "0",
+    "WARM_UP": "false",
+    "CHROMA_PATH": os.path.join(_root, "chroma"),
+    "UPLOAD_DIR": os.path.join(_root, "uploads"),
+})
+
+sys.path.append(os.path.dirname(__file__))
+sys.path.append(os.path.join(os.path.dirname(__file__), 'app', 'services'))
@@ -22,6 +22,7 @@ const ChatInterface = ({ userId }) => {
     isTyping,
     error,
     sendMessage,
+    sendDraft,
     clearMessages,
     clearError,
   } = useWebSocket(userId);
@@ -147,7 +148,10 @@ const ChatInterface = ({ userId }) => {
           <textarea
             ref={inputRef}
             value={inputMessage}
-            onChange={(e) => setInputMessage(e.target.value)}
+            onChange={(e) => {
+              setInputMessage(e.target.value);
+              sendDraft(e.target.value);
+            }}
             onKeyPress={handleKeyPress}
             onFocus={() => setIsInputFocused(true)}
             onBlur={() => setIsInputFocused(false)}
@@ -113,6 +113,10 @@ export const useWebSocket = (userId) => {
     return success;
   };
 
+  const sendDraft = (message) => {
+    webSocketService.sendDraft(message);
+  };
+
   const clearMessages = () => {
     setMessages([]);
   };
@@ -127,6 +131,7 @@ export const useWebSocket = (userId) => {
     isTyping,
     error,
     sendMessage,
+    sendDraft,
     clearMessages,
     clearError,
   };
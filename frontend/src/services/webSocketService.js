@@ -6,9 +6,10 @@ class WebSocketService {
     this.maxReconnectAttempts = 5;
     this.reconnectDelay = 1000;
     this.isConnecting = false;
+    this.draftTimer = null;
   }
 
-  connect(userId) {
+  connect(userId, tenant = null) {
     if (this.socket?.readyState === WebSocket.OPEN) {
       return Promise.resolve();
     }
@@ -32,8 +33,9 @@ class WebSocketService {
 
     return new Promise((resolve, reject) => {
       try {
-        // Connect to FastAPI WebSocket endpoint
-        const wsUrl = `ws://localhost:8000/ws/${userId}`;
+        // Connect to FastAPI WebSocket endpoint (a tenant searches only its own knowledge base)
+        const query = tenant ? `?tenant=${encodeURIComponent(tenant)}` : "";
+        const wsUrl = `ws://localhost:8000/ws/${userId}${query}`;
         this.socket = new WebSocket(wsUrl);
 
         this.socket.onopen = () => {
@@ -56,7 +58,7 @@ class WebSocketService {
           ) {
             setTimeout(() => {
               this.reconnectAttempts++;
-              this.connect(userId);
+              this.connect(userId, tenant);
             }, this.reconnectDelay);
           }
         };
@@ -119,6 +121,7 @@ class WebSocketService {
   }
 
   sendMessage(message) {
+    clearTimeout(this.draftTimer);
     if (this.socket?.readyState === WebSocket.OPEN) {
       this.socket.send(
         JSON.stringify({
@@ -131,6 +134,39 @@ class WebSocketService {
     return false;
   }
 
+  // Send the question being typed once typing pauses, so the server can prefetch its context
+  sendDraft(message, delay = 300) {
+    clearTimeout(this.draftTimer);
+    if (!message.trim()) {
+      return;
+    }
+    this.draftTimer = setTimeout(() => {
+      if (this.socket?.readyState === WebSocket.OPEN) {
+        this.socket.send(
+          JSON.stringify({
+            type: "draft",
+            message: message,
+          })
+        );
+      }
+    }, delay);
+  }
+
+  // Limit retrieval for this conversation, e.g. { product_lines: ["x200"], uploaded_after: "2024-01-01" };
+  // pass null to search the whole knowledge base again
+  setScope(scope) {
+    if (this.socket?.readyState === WebSocket.OPEN) {
+      this.socket.send(
+        JSON.stringify({
+          type: "scope",
+          scope: scope,
+        })
+      );
+      return true;
+    }
+    return false;
+  }
+
   on(event, callback) {
     if (!this.listeners.has(event)) {
       this.listeners.set(event, []);
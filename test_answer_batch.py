@@ -0,0 +1,74 @@
+"""Batch question answering: validation, one vector query per scope, and failures"""
+import uuid
+
+import pytest
+
+import bulkEmbed
+from chatbot import AdaptiveKnowledgeChatbot, normalize_batch
+from feedDoc import store_chunks
+
+TEXTS = {
+    "fans": ["Hold the fan reset button for five seconds.", "Fans spin down after an overheat."],
+    "pumps": ["The pump needs 24 volts.", "Prime the pump before first use."],
+}
+
+
+def test_normalize_batch():
+    assert normalize_batch(["  reset the fan? ", {"question": "pump voltage", "id": "q7",
+                                                   "scope": {"product_lines": ["pumps"]}}]) == [
+        {"id": 0, "question": "reset the fan?", "scope": None},
+        {"id": "q7", "question": "pump voltage", "scope": {"product_lines": ["pumps"]}},
+    ]
+    for bad in ([], "question", [""], [{"id": 1}], [{"question": "x", "scope": {"colour": "red"}}], [3]):
+        with pytest.raises(ValueError):
+            normalize_batch(bad)
+
+
+@pytest.fixture
+def bot():
+    name = f"batch-{uuid.uuid4().hex[:8]}"
+    for product_line, texts in TEXTS.items():
+        store_chunks(texts, name, document={"doc_id": product_line, "product_line": product_line})
+    return AdaptiveKnowledgeChatbot(name)
+
+
+def test_one_query_per_scope_and_every_question_answered(bot, monkeypatch):
+    collection, model = bot._serving_collection()
+    wheres = []
+
+    class CountingCollection:
+        def query(self, **kwargs):
+            wheres.append(kwargs["where"])
+            return collection.query(**kwargs)
+
+    monkeypatch.setattr(bot, "_serving_collection", lambda tenant=None, create=False: (CountingCollection(), model))
+    questions = normalize_batch([
+        {"question": "reset the fan", "id": "a", "scope": {"product_lines": ["fans"]}},
+        {"question": "pump voltage", "id": "b", "scope": {"product_lines": ["pumps"]}},
+        {"question": "fan overheat", "id": "c", "scope": {"product_lines": ["fans"]}},
+        "prime the pump",
+    ])
+    lines = list(bot.answer_batch(questions, k=2, include_context=True))
+    results, summary = lines[:-1], lines[-1]
+
+    assert len(wheres) == 3  # fans, pumps and unscoped
+    assert sorted(result["index"] for result in results) == [0, 1, 2, 3]
+    by_id = {result["id"]: result for result in results}
+    assert set(by_id) == {"a", "b", "c", 3}
+    assert set(by_id["a"]["context"]) <= set(TEXTS["fans"])
+    assert set(by_id["b"]["context"]) <= set(TEXTS["pumps"])
+    assert summary["type"] == "summary"
+    assert (summary["answered"], summary["failed"]) == (4, 0)
+
+
+def test_retrieval_failure_fails_every_question(bot, monkeypatch):
+    def broken(*args, **kwargs):
+        raise RuntimeError("index unavailable")
+
+    llm_calls = []
+    monkeypatch.setattr(bulkEmbed, "bulk_embed", broken)
+    monkeypatch.setattr(bot.llm, "invoke", llm_calls.append)
+    lines = list(bot.answer_batch(normalize_batch(["reset the fan", "pump voltage"])))
+    assert llm_calls == []  # nothing is answered without its context
+    assert all(not line["success"] for line in lines[:-1])
+    assert (lines[-1]["answered"], lines[-1]["failed"]) == (0, 2)
@@ -2,6 +2,7 @@
 import sys
 import os
 sys.path.append(os.path.join(os.path.dirname(__file__), 'app'))
+sys.path.append(os.path.join(os.path.dirname(__file__), 'app', 'services'))
 
 from app.services.chatbot import AdaptiveKnowledgeChatbot
 
@@ -0,0 +1,73 @@
+"""Equivalence tests for cleanText: clean_text and clean_pages must match the original reference_clean_text"""
+import random
+
+import cleanText
+from cleanText import clean_pages, clean_text, reference_clean_text
+
+SAMPLES = [
+    "",
+    "   ",
+    """
+    📌 LangChain helps build applications with LLMs.
+    Contact: support@example.com
+    Visit https://www.langchain.com/docs for more info.
+    - Feature 1: Retrieval Augmented Generation
+    - Feature 2: Chains & Agents
+    """,
+    "“Smart quotes” – en dash — em dash • bullet ‣ ◦ ⁃ ∙ ﬁ ligature ½ © ™ café naïve",
+    "<p>Reset the <b>fan</b> module</p> <unclosed tag",
+    "a@b @lead trail@ @ x@y@z ab@http://x.example <a href=http://x>link</a>",
+    "xhttp://y z@w www.example.com/path?q=1 http",
+    "tabs\tand\nnewlines\r\nand\x0bvertical\x0cfeeds\x1cfile\x1dgroup\x1erecord\x1funit\x85next line",
+    "no break em　ideographic narrow",
+    "CAPS and MiXeD 123 (parens), punctuation; colons: !?",
+]
+
+# Characters that change what the removals and filters do, plus filler
+ALPHABET = list("ab@@ @\t\n  \x1c\x1f\x0b\x85-–—•‣<>/.:hwtp\"#&_") + ["http", "www.", "é", "ﬁ", "📌", "　", " "]
+
+
+def test_samples_match_reference():
+    for sample in SAMPLES:
+        for lowercase in (True, False):
+            assert clean_text(sample, lowercase) == reference_clean_text(sample, lowercase), repr(sample)
+
+
+def test_every_code_point_matches_reference():
+    for start in range(0, 0x110000, 4096):
+        chars = [chr(code) for code in range(start, min(start + 4096, 0x110000)) if not 0xD800 <= code < 0xE000]
+        # One string per block, as short runs: the reference regexes backtrack quadratically on
+        # long runs without whitespace
+        words = " ".join("".join(chars[index:index + 64]) for index in range(0, len(chars), 64))
+        emails = " ".join(f"{a}@{b}" for a, b in zip(chars[::2], chars[1::2]))
+        for text in (words, emails):
+            assert clean_text(text) == reference_clean_text(text), f"block {start:#x}"
+            assert clean_text(text, False) == reference_clean_text(text, False), f"block {start:#x}"
+
+
+def test_random_text_matches_reference():
+    rng = random.Random(42)
+    for _ in range(50000):
+        text = "".join(rng.choice(ALPHABET) for _ in range(rng.randint(0, 40)))
+        assert clean_text(text) == reference_clean_text(text), repr(text)
+
+
+def test_clean_pages_keeps_order():
+    rng = random.Random(7)
+    pages = ["".join(rng.choice(ALPHABET) for _ in range(200)) + f" page {number}" for number in range(50)]
+    expected = [reference_clean_text(page) for page in pages]
+    assert clean_pages(pages) == expected
+    assert clean_pages(pages, workers=1) == expected
+    assert clean_pages([]) == []
+
+
+def test_clean_pages_in_worker_processes():
+    pages = SAMPLES * 20
+    threshold = cleanText.PARALLEL_MIN_CHARS
+    cleanText.PARALLEL_MIN_CHARS = 0
+    try:
+        assert clean_pages(pages, workers=2) == [reference_clean_text(page) for page in pages]
+        assert clean_pages(pages, lowercase=False, workers=2) == [reference_clean_text(page, False) for page in pages]
+    finally:
+        cleanText.PARALLEL_MIN_CHARS = threshold
+
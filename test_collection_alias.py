@@ -0,0 +1,148 @@
+"""Blue/green versions: promote, rollback and pruning, and rebuilds that catch up with ingestion"""
+import itertools
+import os
+import threading
+import time
+import uuid
+
+import pytest
+from docx import Document
+
+import collectionAlias
+from collectionAlias import promote, rebuild, registry, resolve, rollback, versions, write_lock
+from extractText import extract_pages
+from feedDoc import delete_document, setup_knowledge_base, store_chunks
+from tenants import collection_cache
+from uploadStore import upload_store
+
+SENTENCES = ["Hold the reset button for five seconds to restart the {}.",
+             "The {} needs a firmware update after every power failure.",
+             "Clean the {} filter once a month to keep it running quietly."]
+
+
+@pytest.fixture(autouse=True)
+def unique_versions(monkeypatch):
+    # Version names have one-second resolution; tests make several per second
+    counter = itertools.count()
+    monkeypatch.setattr(collectionAlias, "new_version_name",
+                        lambda alias: f"{alias}{collectionAlias.VERSION_SEPARATOR}{next(counter):014d}")
+
+
+@pytest.fixture
+def alias():
+    return f"alias-{uuid.uuid4().hex[:8]}"
+
+
+def served(alias: str) -> dict:
+    """doc_id -> chunk texts of the collection serving alias"""
+    found = collection_cache.get(alias)[0].get(include=["documents", "metadatas"])
+    documents = {}
+    for text, metadata in zip(found["documents"], found["metadatas"]):
+        documents.setdefault(metadata["doc_id"], set()).add(text)
+    return documents
+
+
+def write_docx(path: str, subject: str):
+    document = Document()
+    for sentence in SENTENCES:
+        document.add_paragraph(sentence.format(subject))
+    document.save(path)
+
+
+def upload(alias: str, name: str, subject: str, tmp_path):
+    """Store a generated document in the upload store and ingest it into alias under its name"""
+    path = os.path.join(tmp_path, f"{uuid.uuid4().hex}.docx")
+    write_docx(path, subject)
+    with open(path, "rb") as f:
+        stored = upload_store.save(f, name)
+    setup_knowledge_base(extract_pages(stored["path"]), alias,
+                         document={"doc_id": name, "file_hash": stored["hash"], "source": name})
+
+
+def test_promote_rollback_and_pruning(alias):
+    store_chunks(["original chunk"], alias, document={"doc_id": "original"})
+    first = collectionAlias.create_shadow(alias)
+    promote(alias, first)
+    assert resolve(alias) == first and registry.describe(alias)["previous"] == alias
+
+    failed = collectionAlias.create_shadow(alias)  # a build that never got swapped in
+    second = collectionAlias.create_shadow(alias)
+    promote(alias, second)
+    roles = {version["collection"]: version["role"] for version in versions(alias)}
+    # The unversioned original is never pruned; with keep=1 other inactive versions are dropped
+    assert roles == {alias: "inactive", first: "previous", second: "current"}
+    assert failed not in roles
+
+    rollback(alias)
+    assert resolve(alias) == first and registry.describe(alias)["previous"] == second
+    assert collection_cache.get(alias)[0].name == first
+
+
+def test_rebuild_applies_ingestion_made_meanwhile(alias, tmp_path, monkeypatch):
+    for name, subject in (("fan.docx", "fan"), ("pump.docx", "pump"), ("valve.docx", "valve")):
+        upload(alias, name, subject, tmp_path)
+    build = collectionAlias.rebuild_from_uploads
+
+    def build_with_changes(*args, **kwargs):
+        stats = build(*args, **kwargs)
+        upload(alias, "heater.docx", "heater", tmp_path)  # new
+        upload(alias, "pump.docx", "compressor", tmp_path)  # replaced
+        delete_document("valve.docx", alias)  # deleted
+        return stats
+
+    monkeypatch.setattr(collectionAlias, "rebuild_from_uploads", build_with_changes)
+    before = served(alias)
+    report = rebuild(alias, min_count_ratio=0)
+    assert report["swapped"], report
+    assert (report["reconciled_added"], report["reconciled_removed"]) == (2, 1)
+    assert resolve(alias) != alias
+    after = served(alias)
+    assert set(after) == {"fan.docx", "pump.docx", "heater.docx"}
+    assert after["fan.docx"] == before["fan.docx"]
+    assert all("compressor" in text for text in after["pump.docx"])
+
+
+def test_directory_rebuild_serves_only_the_directory(alias, tmp_path, monkeypatch):
+    import feedDoc
+
+    upload(alias, "fan.docx", "fan", tmp_path)
+    directory = tmp_path / "manuals"
+    directory.mkdir()
+    write_docx(str(directory / "fan.docx"), "fan")
+    write_docx(str(directory / "pump.docx"), "pump")
+    feed = feedDoc.feed_documents
+
+    def feed_with_upload(*args, **kwargs):
+        stats = feed(*args, **kwargs)
+        upload(alias, "fan.docx", "fan blade", tmp_path)  # replaced in the serving version
+        return stats
+
+    monkeypatch.setattr(feedDoc, "feed_documents", feed_with_upload)
+    report = rebuild(alias, str(directory), workers=1, min_count_ratio=0)
+    assert report["swapped"], report
+    # The directory's documents, not uploads re-ingested over them
+    after = served(alias)
+    assert set(after) == {"fan.docx", "pump.docx"}
+    assert not any("fan blade" in text for text in after["fan.docx"])
+
+
+def test_exclusive_write_lock_holds_off_ingestion(alias):
+    store_chunks(["first"], alias, document={"doc_id": "first"})
+    locked, released = threading.Event(), threading.Event()
+
+    def swap():
+        with write_lock(alias, exclusive=True):
+            locked.set()
+            released.wait(5)
+
+    holder = threading.Thread(target=swap)
+    holder.start()
+    locked.wait(5)
+    writer = threading.Thread(target=store_chunks, args=(["second"], alias), kwargs={"document": {"doc_id": "second"}})
+    writer.start()
+    time.sleep(0.3)
+    assert writer.is_alive()  # waiting for the swap
+    released.set()
+    writer.join(5)
+    holder.join(5)
+    assert set(served(alias)) == {"first", "second"}
@@ -0,0 +1,29 @@
+"""Collection handle cache: an embedding model override must not load the collection's own model"""
+import uuid
+
+import embeddings
+from chatbot import AdaptiveKnowledgeChatbot
+from embeddings import HashEmbeddings
+from tenants import collection_cache
+
+
+def test_override_skips_collection_model(monkeypatch):
+    def unexpected(collection):
+        raise AssertionError(f"loaded the model of {collection.name} despite an override")
+
+    monkeypatch.setattr(embeddings, "get_collection_embedding_model", unexpected)
+    override = HashEmbeddings()
+    bot = AdaptiveKnowledgeChatbot(f"override-{uuid.uuid4().hex[:8]}", embedding_model=override)
+    assert bot.embedding_model is override
+    assert bot._serving_collection()[1] is override
+
+
+def test_model_loaded_once_without_override(monkeypatch):
+    alias = f"plain-{uuid.uuid4().hex[:8]}"
+    calls = []
+    original = embeddings.get_collection_embedding_model
+    monkeypatch.setattr(embeddings, "get_collection_embedding_model",
+                        lambda collection: calls.append(collection.name) or original(collection))
+    collection, model = collection_cache.get(alias, create=True)
+    assert collection_cache.get(alias) == (collection, model)
+    assert calls == [alias]
@@ -0,0 +1,59 @@
+"""DraftCache: a prefetched retrieval is reused only by a close, in-scope, fresh final question"""
+import uuid
+
+from chatbot import AdaptiveKnowledgeChatbot
+from draftCache import DraftCache, similarity
+
+
+def test_hit_is_single_use():
+    cache = DraftCache(ttl=30, min_similarity=0.85)
+    cache.put("u", "how do I reset the fan", ["context"])
+    assert cache.take("u", "How do I reset the fan?") == ["context"]
+    assert cache.take("u", "How do I reset the fan?") is None
+    assert len(cache) == 0
+
+
+def test_dissimilar_question_misses():
+    cache = DraftCache(ttl=30, min_similarity=0.85)
+    cache.put("u", "how do I reset the fan", ["context"])
+    assert similarity("how do I reset the fan", "what voltage does the pump need") < 0.85
+    assert cache.take("u", "what voltage does the pump need") is None
+
+
+def test_other_scope_or_tenant_misses():
+    cache = DraftCache(ttl=30, min_similarity=0.85)
+    cache.put("u", "reset the fan", ["context"], tenant="acme", scope={"product_line": "x"})
+    assert cache.take("u", "reset the fan", tenant="acme", scope={"product_line": "y"}) is None
+    cache.put("u", "reset the fan", ["context"], tenant="acme", scope={"product_line": "x"})
+    assert cache.take("u", "reset the fan", tenant="other", scope={"product_line": "x"}) is None
+    cache.put("u", "reset the fan", ["context"], tenant="acme", scope={"product_line": "x"})
+    assert cache.take("u", "reset the fan", tenant="acme", scope={"product_line": "x"}) == ["context"]
+
+
+def test_expired_draft_misses():
+    cache = DraftCache(ttl=0, min_similarity=0.85)
+    cache.put("u", "reset the fan", ["context"])
+    assert cache.take("u", "reset the fan") is None
+
+
+def test_discard_and_users_are_separate():
+    cache = DraftCache(ttl=30, min_similarity=0.85)
+    cache.put("a", "reset the fan", ["a"])
+    cache.put("b", "reset the fan", ["b"])
+    cache.discard("a")
+    assert cache.take("a", "reset the fan") is None
+    assert cache.take("b", "reset the fan") == ["b"]
+
+
+def test_draft_hit_skips_faq_lookup_and_embedding(monkeypatch):
+    bot = AdaptiveKnowledgeChatbot(f"drafts-{uuid.uuid4().hex[:8]}")
+
+    def unexpected(*args, **kwargs):
+        raise AssertionError("a draft hit must not embed the question again")
+
+    monkeypatch.setattr(bot, "_faq_lookup", unexpected)
+    monkeypatch.setattr(bot, "_retrieve_context", unexpected)
+    bot.drafts.put("u", "how do I reset the fan", ["Hold the reset button for five seconds."])
+    response = bot.ask_question("How do I reset the fan?", "u")
+    assert response["success"], response
+    assert "embed_query" not in response.get("timings", {})
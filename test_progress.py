@@ -0,0 +1,61 @@
+"""ProgressBroker replay, reconnection and expiry: streams of finished or unknown jobs must end"""
+import asyncio
+
+from progress import ProgressBroker
+
+
+def collect(broker: ProgressBroker, job_id: str, after: int = 0, timeout: float = 2.0):
+    async def run():
+        return [event async for event in broker.subscribe(job_id, after, heartbeat=0.05)]
+
+    return asyncio.run(asyncio.wait_for(run(), timeout))
+
+
+def finished_job(broker: ProgressBroker, job_id: str = "j"):
+    broker.publish(job_id, "uploaded")
+    broker.publish(job_id, "processing", stage="extract")
+    broker.publish(job_id, "completed")
+
+
+def test_replays_missed_events():
+    broker = ProgressBroker()
+    finished_job(broker)
+    assert [event["status"] for event in collect(broker, "j")] == ["uploaded", "processing", "completed"]
+    assert [event["seq"] for event in collect(broker, "j", after=1)] == [2, 3]
+
+
+def test_reconnect_after_terminal_event_ends_stream():
+    broker = ProgressBroker()
+    finished_job(broker)
+    assert collect(broker, "j", after=3) == []
+    assert collect(broker, "j", after=2)[-1]["status"] == "completed"
+
+
+def test_unknown_job_ends_stream_without_creating_it():
+    broker = ProgressBroker()
+    assert collect(broker, "missing") == []
+    assert not broker.exists("missing")
+
+
+def test_live_events_follow_replay():
+    broker = ProgressBroker()
+    broker.publish("j", "uploaded")
+
+    async def run():
+        loop = asyncio.get_running_loop()
+        loop.call_later(0.1, broker.publish, "j", "processing")
+        loop.call_later(0.2, broker.publish, "j", "completed")
+        return [event async for event in broker.subscribe("j", heartbeat=0.05)]
+
+    events = asyncio.run(asyncio.wait_for(run(), 2.0))
+    assert [event["status"] for event in events if event] == ["uploaded", "processing", "completed"]
+    assert None in events  # heartbeats while waiting
+
+
+def test_finished_jobs_expire():
+    broker = ProgressBroker(retention=0)
+    finished_job(broker)
+    assert not broker.exists("j")
+    assert collect(broker, "j") == []
+    assert not broker.exists("j")
+
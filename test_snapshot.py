@@ -0,0 +1,63 @@
+"""Snapshot export/import round trip: a new version is swapped in, and the embedding model is checked"""
+import json
+import os
+import uuid
+
+import pytest
+
+from collectionAlias import VERSION_SEPARATOR, resolve
+from feedDoc import store_chunks
+from snapshot import MANIFEST_FILE, export_collection, import_snapshot
+from tenants import collection_cache
+
+TEXTS = ["Hold the reset button for five seconds.", "The pump needs 24 volts.", "Clean the filter monthly."]
+
+
+def records(alias: str) -> dict:
+    found = collection_cache.get(alias)[0].get(include=["documents", "embeddings"])
+    return {record_id: (document, list(vector))
+            for record_id, document, vector in zip(found["ids"], found["documents"], found["embeddings"])}
+
+
+def test_export_import_round_trip(tmp_path):
+    source = f"snap-{uuid.uuid4().hex[:8]}"
+    store_chunks(TEXTS, source, document={"doc_id": "manual"})
+    manifest = export_collection(source, str(tmp_path / "snapshot"))
+    assert manifest["count"] == len(TEXTS)
+    assert manifest["hnsw"]  # the import recreates the index from these settings
+
+    # Into a collection that already serves (unaliased, as in every existing deployment)
+    target = f"snap-{uuid.uuid4().hex[:8]}"
+    store_chunks(["old chunk"], target, document={"doc_id": "old"})
+    stale, _ = collection_cache.get(target)
+    result = import_snapshot(str(tmp_path / "snapshot"), target, replace=True)
+    assert result["records"] == len(TEXTS)
+    assert resolve(target).startswith(target + VERSION_SEPARATOR)
+    assert records(target) == records(source)
+    assert stale.count() == 1  # the replaced collection is kept for rollback, not deleted
+
+
+def test_refuses_existing_data_without_replace(tmp_path):
+    source = f"snap-{uuid.uuid4().hex[:8]}"
+    store_chunks(TEXTS, source, document={"doc_id": "manual"})
+    export_collection(source, str(tmp_path / "snapshot"))
+    with pytest.raises(ValueError, match="already has data"):
+        import_snapshot(str(tmp_path / "snapshot"), source)
+
+
+def test_model_mismatch_needs_force(tmp_path):
+    source = f"snap-{uuid.uuid4().hex[:8]}"
+    store_chunks(TEXTS, source, document={"doc_id": "manual"})
+    snapshot_dir = str(tmp_path / "snapshot")
+    export_collection(source, snapshot_dir)
+    manifest_path = os.path.join(snapshot_dir, MANIFEST_FILE)
+    with open(manifest_path) as f:
+        manifest = json.load(f)
+    manifest["collection_metadata"]["embedding_model"] = "sentence-transformers/other-model"
+    with open(manifest_path, "w") as f:
+        json.dump(manifest, f)
+
+    target = f"snap-{uuid.uuid4().hex[:8]}"
+    with pytest.raises(ValueError, match="other-model"):
+        import_snapshot(snapshot_dir, target)
+    assert import_snapshot(snapshot_dir, target, force=True)["records"] == len(TEXTS)